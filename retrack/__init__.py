@@ -1,6 +1,8 @@
 from retrack.engine.rule import Rule
-from retrack.engine.constructor import from_json
+from retrack.engine.constructor import from_artifact, from_json, to_artifact
 from retrack.engine.executor import RuleExecutor
+from retrack.engine.batching import BatchingExecutor
+from retrack.engine.cache import RuleCache
 from retrack.engine.base import Execution
 from retrack.nodes import registry as nodes_registry, dynamic_nodes_registry
 from retrack.nodes.base import BaseNode, InputConnectionModel, OutputConnectionModel
@@ -9,7 +11,11 @@ from retrack.nodes.connectors import BaseConnector
 __all__ = [
     "Rule",
     "from_json",
+    "to_artifact",
+    "from_artifact",
     "RuleExecutor",
+    "BatchingExecutor",
+    "RuleCache",
     "Execution",
     "nodes_registry",
     "dynamic_nodes_registry",
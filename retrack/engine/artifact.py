@@ -0,0 +1,405 @@
+"""Precompiled rule artifacts.
+
+An artifact holds a rule and each of its sub-rules already validated: their
+versions, execution orders and the validated fields of each node, along with
+what the nodes parse from their data, like the weights of GLM nodes or the
+intervals of IntervalCatV0 nodes. Loading it skips the graph and node
+validation, the validators, the version hashes and the graph walks of
+Rule.create: the nodes are constructed from their fields as they are.
+
+Layout: a header with the magic bytes, the format version and the SHA-256 of
+the body, followed by the body, the zlib compressed JSON of the rules.
+"""
+
+import enum
+import functools
+import hashlib
+import json
+import struct
+import typing
+import zlib
+
+import pydantic
+
+from retrack import nodes
+from retrack.engine.cache import RuleCache
+from retrack.engine.rule import Rule, RuleExecutor
+from retrack.nodes.base import BaseNode
+from retrack.nodes.dynamic import (
+    conditional_connector_factory,
+    csv_table_factory,
+    flow_connector_factory,
+    flow_factory,
+    glm_factory,
+)
+from retrack.utils.component_registry import ComponentRegistry
+from retrack.utils.registry import Registry
+
+MAGIC = b"RETRACK"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct(">7sH32s")
+
+# Factories whose class only depends on the names of the node inputs
+_SHAPE_ONLY_FACTORIES = (
+    conditional_connector_factory,
+    csv_table_factory,
+    flow_connector_factory,
+    glm_factory,
+)
+
+
+def dumps(
+    graph_data: dict,
+    name: str = None,
+    nodes_registry: typing.Optional[Registry] = None,
+    dynamic_nodes_registry: typing.Optional[Registry] = None,
+    validator_registry: typing.Optional[Registry] = None,
+    raise_if_null_version: bool = False,
+    validate_version: bool = False,
+    connectors_as_inputs: bool = True,
+) -> bytes:
+    """Creates a rule, validating it and its sub-rules, and returns its artifact.
+
+    Args:
+        graph_data (dict): Graph data.
+        name (str, optional): Rule name. Defaults to None.
+        nodes_registry (Registry, optional): Nodes registry. Defaults to None, which uses nodes.registry().
+        dynamic_nodes_registry (Registry, optional): Dynamic nodes registry. Defaults to None, which uses nodes.dynamic_nodes_registry().
+        validator_registry (Registry, optional): Validators registry. Defaults to None, which uses validators.registry().
+        raise_if_null_version (bool, optional): Whether to raise if the graph has no version. Defaults to False.
+        validate_version (bool, optional): Whether to check the version hash of the graph. Defaults to False.
+        connectors_as_inputs (bool, optional): Whether to consider connectors as inputs. Defaults to True.
+
+    Returns:
+        bytes: The artifact.
+    """
+    if nodes_registry is None:
+        nodes_registry = nodes.registry()
+
+    if dynamic_nodes_registry is None:
+        dynamic_nodes_registry = nodes.dynamic_nodes_registry()
+
+    rules = {}
+    root = _compile(
+        graph_data,
+        name,
+        rules,
+        nodes_registry=nodes_registry,
+        dynamic_nodes_registry=dynamic_nodes_registry,
+        validator_registry=validator_registry,
+        raise_if_null_version=raise_if_null_version,
+        validate_version=validate_version,
+        connectors_as_inputs=connectors_as_inputs,
+    )
+
+    body = zlib.compress(
+        json.dumps(
+            {"root": root, "rules": rules}, ensure_ascii=False, separators=(",", ":")
+        ).encode(),
+        level=9,
+    )
+
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, hashlib.sha256(body).digest()) + body
+
+
+def loads(
+    data: bytes,
+    nodes_registry: typing.Optional[Registry] = None,
+    dynamic_nodes_registry: typing.Optional[Registry] = None,
+) -> Rule:
+    """Creates a rule from an artifact, without validating it again.
+
+    Args:
+        data (bytes): The artifact, from dumps.
+        nodes_registry (Registry, optional): Nodes registry, the one the artifact was created with. Defaults to None, which uses nodes.registry().
+        dynamic_nodes_registry (Registry, optional): Dynamic nodes registry, the one the artifact was created with. Defaults to None, which uses nodes.dynamic_nodes_registry().
+
+    Raises:
+        ValueError: If the data is not an artifact, has another format version or fails the checksum.
+
+    Returns:
+        Rule: The rule.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Invalid rule artifact: too short")
+
+    magic, format_version, checksum = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Invalid rule artifact: wrong magic bytes")
+
+    if format_version != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported rule artifact format version {format_version}, expected {FORMAT_VERSION}"
+        )
+
+    body = data[_HEADER.size :]
+    if hashlib.sha256(body).digest() != checksum:
+        raise ValueError("Invalid rule artifact: checksum mismatch")
+
+    content = json.loads(zlib.decompress(body))
+
+    if nodes_registry is None:
+        nodes_registry = nodes.registry()
+
+    if dynamic_nodes_registry is None:
+        dynamic_nodes_registry = nodes.dynamic_nodes_registry()
+
+    loader = _ArtifactLoader(content["rules"], nodes_registry, dynamic_nodes_registry)
+    rule = loader.rule(content["root"])
+    rule._source = functools.partial(
+        load_executor,
+        data,
+        nodes_registry=nodes_registry,
+        dynamic_nodes_registry=dynamic_nodes_registry,
+    )
+
+    return rule
+
+
+def load_executor(data: bytes, **kwargs) -> RuleExecutor:
+    """Creates a rule from an artifact and returns its executor.
+
+    Args:
+        data (bytes): The artifact, from dumps.
+        **kwargs: Arguments of loads.
+
+    Returns:
+        RuleExecutor: The executor of the rule.
+    """
+    return loads(data, **kwargs).executor
+
+
+def _compile(graph_data: dict, name: str, rules: dict, **create_kwargs) -> str:
+    rule = Rule.create(graph_data=graph_data, name=name, **create_kwargs)
+
+    content_hash = RuleCache.content_hash(graph_data)
+    rules[content_hash] = {
+        "name": rule.name,
+        "version": rule.version,
+        "execution_order": rule.execution_order,
+        "connectors_as_inputs": rule.connectors_as_inputs,
+        "nodes": [
+            _dump_node(node_id, rule.components_registry.get(node_id))
+            for node_id in graph_data["nodes"]
+        ],
+    }
+
+    dynamic_nodes_registry = create_kwargs["dynamic_nodes_registry"]
+    for node_metadata in graph_data["nodes"].values():
+        if dynamic_nodes_registry.get(node_metadata["name"]) is not flow_factory:
+            continue
+
+        sub_graph_data = json.loads(node_metadata["data"]["value"])
+        if RuleCache.content_hash(sub_graph_data) not in rules:
+            # Same arguments the FlowV0 factory creates the sub-rule with
+            _compile(
+                sub_graph_data,
+                node_metadata["data"].get("name"),
+                rules,
+                **{
+                    **create_kwargs,
+                    "raise_if_null_version": False,
+                    "validate_version": False,
+                },
+            )
+
+    return content_hash
+
+
+class _ArtifactLoader:
+    def __init__(
+        self,
+        rules: typing.Dict[str, dict],
+        nodes_registry: Registry,
+        dynamic_nodes_registry: Registry,
+    ):
+        self._rules = rules
+        # Each sub-rule is created once, however many flow nodes embed it
+        self._created: typing.Dict[str, Rule] = {}
+        self._nodes_registry = nodes_registry
+        self._dynamic_nodes_registry = Registry()
+        # Builders of the node classes, kept for this load only, since the
+        # classes of the flow nodes hold their sub-rules
+        self._builders: typing.Dict[typing.Any, typing.Callable] = {}
+
+        classes = {}
+        for name, factory in dynamic_nodes_registry.memory.items():
+            if factory in _SHAPE_ONLY_FACTORIES:
+                factory = functools.partial(_create_class_once, classes, factory)
+            self._dynamic_nodes_registry.register(name, factory)
+
+    def rule(self, content_hash: str) -> Rule:
+        entry = self._rules[content_hash]
+
+        components_registry = ComponentRegistry()
+        for node_entry in entry["nodes"]:
+            component = self.node(node_entry, entry["connectors_as_inputs"])
+            components_registry.register(node_entry["id"], component)
+
+            for input_node in component.generate_input_nodes():
+                components_registry.register(input_node.id, input_node, overwrite=True)
+
+        return Rule(
+            version=entry["version"],
+            components_registry=components_registry,
+            execution_order=entry["execution_order"],
+            name=entry["name"],
+            connectors_as_inputs=entry["connectors_as_inputs"],
+        )
+
+    def node(self, node_entry: dict, connectors_as_inputs: bool) -> BaseNode:
+        fields = node_entry["fields"]
+        node_name = fields["name"].lower()
+
+        node_factory = self._dynamic_nodes_registry.get(node_name)
+        if node_factory is not None:
+            node_class = node_factory(
+                **fields,
+                nodes_registry=self._nodes_registry,
+                dynamic_nodes_registry=self._dynamic_nodes_registry,
+                validator_registry=Registry(),
+                rule_class=self,
+                connectors_as_inputs=connectors_as_inputs,
+            )
+        else:
+            node_class = self._nodes_registry.get(node_name)
+
+        if node_class is None:
+            raise ValueError(f"Unknown node name: {node_name}")
+
+        component = _construct(node_class, fields, self._builders)
+        if node_entry.get("precomputed") is not None:
+            component.restore_precomputed(node_entry["precomputed"])
+
+        return component
+
+    def create(self, graph_data: dict, **kwargs) -> Rule:
+        # Called by the FlowV0 factory in place of Rule.create
+        content_hash = RuleCache.content_hash(graph_data)
+        if content_hash not in self._created:
+            self._created[content_hash] = self.rule(content_hash)
+
+        return self._created[content_hash]
+
+
+def _create_class_once(
+    classes: dict,
+    factory: typing.Callable,
+    inputs: typing.Dict[str, typing.Any],
+    **kwargs,
+):
+    key = (factory, tuple(inputs))
+    if key not in classes:
+        classes[key] = factory(inputs=inputs, **kwargs)
+
+    return classes[key]
+
+
+def _dump_node(node_id: str, component: BaseNode) -> dict:
+    return {
+        "id": node_id,
+        "fields": component.model_dump(mode="json"),
+        "precomputed": component.precomputed(),
+    }
+
+
+def _construct(
+    model: typing.Type[pydantic.BaseModel],
+    fields: dict,
+    builders: typing.Dict[typing.Any, typing.Callable],
+) -> typing.Any:
+    """Builds a model back from the JSON dump of a validated one, without validating it."""
+    return _builder(model, builders)(fields)
+
+
+def _builder(
+    annotation: typing.Any, builders: typing.Dict[typing.Any, typing.Callable]
+) -> typing.Callable[[typing.Any], typing.Any]:
+    """Function that builds a value of the annotation back from its JSON dump.
+
+    The dump is the one of a validated model, so only the nested models,
+    enums and tuples are built again, the other values are used as they are.
+
+    Args:
+        annotation (typing.Any): Type of the value.
+        builders (typing.Dict[typing.Any, typing.Callable]): Builders created already, by annotation.
+
+    Returns:
+        typing.Callable[[typing.Any], typing.Any]: The builder of the annotation.
+    """
+    if annotation not in builders:
+        builders[annotation] = _new_builder(annotation, builders)
+
+    return builders[annotation]
+
+
+def _new_builder(
+    annotation: typing.Any, builders: typing.Dict[typing.Any, typing.Callable]
+) -> typing.Callable[[typing.Any], typing.Any]:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Annotated:
+        return _builder(args[0], builders)
+
+    if origin is typing.Union:
+        options = [arg for arg in args if arg is not type(None)]
+        return _builder(options[0], builders) if len(options) == 1 else _as_is
+
+    if origin is list and args:
+        item_builder = _builder(args[0], builders)
+        if item_builder is _as_is:
+            return _as_is
+
+        return _optional(lambda value: [item_builder(item) for item in value])
+
+    if origin is tuple and args:
+        if len(args) == 2 and args[1] is Ellipsis:
+            item_builder = _builder(args[0], builders)
+            return _optional(lambda value: tuple(item_builder(item) for item in value))
+
+        item_builders = [_builder(arg, builders) for arg in args]
+        return _optional(
+            lambda value: tuple(
+                item_builder(item) for item_builder, item in zip(item_builders, value)
+            )
+        )
+
+    if origin is dict and args:
+        item_builder = _builder(args[1], builders)
+        if item_builder is _as_is:
+            return _as_is
+
+        return _optional(
+            lambda value: {key: item_builder(item) for key, item in value.items()}
+        )
+
+    if isinstance(annotation, type) and issubclass(annotation, pydantic.BaseModel):
+        field_builders = [
+            (name, _builder(field.annotation, builders))
+            for name, field in annotation.model_fields.items()
+        ]
+        return _optional(
+            lambda value: annotation.model_construct(
+                **{
+                    name: field_builder(value[name])
+                    for name, field_builder in field_builders
+                    if name in value
+                }
+            )
+        )
+
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return _optional(annotation)
+
+    return _as_is
+
+
+def _as_is(value: typing.Any) -> typing.Any:
+    return value
+
+
+def _optional(
+    builder: typing.Callable[[typing.Any], typing.Any],
+) -> typing.Callable[[typing.Any], typing.Any]:
+    return lambda value: None if value is None else builder(value)
@@ -14,11 +14,286 @@ from retrack.utils.transformers import (
 )
 
 
+def _common_dtype(current: np.dtype, incoming: np.dtype) -> np.dtype:
+    if current == incoming:
+        return current
+
+    if current.kind in "iuf" and incoming.kind in "iuf":
+        return np.result_type(current, incoming)
+
+    return np.dtype(object)
+
+
+def _with_missing(values: np.ndarray, missing: np.ndarray) -> np.ndarray:
+    """Returns a copy of values where the missing positions are NaN, upcasting when needed."""
+    if values.dtype.kind == "f":
+        values = values.copy()
+    elif values.dtype.kind in "iu":
+        values = values.astype(float)
+    elif values.dtype.kind in "mM":
+        values = values.copy()
+        values[missing] = np.datetime64("NaT")
+        return values
+    else:
+        values = values.astype(object)
+
+    values[missing] = np.nan
+    return values
+
+
+class StateStore:
+    """Columnar storage for the states of an execution.
+
+    Each state key is kept as a NumPy array indexed by row position, plus a
+    validity mask when the key was only written for some of the rows. Reads
+    and writes restricted to a subset of rows are plain gathers and scatters,
+    and a DataFrame is only built when the states are requested as a whole.
+
+    Keys read as floats are converted once, until they are written again, so
+    the nodes that cast the same input do not parse it each time.
+    """
+
+    def __init__(self, length: int):
+        self._length = length
+        self._values: typing.Dict[str, np.ndarray] = {}
+        self._masks: typing.Dict[str, typing.Optional[np.ndarray]] = {}
+        self._owned: typing.Set[str] = set()
+        self._floats: typing.Dict[str, typing.Optional[np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    @property
+    def keys(self) -> typing.List[str]:
+        return list(self._values.keys())
+
+    def _to_array(
+        self, value: typing.Any, rows: typing.Optional[np.ndarray]
+    ) -> np.ndarray:
+        size = self._length if rows is None else len(rows)
+
+        if isinstance(value, pd.Series):
+            if len(value) == size and (
+                value.index.equals(pd.RangeIndex(size))
+                if rows is None
+                else np.array_equal(value.index.to_numpy(), rows)
+            ):
+                values = value.to_numpy()
+            else:  # Aligns by index, as pandas does when assigning a Series
+                values = value.reindex(
+                    pd.RangeIndex(size) if rows is None else rows
+                ).to_numpy()
+        elif isinstance(value, (np.ndarray, list, tuple, pd.Index)):
+            values = np.asarray(value)
+            if len(values) != size:
+                raise ValueError(
+                    f"Length of values ({len(values)}) does not match length of index ({size})"
+                )
+        else:
+            if isinstance(value, (bool, int, float, np.bool_, np.number)):
+                values = np.full(size, value)
+            else:
+                values = np.empty(size, dtype=object)
+                values[:] = [value] * size if size else []
+            return values
+
+        if values.dtype.kind in "US":
+            values = values.astype(object)
+
+        return values
+
+    def set(
+        self, key: str, value: typing.Any, rows: typing.Optional[np.ndarray] = None
+    ) -> None:
+        """Writes the value of a state key, optionally only for the given row positions."""
+        values = self._to_array(value, rows)
+        self._floats.pop(key, None)
+
+        if rows is None:
+            self._values[key] = values
+            self._masks[key] = None
+            self._owned.discard(key)
+            return
+
+        current = self._values.get(key, None)
+        if current is None:
+            current = np.empty(self._length, dtype=values.dtype)
+            mask = np.zeros(self._length, dtype=bool)
+            self._owned.add(key)
+        else:
+            mask = self._masks[key]
+            if (
+                current.dtype.kind == "f"
+                and values.dtype == object
+                and pd.isna(values).all()
+            ):  # Float states hold missing values as NaN, as pandas does
+                values = np.full(len(values), np.nan)
+
+            dtype = _common_dtype(current.dtype, values.dtype)
+            if dtype != current.dtype:
+                current = current.astype(dtype)
+                self._owned.add(key)
+            elif key not in self._owned:
+                # Never writes into arrays shared with the caller
+                current = current.copy()
+                self._owned.add(key)
+
+        current[rows] = values
+        if mask is not None:
+            mask[rows] = True
+            if mask.all():
+                mask = None
+
+        self._values[key] = current
+        self._masks[key] = mask
+
+    def set_missing(self, key: str) -> None:
+        """Declares a state key without writing any row, every read returns NaN."""
+        self._values[key] = None
+        self._masks[key] = None
+        self._owned.discard(key)
+        self._floats.pop(key, None)
+
+    def get(self, key: str, rows: typing.Optional[np.ndarray] = None) -> pd.Series:
+        """Reads a state key as a Series indexed by row position."""
+        values = self._values[key]
+        mask = self._masks[key]
+
+        if values is None:
+            size = self._length if rows is None else len(rows)
+            index = pd.RangeIndex(size) if rows is None else pd.Index(rows)
+            return pd.Series(np.full(size, np.nan), index=index, name=key)
+
+        if rows is None:
+            index = pd.RangeIndex(self._length)
+            missing = None if mask is None else ~mask
+        else:
+            values = values[rows]
+            index = pd.Index(rows)
+            missing = None if mask is None else ~mask[rows]
+
+        if missing is not None and missing.any():
+            values = _with_missing(values, missing)
+
+        return pd.Series(values, index=index, name=key, copy=False)
+
+    def get_float(
+        self, key: str, rows: typing.Optional[np.ndarray] = None
+    ) -> pd.Series:
+        """Reads a state key as get does, converted with astype(float) when every row can be.
+
+        Otherwise the values are returned as they are, and the node casting
+        them raises the conversion error itself.
+        """
+        if key not in self._floats:
+            try:
+                floats = self.get(key).astype(float).to_numpy()
+                floats.flags.writeable = False
+            except (TypeError, ValueError):
+                floats = None
+            self._floats[key] = floats
+
+        floats = self._floats[key]
+        if floats is None:
+            return self.get(key, rows=rows)
+
+        if rows is None:
+            return pd.Series(
+                floats, index=pd.RangeIndex(self._length), name=key, copy=False
+            )
+
+        return pd.Series(floats[rows], index=pd.Index(rows), name=key, copy=False)
+
+    def to_frame(self, keys: typing.Optional[typing.List[str]] = None) -> pd.DataFrame:
+        keys = self.keys if keys is None else keys
+        return pd.DataFrame(
+            {key: self.get(key) for key in keys}, index=pd.RangeIndex(self._length)
+        )
+
+    @classmethod
+    def from_frame(cls, states: pd.DataFrame) -> "StateStore":
+        store = cls(len(states))
+        for column in states.columns:
+            store.set(column, states[column].to_numpy())
+        return store
+
+
+class ExecutionScope:
+    """The rows and output of a sub-rule inlined into the execution of its parent.
+
+    The sub-rule runs over the rows that reached its flow node, with its own
+    payload and its own output, so its rows are resolved independently of the
+    rows of the parent rule.
+    """
+
+    def __init__(
+        self,
+        rows: np.ndarray,
+        payload: typing.Dict[str, pd.Series],
+        output_keys: typing.Dict[str, str],
+        state_store: StateStore,
+    ):
+        self.rows = rows
+        self.payload = payload
+        self.output_keys = output_keys
+        self._unresolved = np.zeros(len(state_store), dtype=bool)
+        self._unresolved[rows] = True
+        self._unresolved_count = len(rows)
+
+        for key in output_keys.values():
+            state_store.set(key, np.nan, rows=rows)
+
+    def active_rows(self, filter_rows: typing.Optional[np.ndarray]) -> np.ndarray:
+        """Returns the row positions a node of the sub-rule must compute.
+
+        The rows of the scope itself are returned when the node has no filter
+        and no row has an output yet, which set_output takes as every row.
+        """
+        if filter_rows is None:
+            if self._unresolved_count == len(self.rows):
+                return self.rows
+
+            filter_rows = self.rows
+
+        return filter_rows[self._unresolved[filter_rows]]
+
+    def set_output(
+        self,
+        state_store: StateStore,
+        output_name: str,
+        value: typing.Any,
+        rows: np.ndarray,
+    ):
+        key = self.output_keys[output_name]
+        if rows is self.rows:
+            # Replaces the whole column, as the execution of the sub-rule on
+            # its own would, so it keeps the dtype of the value
+            state_store.set_missing(key)
+        state_store.set(key, value, rows=rows)
+
+        if output_name == constants.OUTPUT_REFERENCE_COLUMN:
+            missing = state_store.get(key, rows=rows).isna().to_numpy()
+            previous_count = int(self._unresolved[rows].sum())
+            self._unresolved[rows] = missing
+            self._unresolved_count += int(missing.sum()) - previous_count
+
+    def output(self, state_store: StateStore) -> np.ndarray:
+        return state_store.get(
+            self.output_keys[constants.OUTPUT_REFERENCE_COLUMN], rows=self.rows
+        ).to_numpy()
+
+    def has_ended(self) -> bool:
+        return self._unresolved_count == 0
+
+
 class Execution:
     def __init__(
         self,
         payload: pd.DataFrame,
-        states: pd.DataFrame,
+        states: typing.Union[pd.DataFrame, StateStore],
         filters: dict = None,
         context: registry.Registry = None,
         child_executions = None,
@@ -26,31 +301,140 @@ class Execution:
         constants: dict = None,
     ):
         self.payload = payload
-        self.states = states
+        self.state_store = (
+            states if isinstance(states, StateStore) else StateStore.from_frame(states)
+        )
         self.filters = filters or {}
+        self._rows_cache = {}
         self.context = context
         self.child_executions = child_executions or {}
         self.nodes = nodes or {}
         self.constants = constants or {}
+        # Outputs computed ahead for the other nodes of a batch, see BatchPlan
+        self.batch_outputs: typing.Dict[int, tuple] = {}
+        self._reset_unresolved()
+
+    @property
+    def states(self) -> pd.DataFrame:
+        return self.state_store.to_frame()
+
+    def _mask(self, filter_value: typing.Any) -> np.ndarray:
+        """Converts a filter into a boolean array covering every row of the execution."""
+        if isinstance(filter_value, pd.Series):
+            length = len(self.state_store)
+            if filter_value.index.equals(pd.RangeIndex(length)):
+                return filter_value.to_numpy(dtype=bool)
+
+            # Filters computed over a subset of rows are indexed by row position
+            mask = np.zeros(length, dtype=bool)
+            mask[filter_value.index.to_numpy()] = filter_value.to_numpy(dtype=bool)
+            return mask
+
+        return np.asarray(filter_value, dtype=bool)
+
+    def filter_rows(self, filter_value: typing.Any) -> np.ndarray:
+        """Returns the sorted row positions selected by a filter."""
+        if isinstance(filter_value, np.ndarray) and filter_value.dtype.kind in "iu":
+            return filter_value
+
+        cached = self._rows_cache.get(id(filter_value), None)
+        if cached is not None and cached[0] is filter_value:
+            return cached[1]
+
+        rows = np.flatnonzero(self._mask(filter_value))
+        # Keeps a reference to the filter so its id is not reused while cached
+        self._rows_cache[id(filter_value)] = (filter_value, rows)
+        return rows
+
+    def _rows(self, filter_by: typing.Any) -> typing.Optional[np.ndarray]:
+        if filter_by is None:
+            return None
+
+        return self.filter_rows(filter_by)
 
     def set_state_data(
         self, column: str, value: typing.Any, filter_by: typing.Any = None
     ):
-        if filter_by is None:
-            self.states[column] = value
+        rows = self._rows(filter_by)
+        self.state_store.set(column, value, rows=rows)
+
+        if column == constants.OUTPUT_REFERENCE_COLUMN:
+            self._update_unresolved(rows)
+
+    def _reset_unresolved(self):
+        self._unresolved_rows = None
+        if constants.OUTPUT_REFERENCE_COLUMN in self.state_store:
+            self._update_unresolved(None)
         else:
-            self.states.loc[filter_by, column] = value
+            self._unresolved = np.ones(len(self.state_store), dtype=bool)
+            self._unresolved_count = len(self.state_store)
+
+    def _update_unresolved(self, rows: typing.Optional[np.ndarray]):
+        """Keeps track of the rows without output, only looking at the rows just written."""
+        missing = (
+            self.state_store.get(constants.OUTPUT_REFERENCE_COLUMN, rows=rows)
+            .isna()
+            .to_numpy()
+        )
+
+        self._unresolved_rows = None
+
+        if rows is None:
+            self._unresolved = missing
+            self._unresolved_count = int(missing.sum())
+            return
+
+        previous_count = int(self._unresolved[rows].sum())
+        self._unresolved[rows] = missing
+        self._unresolved_count += int(missing.sum()) - previous_count
+
+    def active_rows(
+        self, filter_value: typing.Any = None
+    ) -> typing.Optional[np.ndarray]:
+        """Returns the row positions a node must compute.
+
+        Those are the rows selected by its filter that still have no output. None
+        means every row, so callers can skip the gathers altogether.
+        """
+        all_unresolved = self._unresolved_count == len(self.state_store)
+
+        if filter_value is None:
+            if all_unresolved:
+                return None
+
+            if self._unresolved_rows is None:
+                self._unresolved_rows = np.flatnonzero(self._unresolved)
+            return self._unresolved_rows
+
+        rows = self.filter_rows(filter_value)
+        if all_unresolved:
+            return rows
+
+        return rows[self._unresolved[rows]]
+
+    @property
+    def unresolved(self) -> np.ndarray:
+        """Boolean mask of the rows that still have no output."""
+        return self._unresolved
+
+    @property
+    def unresolved_count(self) -> int:
+        return self._unresolved_count
 
     def get_state_data(
-        self, column: str, constants: dict, filter_by: typing.Any = None
+        self,
+        column: str,
+        constants: dict,
+        filter_by: typing.Any = None,
+        as_float: bool = False,
     ):
         if column in constants:
             return constants[column]
 
-        if filter_by is None:
-            return self.states[column]
+        if as_float:
+            return self.state_store.get_float(column, rows=self._rows(filter_by))
 
-        return self.states.loc[filter_by, column]
+        return self.state_store.get(column, rows=self._rows(filter_by))
 
     def set_constants_data(self, constants: dict):
         self.constants.update(constants)
@@ -64,13 +448,13 @@ class Execution:
         self.child_executions[node_id].append(execution)
 
     def update_filters(self, filter_value, output_connections: typing.List[str] = None):
+        filter_value = self._mask(filter_value)
         for output_connection_id in output_connections:
-            if self.filters.get(output_connection_id, None) is None:
+            current_filter = self.filters.get(output_connection_id, None)
+            if current_filter is None:
                 self.filters[output_connection_id] = filter_value
             else:
-                self.filters[output_connection_id] = (
-                    self.filters[output_connection_id] & filter_value
-                )
+                self.filters[output_connection_id] = current_filter & filter_value
 
     @classmethod
     def from_payload(
@@ -79,36 +463,36 @@ class Execution:
         input_columns: dict,
         context: registry.Registry = None,
     ):
-        state_df = pd.DataFrame([])
+        store = StateStore(len(validated_payload))
         for node_id, input_name in input_columns.items():
-            state_df[node_id] = validated_payload[input_name].copy()
+            store.set(node_id, validated_payload[input_name].to_numpy())
 
-        state_df[constants.OUTPUT_REFERENCE_COLUMN] = np.nan
-        state_df[constants.OUTPUT_MESSAGE_REFERENCE_COLUMN] = np.nan
+        store.set(constants.OUTPUT_REFERENCE_COLUMN, np.nan)
+        store.set(constants.OUTPUT_MESSAGE_REFERENCE_COLUMN, np.nan)
 
         return cls(
             payload=validated_payload,
-            states=state_df,
+            states=store,
             context=context,
         )
 
     @property
     def result(self) -> pd.DataFrame:
-        return self.states[
+        return self.state_store.to_frame(
             [
                 constants.OUTPUT_REFERENCE_COLUMN,
                 constants.OUTPUT_MESSAGE_REFERENCE_COLUMN,
             ]
-        ]
+        )
 
     def has_ended(self) -> bool:
-        return self.states[constants.OUTPUT_REFERENCE_COLUMN].isna().sum() == 0
+        return self._unresolved_count == 0
 
     def to_dict(self) -> dict:
         return {
             "payload": self.payload.to_dict(),
             "states": self.states.to_dict(),
-            "filters": {k: v.to_dict() for k, v in self.filters.items()},
+            "filters": {k: pd.Series(v).to_dict() for k, v in self.filters.items()},
             "result": self.result.to_dict(),
             "has_ended": self.has_ended(),
         }
@@ -152,7 +536,9 @@ class Execution:
         return cls(
             payload=pd.DataFrame(data["payload"]),
             states=pd.DataFrame(data["states"]),
-            filters={k: pd.DataFrame(v) for k, v in data["filters"].items()},
+            filters={
+                k: pd.Series(v).to_numpy(dtype=bool) for k, v in data["filters"].items()
+            },
         )
 
     def __repr__(self) -> str:
@@ -0,0 +1,195 @@
+import asyncio
+import functools
+import typing
+
+import pandas as pd
+
+from retrack.engine.executor import RuleExecutor
+from retrack.utils import exceptions, registry
+
+
+class _PendingCall:
+    def __init__(
+        self,
+        payload_df: pd.DataFrame,
+        context: typing.Optional[registry.Registry],
+        future: asyncio.Future,
+    ):
+        self.payload_df = payload_df
+        self.context = context
+        self.future = future
+
+    @property
+    def batch_key(self) -> typing.Optional[tuple]:
+        """Calls with the same key are merged, None if the call runs alone.
+
+        The columns and their dtypes are part of the key, so concatenating the
+        payloads never casts their values, e.g. ints to floats, and a DataFrame
+        with their rows validates the same way they would alone.
+        """
+        if not isinstance(self.payload_df, pd.DataFrame):
+            return None
+
+        return (
+            id(self.context),
+            tuple(self.payload_df.columns),
+            tuple(self.payload_df.dtypes),
+        )
+
+    def set_result(self, result: pd.DataFrame):
+        if not self.future.done():
+            self.future.set_result(result)
+
+    def set_exception(self, exception: Exception):
+        if not self.future.done():
+            self.future.set_exception(exception)
+
+
+class BatchingExecutor:
+    def __init__(
+        self,
+        executor: RuleExecutor,
+        max_batch_size: int = 256,
+        batch_window: float = 0.002,
+    ):
+        """Coalesces concurrent execute calls into one vectorized execution.
+
+        Calls that arrive within batch_window seconds of the first pending
+        call, or until max_batch_size rows are pending, run as a single
+        DataFrame and each caller gets back its own rows.
+
+        Args:
+            executor (RuleExecutor): The executor that runs the batches.
+            max_batch_size (int, optional): Number of pending rows that triggers a batch right away. Defaults to 256.
+            batch_window (float, optional): Seconds to wait for more calls before running a batch. Defaults to 0.002.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        if batch_window < 0:
+            raise ValueError("batch_window can not be negative")
+
+        self._executor = executor
+        self._max_batch_size = max_batch_size
+        self._batch_window = batch_window
+        self._pending: typing.List[_PendingCall] = []
+        self._pending_rows = 0
+        self._timer: typing.Optional[asyncio.Task] = None
+        self._running: typing.Set[asyncio.Task] = set()
+
+    @property
+    def executor(self) -> RuleExecutor:
+        return self._executor
+
+    @property
+    def max_batch_size(self) -> int:
+        return self._max_batch_size
+
+    @property
+    def batch_window(self) -> float:
+        return self._batch_window
+
+    async def execute(
+        self,
+        payload_df: pd.DataFrame,
+        context: typing.Optional[registry.Registry] = None,
+    ) -> pd.DataFrame:
+        """Executes the payload as part of the next batch.
+
+        Args:
+            payload_df (pd.DataFrame): The payload to be executed.
+            context (registry.Registry, optional): Global constants to be used during execution. Defaults to None.
+
+        Raises:
+            exceptions.ExecutionException: If there is an error executing this payload.
+            exceptions.ValidationException: If there is an error validating this payload.
+
+        Returns:
+            pd.DataFrame: The result of the payload, as RuleExecutor.execute returns it.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingCall(payload_df, context, future))
+        self._pending_rows += (
+            len(payload_df) if isinstance(payload_df, pd.DataFrame) else 1
+        )
+
+        if self._pending_rows >= self.max_batch_size:
+            self._start_batch()
+        elif self._timer is None:
+            self._timer = asyncio.ensure_future(self._start_batch_later())
+
+        return await future
+
+    async def flush(self):
+        """Runs the pending calls right away and waits for every running batch."""
+        self._start_batch()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def _start_batch_later(self):
+        await asyncio.sleep(self.batch_window)
+        self._timer = None
+        self._start_batch()
+
+    def _start_batch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        calls, self._pending, self._pending_rows = self._pending, [], 0
+
+        groups: typing.Dict[typing.Any, typing.List[_PendingCall]] = {}
+        for call in calls:
+            key = call.batch_key
+            groups.setdefault(id(call) if key is None else key, []).append(call)
+
+        for group in groups.values():
+            task = asyncio.ensure_future(self._run_batch(group))
+            self._running.add(task)
+            task.add_done_callback(functools.partial(self._batch_done, group))
+
+    def _batch_done(self, calls: typing.List[_PendingCall], task: asyncio.Task):
+        self._running.discard(task)
+
+        # Errors other than the ones of the executor are not expected, but the
+        # callers must not wait forever for them
+        if task.cancelled():
+            for call in calls:
+                call.future.cancel()
+        elif task.exception() is not None:
+            for call in calls:
+                call.set_exception(task.exception())
+
+    async def _run_batch(self, calls: typing.List[_PendingCall]):
+        if len(calls) == 1:
+            await self._run_alone(calls[0])
+            return
+
+        batch_df = pd.concat([call.payload_df for call in calls], ignore_index=True)
+        try:
+            result = await self.executor.execute(batch_df, context=calls[0].context)
+        except (exceptions.ExecutionException, exceptions.ValidationException):
+            # Each caller must get its own error, so the batch is split in
+            # halves until the failing calls run alone
+            middle = len(calls) // 2
+            await asyncio.gather(
+                self._run_batch(calls[:middle]), self._run_batch(calls[middle:])
+            )
+            return
+
+        start = 0
+        for call in calls:
+            end = start + len(call.payload_df)
+            call.set_result(result.iloc[start:end].reset_index(drop=True))
+            start = end
+
+    async def _run_alone(self, call: _PendingCall):
+        try:
+            result = await self.executor.execute(call.payload_df, context=call.context)
+        except (exceptions.ExecutionException, exceptions.ValidationException) as e:
+            call.set_exception(e)
+        else:
+            call.set_result(result)
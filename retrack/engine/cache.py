@@ -0,0 +1,150 @@
+import collections
+import hashlib
+import json
+import threading
+import typing
+
+from retrack.utils.registry import Registry
+
+
+class CacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class RuleCache:
+    def __init__(self, maxsize: int = 128):
+        """Least recently used cache of created rules.
+
+        Rules are keyed by the hash of their graph content and the identity of
+        the registries used to create them. The entries keep the registries
+        alive, so their ids are not reused while a rule is cached.
+
+        Args:
+            maxsize (int, optional): Maximum number of cached rules. Defaults to 128.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self._maxsize = maxsize
+        self._entries: typing.OrderedDict[tuple, tuple] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @staticmethod
+    def content_hash(graph_data: typing.Union[str, dict]) -> str:
+        """Returns the SHA-256 of a graph, given as JSON text or as a dict.
+
+        Args:
+            graph_data (typing.Union[str, dict]): Graph data.
+
+        Returns:
+            str: The hex digest of the graph content.
+        """
+        if not isinstance(graph_data, str):
+            graph_data = json.dumps(
+                graph_data, sort_keys=True, separators=(",", ":"), default=str
+            )
+
+        return hashlib.sha256(graph_data.encode()).hexdigest()
+
+    @staticmethod
+    def key(content_hash: str, **options) -> tuple:
+        """Builds the key of a rule from its content hash and creation options.
+
+        Registries are compared by identity, other options by value. Options
+        that are not hashable, like dicts, are compared by the hash of their
+        JSON content.
+
+        Args:
+            content_hash (str): Hash of the graph content.
+            **options: Arguments used to create the rule.
+
+        Returns:
+            tuple: The cache key.
+        """
+        return (content_hash,) + tuple(
+            (name, RuleCache._option_key(value))
+            for name, value in sorted(options.items())
+        )
+
+    @staticmethod
+    def _option_key(value: typing.Any) -> typing.Hashable:
+        if isinstance(value, Registry):
+            return id(value)
+
+        try:
+            hash(value)
+        except TypeError:
+            return RuleCache.content_hash(value)
+
+        return value
+
+    def get_or_create(
+        self,
+        key: tuple,
+        create: typing.Callable[[], typing.Any],
+        references: typing.Iterable[typing.Any] = (),
+    ) -> typing.Any:
+        """Returns the cached rule of the key, creating it on a miss.
+
+        Args:
+            key (tuple): The cache key, from RuleCache.key.
+            create (typing.Callable[[], typing.Any]): Creates the rule on a miss.
+            references (typing.Iterable[typing.Any], optional): Objects kept alive with the entry, e.g. the registries in the key. Defaults to ().
+
+        Returns:
+            typing.Any: The cached or created rule.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+
+            self._misses += 1
+
+        # Created outside of the lock, sub-rules may use the cache as well
+        rule = create()
+
+        with self._lock:
+            self._entries[key] = (rule, tuple(references))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return rule
+
+    def info(self) -> CacheInfo:
+        """Returns the hit and miss statistics of the cache."""
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                maxsize=self.maxsize,
+                currsize=len(self._entries),
+            )
+
+    def clear(self):
+        """Removes every cached rule and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+
+rule_cache = RuleCache()
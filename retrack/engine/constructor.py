@@ -1,7 +1,10 @@
 import json
+import os
 import typing
 
 from retrack import nodes
+from retrack.engine import artifact
+from retrack.engine.cache import RuleCache
 from retrack.engine.rule import Rule, RuleExecutor
 from retrack.utils import registry
 
@@ -13,6 +16,7 @@ def from_json(
     dynamic_nodes_registry: registry.Registry = nodes.dynamic_nodes_registry(),
     return_executor: bool = True,
     connectors_as_inputs: bool = True,
+    cache: typing.Optional[RuleCache] = None,
     **kwargs,
 ) -> typing.Union[Rule, RuleExecutor]:
     """Create a rule from a json file or a dict.
@@ -24,6 +28,7 @@ def from_json(
         dynamic_nodes_registry (registry.Registry, optional): Dynamic nodes registry. Defaults to nodes.dynamic_nodes_registry().
         return_executor (bool, optional): Whether to return the executor or the rule. Defaults to True.
         connectors_as_inputs (bool, optional): Whether to consider connectors as inputs. Defaults to True.
+        cache (RuleCache, optional): Cache of created rules, e.g. the process-wide retrack.engine.cache.rule_cache. Rules with the same content and registries are created only once, and so are the sub-rules of their flow nodes. Every caller then gets the same Rule and RuleExecutor objects, which must not be modified. Defaults to None, which creates a new rule on every call, identical sub-rules being only shared within the rule.
 
     Raises:
         ValueError: If the data is not a dict or a json file path.
@@ -31,6 +36,65 @@ def from_json(
     Returns:
         typing.Union[Rule, RuleExecutor]: Rule or RuleExecutor depending on return_executor.
     """
+    if isinstance(graph_data, str) and graph_data.endswith(".json"):
+        if name is None:
+            name = graph_data
+        graph_data = open(graph_data).read()
+    elif not isinstance(graph_data, dict):
+        raise ValueError("data must be a dict or a json file path")
+
+    options = dict(
+        name=name,
+        nodes_registry=nodes_registry,
+        dynamic_nodes_registry=dynamic_nodes_registry,
+        connectors_as_inputs=connectors_as_inputs,
+        **kwargs,
+    )
+
+    def create() -> Rule:
+        return Rule.create(
+            graph_data=json.loads(graph_data)
+            if isinstance(graph_data, str)
+            else graph_data,
+            subrule_cache=cache,
+            **options,
+        )
+
+    if cache is None:
+        rule = create()
+    else:
+        rule = cache.get_or_create(
+            RuleCache.key(RuleCache.content_hash(graph_data), **options),
+            create,
+            references=options.values(),
+        )
+
+    return rule.executor if return_executor else rule
+
+
+def to_artifact(
+    graph_data: typing.Union[str, dict],
+    name: str = None,
+    nodes_registry: registry.Registry = nodes.registry(),
+    dynamic_nodes_registry: registry.Registry = nodes.dynamic_nodes_registry(),
+    connectors_as_inputs: bool = True,
+    **kwargs,
+) -> bytes:
+    """Compile a rule from a json file or a dict into an artifact.
+
+    Args:
+        graph_data (typing.Union[str, dict]): Graph data.
+        name (str, optional): Rule name. Defaults to None.
+        nodes_registry (registry.Registry, optional): Nodes registry. Defaults to nodes.registry().
+        dynamic_nodes_registry (registry.Registry, optional): Dynamic nodes registry. Defaults to nodes.dynamic_nodes_registry().
+        connectors_as_inputs (bool, optional): Whether to consider connectors as inputs. Defaults to True.
+
+    Raises:
+        ValueError: If the data is not a dict or a json file path.
+
+    Returns:
+        bytes: The artifact, to be loaded by from_artifact.
+    """
     if isinstance(graph_data, str) and graph_data.endswith(".json"):
         if name is None:
             name = graph_data
@@ -38,12 +102,43 @@ def from_json(
     elif not isinstance(graph_data, dict):
         raise ValueError("data must be a dict or a json file path")
 
-    rule = Rule.create(
-        graph_data=graph_data,
+    return artifact.dumps(
+        graph_data,
         name=name,
         nodes_registry=nodes_registry,
         dynamic_nodes_registry=dynamic_nodes_registry,
         connectors_as_inputs=connectors_as_inputs,
         **kwargs,
     )
+
+
+def from_artifact(
+    data: typing.Union[bytes, str, os.PathLike],
+    nodes_registry: registry.Registry = nodes.registry(),
+    dynamic_nodes_registry: registry.Registry = nodes.dynamic_nodes_registry(),
+    return_executor: bool = True,
+) -> typing.Union[Rule, RuleExecutor]:
+    """Create a rule from an artifact or an artifact file, without validating it again.
+
+    Args:
+        data (typing.Union[bytes, str, os.PathLike]): The artifact, from to_artifact, or the path of a file holding it.
+        nodes_registry (registry.Registry, optional): Nodes registry. Defaults to nodes.registry().
+        dynamic_nodes_registry (registry.Registry, optional): Dynamic nodes registry. Defaults to nodes.dynamic_nodes_registry().
+        return_executor (bool, optional): Whether to return the executor or the rule. Defaults to True.
+
+    Raises:
+        ValueError: If the data is not a valid artifact.
+
+    Returns:
+        typing.Union[Rule, RuleExecutor]: Rule or RuleExecutor depending on return_executor.
+    """
+    if not isinstance(data, bytes):
+        with open(data, "rb") as f:
+            data = f.read()
+
+    rule = artifact.loads(
+        data,
+        nodes_registry=nodes_registry,
+        dynamic_nodes_registry=dynamic_nodes_registry,
+    )
     return rule.executor if return_executor else rule
@@ -1,17 +1,29 @@
+import asyncio
+import concurrent.futures
+import math
+import multiprocessing
+import os
 import typing
 
+import numpy as np
 import pandas as pd
 import pydantic
 
 from retrack.nodes import BaseNode
-from retrack.engine.base import Execution
-from retrack.engine.schemas import RuleMetadata
-from retrack.engine.request_manager import RequestManager
+from retrack.engine import parallel
+from retrack.engine.base import Execution, ExecutionScope
+from retrack.engine.plan import ExecutionPlan, NodePlan
+from retrack.engine.schemas import ExceptionSchema, ExecutionSchema, RuleMetadata
+from retrack.engine.request_manager import RequestManager, with_range_index
 from retrack.nodes.base import NodeKind, NodeMemoryType
-from retrack.utils import constants, exceptions, registry
+from retrack.utils import constants, exceptions, files, registry, scalars
 from retrack.utils.component_registry import ComponentRegistry
 
 
+# Parameters given to the flow nodes that are not part of the sub-rule payload
+_EXECUTION_PARAMS = ("context", "parent_execution", "parent_node_id")
+
+
 class RuleExecutor:
     def __init__(
         self,
@@ -19,6 +31,10 @@ class RuleExecutor:
         execution_order: typing.List[str],
         metadata: RuleMetadata,
         connectors_as_inputs: bool,
+        max_concurrency: int = 1,
+        source: typing.Optional[typing.Callable[[], "RuleExecutor"]] = None,
+        inline_subrules: bool = False,
+        merge_common_nodes: bool = False,
     ):
         """Class that executes a rule.
 
@@ -26,6 +42,10 @@ class RuleExecutor:
             components_registry (ComponentRegistry): Components registry.
             execution_order (typing.List[str]): Execution order.
             metadata (RuleMetadata): Rule metadata.
+            max_concurrency (int, optional): How many independent nodes may be awaited at the same time. Defaults to 1, which runs the nodes one by one.
+            source (typing.Callable[[], RuleExecutor], optional): Picklable callable that builds this executor again, used by execute_parallel. Defaults to None.
+            inline_subrules (bool, optional): If True, the sub-rules of the flow nodes are compiled into the plan and run in the same execution as the rule, instead of as executions of their own. Their executions are then not kept as child executions. Defaults to False.
+            merge_common_nodes (bool, optional): If True, nodes of the same type and data, reading the same states under the same filters, are run once and their consumers read the outputs of the first of them. The other ones then have no states in the execution. Only nodes whose deterministic method returns True are merged, which excludes Now and custom nodes that do not override it. Defaults to False.
 
         Raises:
             exceptions.ExecutionException: If there is an error during execution.
@@ -34,6 +54,14 @@ class RuleExecutor:
         self._components_registry = components_registry
         self._execution_order = execution_order
         self._metadata = metadata
+        self._max_concurrency = max_concurrency
+        self._source = source
+        self._plan = ExecutionPlan.compile(
+            components_registry,
+            execution_order,
+            inline_subrules=inline_subrules,
+            merge_common_nodes=merge_common_nodes,
+        )
 
         input_nodes = self.components_registry.get_by_kind(NodeKind.INPUT)
         if connectors_as_inputs:
@@ -53,6 +81,14 @@ class RuleExecutor:
     def metadata(self) -> RuleMetadata:
         return self._metadata
 
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    @property
+    def source(self) -> typing.Optional[typing.Callable[[], "RuleExecutor"]]:
+        return self._source
+
     @property
     def request_manager(self) -> RequestManager:
         return self._request_manager
@@ -74,126 +110,532 @@ class RuleExecutor:
             for output_connector_name, _ in node.outputs:
                 self._constants[f"{node.id}@{output_connector_name}"] = node.data.value
 
+        self._constants.update(self.plan.inlined_constants)
+
     @property
     def input_columns(self) -> dict:
         return self._input_columns
 
-    def __set_output_connection_filters(
-        self,
-        node_id: str,
-        filter_value: typing.Any,
-        execution: Execution,
-        connector_filter=None,
-    ):
-        """If there is a filter, we need to set the children nodes to receive filtered data"""
-        if filter_value is None:
-            return
-
-        output_connections = self.components_registry.get_node_output_connections(
-            node_id, connector_filter=connector_filter
-        )
-        execution.update_filters(filter_value, output_connections=output_connections)
+    @property
+    def plan(self) -> ExecutionPlan:
+        return self._plan
 
     def __get_input_params(
         self,
-        node_dict: dict,
-        current_node_filter: pd.Series,
+        step: NodePlan,
+        current_node_filter: typing.Optional[np.ndarray],
         execution: Execution,
-        include_context: bool = False,
-        include_parent_execution: bool = False,
-        include_inputs: bool = False,
-        parent_execution: Execution = None
+        scope: typing.Optional[ExecutionScope] = None,
     ) -> dict:
         input_params = {}
 
-        for connector_name, connections in node_dict.get("inputs", {}).items():
-            if connector_name.endswith(constants.NULL_SUFFIX):
-                continue
-
-            for connection in connections["connections"]:
-                input_params[connector_name] = execution.get_state_data(
-                    f"{connection['node']}@{connection['output']}",
-                    constants=self.constants,
-                    filter_by=current_node_filter,
-                )
+        for connector_name, state_key in step.input_keys:
+            input_params[connector_name] = execution.get_state_data(
+                state_key,
+                constants=self.constants,
+                filter_by=current_node_filter,
+                as_float=connector_name in step.float_inputs,
+            )
 
-        if include_context:
+        if step.include_context:
             input_params["context"] = execution.context
 
-        if include_parent_execution:
+        if step.include_parent_execution:
             input_params["parent_execution"] = execution
 
-            input_params["parent_node_id"] = node_dict.get("id")
+            input_params["parent_node_id"] = step.node_id
 
-        if include_inputs:
+        if step.include_inputs and scope is not None:
+            # The payload of a sub-rule is indexed by row position already
+            for column, values in scope.payload.items():
+                input_name = f"input_{column}"
+                if input_name not in input_params:
+                    input_params[input_name] = values.loc[current_node_filter]
+        elif step.include_inputs:
             for column in execution.payload.columns:
                 input_name = f"input_{column}"
                 if input_name not in input_params:
                     if current_node_filter is None:
                         input_params[input_name] = execution.payload[column]
                     else:
-                        input_params[f"input_{column}"] = execution.payload.loc[
-                            current_node_filter, column
+                        input_params[input_name] = execution.payload[column].iloc[
+                            current_node_filter
                         ]
 
         return input_params
 
-    async def __run_node(
-        self, node_id: str, execution: Execution, parent_execution: Execution = None
-    ):
-        current_node_filter = execution.filters.get(node_id, None)
-
-        self.__set_output_connection_filters(
-            node_id, current_node_filter, execution=execution
-        )
+    def __node_rows(
+        self,
+        step: NodePlan,
+        execution: Execution,
+        scope: typing.Optional[ExecutionScope] = None,
+    ) -> typing.Optional[np.ndarray]:
+        current_node_filter = execution.filters.get(step.node_id, None)
 
-        node = self.components_registry.get(node_id)
+        if current_node_filter is not None:
+            # If there is a filter, the children nodes must receive filtered data
+            execution.update_filters(
+                current_node_filter, output_connections=step.targets
+            )
 
-        if node.memory_type == NodeMemoryType.CONSTANT:
-            return
+        # Rows that already have an output are not computed again
+        if scope is None:
+            return execution.active_rows(current_node_filter)
 
-        include_context = (
-            node.kind() == NodeKind.CONNECTOR or node.kind() == NodeKind.FLOW
-        )
-        include_parent_execution = (
-            node.kind() == NodeKind.CONNECTOR or node.kind() == NodeKind.FLOW
-        )
-        include_inputs = node.kind() == NodeKind.FLOW
-        input_params = self.__get_input_params(
-            node.model_dump(by_alias=True),
-            current_node_filter=current_node_filter,
-            execution=execution,
-            parent_execution=parent_execution,
-            include_context=include_context,
-            include_parent_execution=include_parent_execution,
-            include_inputs=include_inputs,
+        return scope.active_rows(
+            None
+            if current_node_filter is None
+            else execution.filter_rows(current_node_filter)
         )
 
-        output = await node.run(**input_params)
+    def __skip_node(
+        self,
+        step: NodePlan,
+        execution: Execution,
+        scope: typing.Optional[ExecutionScope] = None,
+    ):
+        # No row reaches this node, its descendants got the empty filter already
+        if scope is None and not execution.has_ended():
+            execution.add_node(step.node)
 
-        if not execution.has_ended():
-            execution.add_node(node)
+        for output_name, state_key in step.output_keys.items():
+            if not output_name.endswith(constants.FILTER_SUFFIX):
+                execution.state_store.set_missing(state_key)
+
+    def __set_node_output(
+        self,
+        step: NodePlan,
+        output: typing.Dict[str, typing.Any],
+        current_node_filter: typing.Optional[np.ndarray],
+        execution: Execution,
+        scope: typing.Optional[ExecutionScope] = None,
+    ):
+        if scope is None and not execution.has_ended():
+            execution.add_node(step.node)
 
         for output_name, output_value in output.items():
             if (
                 output_name == constants.OUTPUT_REFERENCE_COLUMN
                 or output_name == constants.OUTPUT_MESSAGE_REFERENCE_COLUMN
             ):  # Setting output values
-                execution.set_state_data(output_name, output_value, current_node_filter)
+                if scope is None:
+                    execution.set_state_data(
+                        output_name, output_value, current_node_filter
+                    )
+                else:
+                    scope.set_output(
+                        execution.state_store,
+                        output_name,
+                        output_value,
+                        current_node_filter,
+                    )
             elif output_name.endswith(constants.FILTER_SUFFIX):  # Setting filters
-                self.__set_output_connection_filters(
-                    node_id,
-                    output_value,
-                    execution=execution,
-                    connector_filter=output_name,
-                )
+                if output_value is not None:
+                    execution.update_filters(
+                        output_value,
+                        output_connections=step.filter_targets.get(output_name, []),
+                    )
             else:  # Setting node outputs to be used as inputs by other nodes
                 execution.set_state_data(
-                    f"{node_id}@{output_name}",
+                    step.state_key(output_name),
                     output_value,
                     filter_by=current_node_filter,
                 )
 
+    async def __run_node(
+        self,
+        step: NodePlan,
+        execution: Execution,
+        scope: typing.Optional[ExecutionScope] = None,
+    ):
+        current_node_filter = self.__node_rows(step, execution, scope)
+
+        if current_node_filter is not None and len(current_node_filter) == 0:
+            self.__skip_node(step, execution, scope)
+            return
+
+        await self.__run_node_with_rows(step, current_node_filter, execution, scope)
+
+    async def __run_sequentially(
+        self, execution: Execution, raise_raw_exception: bool
+    ) -> typing.Optional[Exception]:
+        for step in self.plan.steps:
+            try:
+                await self.__run_node(step, execution=execution)
+            except Exception as e:
+                return self.__node_exception(
+                    e, step, execution.to_model, raise_raw_exception
+                )
+
+            if execution.has_ended():
+                break
+
+        return None
+
+    async def __run_concurrently(
+        self, execution: Execution, raise_raw_exception: bool, max_concurrency: int
+    ) -> typing.Optional[Exception]:
+        """Runs nodes as soon as the nodes they depend on are done.
+
+        Up to max_concurrency nodes are awaited at the same time. Their
+        outputs are set in execution order, except that while a node is
+        awaited, the nodes after it that are done already set theirs when no
+        node before them sets the result, which is the only output that
+        changes the rows of other nodes. Their dependents can then start too.
+        A node whose rows changed in the meantime, because an earlier output
+        resolved some of them, runs again with the right rows, so the result
+        is the same as running the nodes one by one. When a node fails, the
+        execution may hold the outputs of nodes after it.
+
+        Nodes that receive the parent execution, like flow nodes and
+        connectors, run concurrently as well: the child executions they add
+        are kept aside and added to the execution in execution order. Only the
+        sub-rules inlined into the plan run in order, since they write to the
+        execution.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        steps = self.plan.steps
+        steps_by_id = {step.node_id: step for step in steps}
+        pending_dependencies = {
+            node_id: len(self.plan.dependencies(node_id)) for node_id in steps_by_id
+        }
+        started = {}
+        discarded = []
+        # Child executions of the nodes whose outputs were set ahead of their
+        # turn, and errors raised when setting them
+        applied_ahead = {}
+        failed_ahead = {}
+
+        async def run_with_limit(step: NodePlan, input_params: dict):
+            async with semaphore:
+                return await step.run(**input_params)
+
+        def start(step: NodePlan):
+            if step.inlined is not None:
+                return
+
+            rows = execution.active_rows(execution.filters.get(step.node_id, None))
+            if rows is not None and len(rows) == 0:
+                return
+
+            try:
+                input_params = self.__get_input_params(step, rows, execution)
+            except Exception:  # Raised again when the node runs in order
+                return
+
+            child_executions = None
+            if step.include_parent_execution:
+                child_executions = _ChildExecutions(execution)
+                input_params["parent_execution"] = child_executions
+
+            started[step.node_id] = (
+                rows,
+                child_executions,
+                asyncio.ensure_future(run_with_limit(step, input_params)),
+            )
+
+        def release(step: NodePlan):
+            for dependent_id in self.plan.dependents(step.node_id):
+                pending_dependencies[dependent_id] -= 1
+                if pending_dependencies[dependent_id] == 0:
+                    start(steps_by_id[dependent_id])
+
+        def apply_ahead(position: int):
+            if _sets_result(steps[position]):
+                return
+
+            for step in steps[position + 1 :]:
+                node_id = step.node_id
+                if node_id in applied_ahead or node_id in failed_ahead:
+                    continue
+
+                if _sets_result(step):
+                    break
+
+                if pending_dependencies[node_id] != 0:
+                    continue
+
+                rows = execution.active_rows(execution.filters.get(node_id, None))
+                entry = started.get(node_id)
+                if entry is None:
+                    # Nodes that did not start only skip ahead, the others run in order
+                    if rows is None or len(rows) != 0:
+                        continue
+                    output = None
+                else:
+                    task_rows, child_executions, task = entry
+                    if (
+                        not task.done()
+                        or task.cancelled()
+                        or task.exception() is not None
+                        or not _same_rows(task_rows, rows)
+                    ):
+                        continue
+
+                    output = task.result()
+                    if _sets_result_columns(output):
+                        break
+
+                    del started[node_id]
+
+                try:
+                    self.__node_rows(step, execution)
+                    if output is None:
+                        self.__skip_node(step, execution)
+                        applied_ahead[node_id] = None
+                    else:
+                        self.__set_node_output(step, output, rows, execution)
+                        applied_ahead[node_id] = child_executions
+                except Exception as e:  # Raised when the node is reached in order
+                    failed_ahead[node_id] = e
+                    continue
+
+                release(step)
+
+        for step in steps:
+            if pending_dependencies[step.node_id] == 0:
+                start(step)
+
+        try:
+            for position, step in enumerate(steps):
+                if step.node_id in applied_ahead:
+                    child_executions = applied_ahead.pop(step.node_id)
+                    if child_executions is not None:
+                        child_executions.add_to_parent()
+                    continue
+
+                rows, child_executions, task = started.pop(
+                    step.node_id, (None, None, None)
+                )
+                try:
+                    if step.node_id in failed_ahead:
+                        raise failed_ahead.pop(step.node_id)
+
+                    current_node_filter = self.__node_rows(step, execution)
+
+                    if task is not None and _same_rows(rows, current_node_filter):
+                        apply_ahead(position)
+                        while not task.done():
+                            await asyncio.wait(
+                                [task]
+                                + [
+                                    other
+                                    for _, _, other in started.values()
+                                    if not other.done()
+                                ],
+                                return_when=asyncio.FIRST_COMPLETED,
+                            )
+                            apply_ahead(position)
+
+                        output, task = task.result(), None
+                        self.__set_node_output(
+                            step, output, current_node_filter, execution
+                        )
+                        if child_executions is not None:
+                            child_executions.add_to_parent()
+                    elif (
+                        current_node_filter is not None
+                        and len(current_node_filter) == 0
+                    ):
+                        self.__skip_node(step, execution)
+                    else:
+                        await self.__run_node_with_rows(
+                            step, current_node_filter, execution
+                        )
+                except Exception as e:
+                    return self.__node_exception(
+                        e, step, execution.to_model, raise_raw_exception
+                    )
+                finally:
+                    if task is not None:
+                        task.cancel()
+                        discarded.append(task)
+
+                if execution.has_ended():
+                    break
+
+                release(step)
+        finally:
+            discarded.extend(task for _, _, task in started.values())
+            for task in discarded:
+                task.cancel()
+            await asyncio.gather(*discarded, return_exceptions=True)
+
+        return None
+
+    async def __run_node_with_rows(
+        self,
+        step: NodePlan,
+        current_node_filter: typing.Optional[np.ndarray],
+        execution: Execution,
+        scope: typing.Optional[ExecutionScope] = None,
+    ):
+        input_params = self.__get_input_params(
+            step,
+            current_node_filter=current_node_filter,
+            execution=execution,
+            scope=scope,
+        )
+
+        if step.inlined is not None:
+            output = await self.__run_inlined(
+                step, input_params, current_node_filter, execution
+            )
+        elif step.batch is not None:
+            output = self.__run_batch(
+                step, input_params, current_node_filter, execution
+            )
+        else:
+            output = await step.run(**input_params)
+
+        self.__set_node_output(step, output, current_node_filter, execution, scope)
+
+    def __run_batch(
+        self,
+        step: NodePlan,
+        input_params: dict,
+        current_node_filter: typing.Optional[np.ndarray],
+        execution: Execution,
+    ) -> typing.Dict[str, typing.Any]:
+        batch = step.batch
+        rows, outputs = execution.batch_outputs.get(id(batch), (None, None))
+
+        if outputs is not None and step.node_id in outputs:
+            output = _outputs_for_rows(
+                outputs.pop(step.node_id), rows, current_node_filter
+            )
+            if output is not None:
+                return output
+
+        inputs = [input_params[input_name] for input_name in batch.inputs[step.node_id]]
+        outputs = dict(zip(batch.node_ids, batch.run_batch(batch.nodes, inputs)))
+        output = outputs.pop(step.node_id)
+        execution.batch_outputs[id(batch)] = (current_node_filter, outputs)
+
+        return output
+
+    async def __run_inlined(
+        self,
+        step: NodePlan,
+        input_params: dict,
+        current_node_filter: typing.Optional[np.ndarray],
+        execution: Execution,
+    ) -> typing.Dict[str, typing.Any]:
+        """Runs the steps of an inlined sub-rule over the rows of its flow node.
+
+        The sub-rule gets the same payload the flow node would execute it
+        with, validated by its request manager, and its output becomes the
+        output of the flow node.
+        """
+        inlined = step.inlined
+        rows = (
+            np.arange(len(execution.state_store))
+            if current_node_filter is None
+            else current_node_filter
+        )
+        index = pd.Index(rows)
+
+        payload = {}
+        for name, value in input_params.items():
+            if name in _EXECUTION_PARAMS:
+                continue
+
+            if name.startswith("input_"):
+                name = name[len("input_") :]
+
+            if not isinstance(value, pd.Series):
+                value = pd.Series(value, index=index)
+            payload[name] = value
+
+        try:
+            payload.update(inlined.request_manager.validate_columns(payload))
+        except Exception as e:
+            raise exceptions.ValidationException(
+                rule_metadata=inlined.metadata,
+                payload_df=pd.DataFrame(payload),
+                raised_exception=e,
+            )
+
+        scope = ExecutionScope(
+            rows, payload, inlined.output_keys, execution.state_store
+        )
+        for state_key, input_name in inlined.input_columns.items():
+            execution.state_store.set(state_key, payload[input_name], rows=rows)
+
+        for sub_step in inlined.steps:
+            try:
+                await self.__run_node(sub_step, execution, scope)
+            except Exception as e:
+                raise self.__node_exception(
+                    e, sub_step, execution.to_model, False, inlined.metadata
+                )
+
+            if scope.has_ended():
+                break
+
+        return {"output_value": scope.output(execution.state_store)}
+
+    def __node_exception(
+        self,
+        e: Exception,
+        step: NodePlan,
+        execution_data: typing.Callable[[], ExecutionSchema],
+        raise_raw_exception: bool,
+        metadata: typing.Optional[RuleMetadata] = None,
+    ) -> Exception:
+        if raise_raw_exception:
+            raise e
+
+        metadata = metadata or self.metadata
+
+        msg = None
+        if isinstance(e, exceptions.ExecutionException):
+            msg = "Error executing a sub-rule node {} from rule {} version {}".format(
+                step.node_id, metadata.name, metadata.version
+            )
+
+        return exceptions.ExecutionException(
+            rule_metadata=metadata,
+            execution_data=execution_data(),
+            node_id=step.node_id,
+            raised_exception=e,
+            msg=msg,
+        )
+
+    async def __run_record_node(
+        self,
+        step: NodePlan,
+        states: dict,
+        record: dict,
+        context: typing.Optional[registry.Registry],
+    ) -> typing.Dict[str, typing.Any]:
+        input_params = {}
+        for connector_name, state_key in step.input_keys:
+            if state_key in self.constants:
+                input_params[connector_name] = self.constants[state_key]
+            else:
+                value = states.get(state_key, scalars.NAN)
+                if step.run_one is None:
+                    value = pd.Series([value])
+                input_params[connector_name] = value
+
+        if step.include_context:
+            input_params["context"] = context
+
+        if step.include_inputs:
+            for column, value in record.items():
+                input_name = f"input_{column}"
+                if input_name not in input_params:
+                    if step.run_one is None:
+                        value = pd.Series([value])
+                    input_params[input_name] = value
+
+        if step.run_one is not None:
+            return await step.run_one(**input_params)
+
+        output = await step.run(**input_params)
+        return {name: scalars.unwrap(value) for name, value in output.items()}
+
     def reset_request_manager(self, input_nodes: typing.List[BaseNode]) -> None:
         """Resets the request manager. This method should be called when the input nodes change.
 
@@ -209,11 +651,14 @@ class RuleExecutor:
 
         self._set_constants()
 
-    def validate_payload(self, payload_df: pd.DataFrame) -> pd.DataFrame:
+    def validate_payload(
+        self, payload_df: pd.DataFrame, trusted: bool = False
+    ) -> pd.DataFrame:
         """Validates the payload.
 
         Args:
             payload_df (pd.DataFrame): The payload to be validated.
+            trusted (bool, optional): If True, the payload was already validated upstream and is only reindexed by row position, without copying its data. Defaults to False.
 
         Raises:
             exceptions.ValidationException: If there is an error during validation.
@@ -229,8 +674,11 @@ class RuleExecutor:
                 msg="Payload must be a DataFrame",
             )
 
+        if trusted:
+            return with_range_index(payload_df)
+
         try:
-            validated = self.request_manager.validate(payload_df.reset_index(drop=True))
+            validated = self.request_manager.validate(payload_df)
         except Exception as e:
             raise exceptions.ValidationException(
                 rule_metadata=self.metadata, payload_df=payload_df, raised_exception=e
@@ -246,6 +694,8 @@ class RuleExecutor:
         context: typing.Optional[registry.Registry] = None,
         parent_execution: typing.Optional[Execution] = None,
         parent_node_id: typing.Optional[str] = None,
+        max_concurrency: typing.Optional[int] = None,
+        trusted: bool = False,
     ) -> typing.Union[
         pd.DataFrame, typing.Tuple[Execution, typing.Optional[Exception]]
     ]:
@@ -256,6 +706,8 @@ class RuleExecutor:
             debug_mode (bool, optional): If True, runs the rule in debug mode and returns the exception, if any. Defaults to False.
             raise_raw_exception (bool, optional): If True, raises the raw exception. Defaults to False.
             context (registry.Registry, optional): Global constants to be used during execution. Defaults to None.
+            max_concurrency (int, optional): Overrides the executor max_concurrency for this call. Defaults to None.
+            trusted (bool, optional): If True, skips the validation of a payload already validated upstream. Defaults to False.
 
         Raises:
             exceptions.ExecutionException: If there is an error during execution.
@@ -265,7 +717,7 @@ class RuleExecutor:
             typing.Union[pd.DataFrame, typing.Tuple[Execution, typing.Optional[Exception]]]: The result of the execution or a tuple with the execution and the exception, if any.
         """
         try:
-            validated_payload = self.validate_payload(payload_df)
+            validated_payload = self.validate_payload(payload_df, trusted=trusted)
         except exceptions.ValidationException as e:
             if debug_mode:
                 return None, e
@@ -279,35 +731,21 @@ class RuleExecutor:
         )
         execution.set_constants_data(self.constants)
 
-        for node_id in self.execution_order:
-            try:
-                await self.__run_node(
-                    node_id, execution=execution, parent_execution=parent_execution
-                )
-            except Exception as e:
-                if raise_raw_exception:
-                    raise e
-
-                msg = None
-                if isinstance(e, exceptions.ExecutionException):
-                    msg = "Error executing a sub-rule node {} from rule {} version {}".format(
-                        node_id, self.metadata.name, self.metadata.version
-                    )
+        if max_concurrency is None:
+            max_concurrency = self.max_concurrency
 
-                exception = exceptions.ExecutionException(
-                    rule_metadata=self.metadata,
-                    execution_data=execution.to_model(),
-                    node_id=node_id,
-                    raised_exception=e,
-                    msg=msg,
-                )
-                if debug_mode:
-                    return execution, exception
+        if max_concurrency > 1:
+            exception = await self.__run_concurrently(
+                execution, raise_raw_exception, max_concurrency
+            )
+        else:
+            exception = await self.__run_sequentially(execution, raise_raw_exception)
 
-                raise exception
+        if exception is not None:
+            if debug_mode:
+                return execution, exception
 
-            if execution.has_ended():
-                break
+            raise exception
 
         if parent_execution and parent_node_id is not None:
             parent_execution.add_child_execution(
@@ -318,3 +756,399 @@ class RuleExecutor:
             return execution, None
 
         return execution.result
+
+    async def execute_chunks(
+        self,
+        chunks: typing.Iterable[pd.DataFrame],
+        context: typing.Optional[registry.Registry] = None,
+        max_concurrency: typing.Optional[int] = None,
+        trusted: bool = False,
+        keep_columns: typing.Optional[typing.List[str]] = None,
+    ) -> typing.AsyncIterator[pd.DataFrame]:
+        """Executes the rule over the chunks of a payload, one chunk at a time.
+
+        Only one chunk and its execution are held in memory at once, so the
+        memory used does not grow with the size of the whole payload.
+
+        Args:
+            chunks (typing.Iterable[pd.DataFrame]): The chunks of the payload, e.g. from utils.files.read_chunks.
+            context (registry.Registry, optional): Global constants to be used during execution. Defaults to None.
+            max_concurrency (int, optional): Overrides the executor max_concurrency. Defaults to None.
+            trusted (bool, optional): If True, skips the validation of the chunks. Defaults to False.
+            keep_columns (typing.List[str], optional): Payload columns copied into the results, e.g. ids to join them back. Defaults to None.
+
+        Raises:
+            exceptions.ExecutionException: If there is an error during execution.
+            exceptions.ValidationException: If there is an error during validation.
+
+        Returns:
+            typing.AsyncIterator[pd.DataFrame]: The result of each chunk, in order and indexed by row position in the whole payload.
+        """
+        start = 0
+        for chunk in chunks:
+            result = await self.execute(
+                chunk,
+                context=context,
+                max_concurrency=max_concurrency,
+                trusted=trusted,
+            )
+            result.index = pd.RangeIndex(start, start + len(result))
+
+            if keep_columns:
+                kept = chunk[keep_columns].set_axis(result.index)
+                result = pd.concat([kept, result], axis=1)
+
+            start += len(result)
+            yield result
+
+    async def execute_file(
+        self,
+        input_path: typing.Union[str, os.PathLike],
+        output_path: typing.Union[str, os.PathLike],
+        chunk_size: int = 10_000,
+        context: typing.Optional[registry.Registry] = None,
+        max_concurrency: typing.Optional[int] = None,
+        keep_columns: typing.Optional[typing.List[str]] = None,
+    ) -> int:
+        """Executes the rule over a CSV or Parquet file and writes the results to another one.
+
+        The input is read and the output written chunk_size rows at a time, in
+        the order of the input. Parquet files require pyarrow.
+
+        Args:
+            input_path (str | os.PathLike): The payload file, .csv or .parquet.
+            output_path (str | os.PathLike): The results file, .csv or .parquet. Overwritten if it exists.
+            chunk_size (int, optional): Number of rows executed at once. Defaults to 10_000.
+            context (registry.Registry, optional): Global constants to be used during execution. Defaults to None.
+            max_concurrency (int, optional): Overrides the executor max_concurrency. Defaults to None.
+            keep_columns (typing.List[str], optional): Payload columns copied into the results. Defaults to None.
+
+        Raises:
+            exceptions.ExecutionException: If there is an error during execution.
+            exceptions.ValidationException: If there is an error during validation.
+
+        Returns:
+            int: Number of rows written.
+        """
+        with files.ChunkWriter(output_path) as writer:
+            async for result in self.execute_chunks(
+                files.read_chunks(input_path, chunk_size),
+                context=context,
+                max_concurrency=max_concurrency,
+                keep_columns=keep_columns,
+            ):
+                writer.write(result)
+
+            if writer.rows == 0:
+                writer.write(
+                    pd.DataFrame(
+                        columns=(keep_columns or [])
+                        + [
+                            constants.OUTPUT_REFERENCE_COLUMN,
+                            constants.OUTPUT_MESSAGE_REFERENCE_COLUMN,
+                        ]
+                    )
+                )
+
+        return writer.rows
+
+    async def execute_parallel(
+        self,
+        payload_df: pd.DataFrame,
+        workers: typing.Optional[int] = None,
+        shard_size: typing.Optional[int] = None,
+        context: typing.Optional[registry.Registry] = None,
+        max_concurrency: typing.Optional[int] = None,
+        mp_context: typing.Optional[multiprocessing.context.BaseContext] = None,
+    ) -> pd.DataFrame:
+        """Executes the rule over shards of the payload in a pool of processes.
+
+        The payload is validated once, split into contiguous shards and each
+        shard runs in a worker process that builds the rule once, from the
+        executor source, when it starts.
+
+        Args:
+            payload_df (pd.DataFrame): The payload to be executed.
+            workers (int, optional): Number of worker processes. Defaults to None, which uses os.cpu_count().
+            shard_size (int, optional): Maximum number of rows per shard. Defaults to None, which gives one shard per worker.
+            context (registry.Registry, optional): Global constants to be used during execution. Must be picklable. Defaults to None.
+            max_concurrency (int, optional): Overrides the executor max_concurrency inside the workers. Defaults to None.
+            mp_context (multiprocessing.context.BaseContext, optional): Context used to start the workers. Defaults to None, which uses "spawn".
+
+        Raises:
+            ValueError: If the executor has no source to build the workers from.
+            exceptions.ShardExecutionException: If there is an error executing a shard.
+            exceptions.ValidationException: If there is an error during validation.
+
+        Returns:
+            pd.DataFrame: The result of the execution, in the order of the payload.
+        """
+        if self.source is None:
+            raise ValueError(
+                "execute_parallel requires an executor created by Rule.create or a source"
+            )
+
+        validated_payload = self.validate_payload(payload_df)
+
+        workers = workers or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        if shard_size is None:
+            shard_size = max(1, math.ceil(len(validated_payload) / workers))
+        elif shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+
+        bounds = [
+            (start, min(start + shard_size, len(validated_payload)))
+            for start in range(0, len(validated_payload), shard_size)
+        ]
+        if not bounds:
+            return await self.execute(validated_payload, context=context, trusted=True)
+
+        loop = asyncio.get_running_loop()
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(workers, len(bounds)),
+            mp_context=mp_context or multiprocessing.get_context("spawn"),
+            initializer=parallel.load_worker_executor,
+            initargs=(self.source,),
+        )
+        try:
+            futures = [
+                loop.run_in_executor(
+                    pool,
+                    parallel.execute_shard,
+                    validated_payload.iloc[start:end],
+                    context,
+                    max_concurrency,
+                )
+                for start, end in bounds
+            ]
+
+            results = []
+            for shard, ((start, end), future) in enumerate(zip(bounds, futures)):
+                result, error = await future
+                if error is not None:
+                    raise exceptions.ShardExecutionException(
+                        rule_metadata=self.metadata,
+                        shard=shard,
+                        start_row=start,
+                        end_row=end,
+                        raised_exception=ExceptionSchema(**error),
+                        node_id=_error_node_id(error),
+                    )
+                results.append(result)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return pd.concat(results, ignore_index=True)
+
+    def validate_record(self, record: dict) -> dict:
+        """Validates a single record.
+
+        Args:
+            record (dict): The record to be validated.
+
+        Raises:
+            exceptions.ValidationException: If there is an error during validation.
+
+        Returns:
+            dict: The validated record.
+        """
+        try:
+            return self.request_manager.validate_record(record)
+        except Exception as e:
+            raise exceptions.ValidationException(
+                rule_metadata=self.metadata,
+                payload_df=pd.DataFrame([record])
+                if isinstance(record, dict)
+                else record,
+                raised_exception=e,
+            )
+
+    async def execute_one(
+        self,
+        record: dict,
+        raise_raw_exception: bool = False,
+        context: typing.Optional[registry.Registry] = None,
+    ) -> typing.Dict[str, typing.Any]:
+        """Executes the rule over a single record, without building DataFrames.
+
+        Nodes run their scalar kernel (run_one) over plain Python values and the
+        result is the same as executing a one row DataFrame.
+
+        Args:
+            record (dict): The record to be executed.
+            raise_raw_exception (bool, optional): If True, raises the raw exception. Defaults to False.
+            context (registry.Registry, optional): Global constants to be used during execution. Defaults to None.
+
+        Raises:
+            exceptions.ExecutionException: If there is an error during execution.
+            exceptions.ValidationException: If there is an error during validation.
+
+        Returns:
+            typing.Dict[str, typing.Any]: The output and message of the record, None when missing.
+        """
+        validated_record = self.validate_record(record)
+
+        if not self.plan.runs_records:
+            result = await self.execute(
+                pd.DataFrame([validated_record]),
+                raise_raw_exception=raise_raw_exception,
+                context=context,
+            )
+            output, message = result.iloc[0][
+                [
+                    constants.OUTPUT_REFERENCE_COLUMN,
+                    constants.OUTPUT_MESSAGE_REFERENCE_COLUMN,
+                ]
+            ]
+        else:
+            output, message = await self.__execute_record(
+                validated_record, raise_raw_exception, context
+            )
+
+        return {
+            constants.OUTPUT_REFERENCE_COLUMN: scalars.to_native(output),
+            constants.OUTPUT_MESSAGE_REFERENCE_COLUMN: scalars.to_native(message),
+        }
+
+    async def __execute_record(
+        self,
+        record: dict,
+        raise_raw_exception: bool,
+        context: typing.Optional[registry.Registry],
+    ) -> typing.Tuple[typing.Any, typing.Any]:
+        # Same steps as execute, with a bool per filter instead of a mask
+        states = {key: record[column] for key, column in self.input_columns.items()}
+        states[constants.OUTPUT_REFERENCE_COLUMN] = scalars.NAN
+        states[constants.OUTPUT_MESSAGE_REFERENCE_COLUMN] = scalars.NAN
+        filters = {}
+
+        for step in self.plan.steps:
+            node_filter = filters.get(step.node_id, None)
+            if node_filter is not None:
+                for target in step.targets:
+                    filters[target] = filters.get(target, True) and node_filter
+
+                if not node_filter:
+                    for output_name, state_key in step.output_keys.items():
+                        if not output_name.endswith(constants.FILTER_SUFFIX):
+                            states[state_key] = scalars.NAN
+                    continue
+
+            try:
+                output = await self.__run_record_node(step, states, record, context)
+            except Exception as e:
+                raise self.__node_exception(
+                    e,
+                    step,
+                    lambda: ExecutionSchema(
+                        payload=record, states=states, filters=filters
+                    ),
+                    raise_raw_exception,
+                )
+
+            for output_name, output_value in output.items():
+                if (
+                    output_name == constants.OUTPUT_REFERENCE_COLUMN
+                    or output_name == constants.OUTPUT_MESSAGE_REFERENCE_COLUMN
+                ):
+                    states[output_name] = output_value
+                elif output_name.endswith(constants.FILTER_SUFFIX):
+                    if output_value is not None:
+                        for target in step.filter_targets.get(output_name, []):
+                            filters[target] = filters.get(target, True) and bool(
+                                output_value
+                            )
+                else:
+                    states[step.state_key(output_name)] = output_value
+
+            if not scalars.is_missing(states[constants.OUTPUT_REFERENCE_COLUMN]):
+                break
+
+        return (
+            states[constants.OUTPUT_REFERENCE_COLUMN],
+            states[constants.OUTPUT_MESSAGE_REFERENCE_COLUMN],
+        )
+
+
+class _ChildExecutions:
+    def __init__(self, execution: Execution):
+        """Stands for the parent execution of a node run ahead of its turn.
+
+        The child executions added by the node are kept aside until its
+        output is set, and dropped if it runs again. Everything else is read
+        from the parent execution.
+
+        Args:
+            execution (Execution): The parent execution.
+        """
+        self._execution = execution
+        self._child_executions: typing.List[typing.Tuple[str, Execution]] = []
+
+    def add_child_execution(self, node_id: str, execution: Execution):
+        self._child_executions.append((node_id, execution))
+
+    def add_to_parent(self):
+        for node_id, execution in self._child_executions:
+            self._execution.add_child_execution(node_id=node_id, execution=execution)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self._execution, name)
+
+
+def _sets_result(step: NodePlan) -> bool:
+    """Whether the node sets the output of the rule, and so the rows of other nodes."""
+    return step.kind == NodeKind.OUTPUT or step.inlined is not None
+
+
+def _sets_result_columns(output: typing.Dict[str, typing.Any]) -> bool:
+    return (
+        constants.OUTPUT_REFERENCE_COLUMN in output
+        or constants.OUTPUT_MESSAGE_REFERENCE_COLUMN in output
+    )
+
+
+def _error_node_id(error: dict) -> typing.Optional[str]:
+    # The node that failed inside the worker, when the shard raised an ExecutionException
+    if isinstance(error.get("msg"), dict):
+        return error["msg"].get("metadata", {}).get("node_id")
+
+    return None
+
+
+def _outputs_for_rows(
+    output: typing.Dict[str, typing.Any],
+    rows: typing.Optional[np.ndarray],
+    other: typing.Optional[np.ndarray],
+) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Restricts the outputs computed over rows to the other rows, when they are a subset."""
+    if _same_rows(rows, other):
+        return output
+
+    if other is None:
+        return None
+
+    if rows is None:
+        positions = other
+    else:
+        positions = np.searchsorted(rows, other)
+        if np.any(positions >= len(rows)) or not np.array_equal(
+            rows[np.minimum(positions, len(rows) - 1)], other
+        ):
+            return None
+
+    return {
+        output_name: value.iloc[positions] if isinstance(value, pd.Series) else value
+        for output_name, value in output.items()
+    }
+
+
+def _same_rows(
+    rows: typing.Optional[np.ndarray], other: typing.Optional[np.ndarray]
+) -> bool:
+    if rows is None or other is None:
+        return rows is other
+
+    return rows is other or np.array_equal(rows, other)
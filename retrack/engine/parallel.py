@@ -0,0 +1,52 @@
+"""Functions run by the worker processes of RuleExecutor.execute_parallel.
+
+Each worker builds its executor once, in the pool initializer, so the rule is
+not pickled again for every shard.
+"""
+
+import asyncio
+import typing
+
+import pandas as pd
+
+from retrack.utils import exceptions, registry
+
+_worker_executor = None
+
+
+def load_worker_executor(source: typing.Callable[[], typing.Any]):
+    """Pool initializer that builds the executor used by the worker.
+
+    Args:
+        source (typing.Callable[[], RuleExecutor]): Picklable callable that builds the executor.
+    """
+    global _worker_executor
+    _worker_executor = source()
+
+
+def execute_shard(
+    shard_df: pd.DataFrame,
+    context: typing.Optional[registry.Registry],
+    max_concurrency: typing.Optional[int],
+) -> typing.Tuple[typing.Optional[pd.DataFrame], typing.Optional[dict]]:
+    """Executes an already validated shard with the executor of the worker.
+
+    The exceptions of the rule can not be unpickled by the parent process, so
+    errors are returned as the dump of their ExceptionSchema instead.
+
+    Returns:
+        typing.Tuple[pd.DataFrame | None, dict | None]: The result of the shard or the error raised.
+    """
+    try:
+        result = asyncio.run(
+            _worker_executor.execute(
+                shard_df,
+                context=context,
+                max_concurrency=max_concurrency,
+                trusted=True,
+            )
+        )
+    except Exception as e:
+        return None, exceptions.create_exception_schema(e).model_dump()
+
+    return result, None
@@ -0,0 +1,404 @@
+import copy
+import typing
+
+import pydantic
+
+from retrack.nodes.base import BaseNode, NodeKind
+from retrack.utils import constants
+from retrack.utils.component_registry import ComponentRegistry
+
+
+def _defining_class(node_type: typing.Type[BaseNode], name: str) -> type:
+    return next(klass for klass in node_type.__mro__ if name in vars(klass))
+
+
+def _has_scalar_kernel(node_type: typing.Type[BaseNode]) -> bool:
+    return issubclass(
+        _defining_class(node_type, "run_one"), _defining_class(node_type, "run")
+    )
+
+
+class NodePlan:
+    """Everything the executor needs to run a node, resolved once at compile time.
+
+    The connections come from the adjacency indexes of the components
+    registry, and the hot loop only reads these attributes, so it never has
+    to query the registry again.
+    """
+
+    def __init__(
+        self,
+        node_id: str,
+        node: BaseNode,
+        inputs: typing.Dict[str, typing.List[typing.Tuple[str, str]]],
+        outputs: typing.Dict[str, typing.List[typing.Tuple[str, str]]],
+    ):
+        self.node_id = node_id
+        self.node = node
+        self.run = node.run
+        # Nodes that override run but not run_one are executed by wrapping
+        # their inputs in one element Series
+        self.run_one = node.run_one if _has_scalar_kernel(type(node)) else None
+
+        self.kind = node.kind()
+        self.memory_type = node.memory_type()
+        self.include_context = self.kind in (NodeKind.CONNECTOR, NodeKind.FLOW)
+        self.include_parent_execution = self.include_context
+        self.include_inputs = self.kind == NodeKind.FLOW
+
+        self.input_keys: typing.List[typing.Tuple[str, str]] = []
+        self.sources: typing.List[str] = []
+        for connector_name, connections in inputs.items():
+            state_key = None
+            for source_id, output_name in connections:
+                self.sources.append(source_id)
+                state_key = f"{source_id}@{output_name}"
+
+            if connector_name.endswith(constants.NULL_SUFFIX):
+                continue
+
+            if state_key is not None:
+                self.input_keys.append((connector_name, state_key))
+
+        # Inputs read as floats get the conversion cached by the state store
+        self.float_inputs: typing.FrozenSet[str] = frozenset(node.float_inputs())
+
+        self.targets: typing.List[str] = []
+        self.filter_targets: typing.Dict[str, typing.List[str]] = {}
+        self.output_keys: typing.Dict[str, str] = {}
+        for connector_name, connections in outputs.items():
+            connector_targets = [target_id for target_id, _ in connections]
+            self.targets.extend(connector_targets)
+            self.filter_targets[connector_name] = connector_targets
+            self.output_keys[connector_name] = f"{node_id}@{connector_name}"
+
+        # Set when the sub-rule of a flow node is compiled into this plan
+        self.inlined: typing.Optional[InlinedRule] = None
+        # Set when the node is run together with others reading the same inputs
+        self.batch: typing.Optional[BatchPlan] = None
+
+    def namespaced(self, prefix: str) -> "NodePlan":
+        """Returns a copy of the step whose node ids and state keys start with prefix."""
+        step = copy.copy(self)
+        step.node_id = prefix + self.node_id
+        step.input_keys = [
+            (connector_name, prefix + state_key)
+            for connector_name, state_key in self.input_keys
+        ]
+        step.sources = [prefix + source_id for source_id in self.sources]
+        step.targets = [prefix + target_id for target_id in self.targets]
+        step.filter_targets = {
+            connector_name: [prefix + target_id for target_id in targets]
+            for connector_name, targets in self.filter_targets.items()
+        }
+        step.output_keys = {
+            output_name: prefix + state_key
+            for output_name, state_key in self.output_keys.items()
+        }
+        step.inlined = None
+        step.batch = None
+
+        return step
+
+    def state_key(self, output_name: str) -> str:
+        state_key = self.output_keys.get(output_name, None)
+        if state_key is None:
+            state_key = f"{self.node_id}@{output_name}"
+            self.output_keys[output_name] = state_key
+
+        return state_key
+
+    def __repr__(self) -> str:
+        return f"NodePlan({self.node_id}, {self.node.name})"
+
+
+class InlinedRule:
+    """The sub-rule of a flow node, compiled into the plan of its parent rule.
+
+    Its steps are the steps of the sub-rule plan with their node ids and state
+    keys prefixed by the id of the flow node, so they run over the rows of the
+    flow node in the execution of the parent rule, next to its own states and
+    filters. The flow nodes of the sub-rule are inlined as well.
+    """
+
+    def __init__(
+        self, node_id: str, executor: typing.Any, merge_common_nodes: bool = False
+    ):
+        prefix = f"{node_id}/"
+
+        self.metadata = executor.metadata
+        self.request_manager = executor.request_manager
+        self.input_columns: typing.Dict[str, str] = {
+            prefix + state_key: input_name
+            for state_key, input_name in executor.input_columns.items()
+        }
+        self.constants: typing.Dict[str, typing.Any] = {
+            prefix + state_key: value for state_key, value in executor.constants.items()
+        }
+        self.output_keys: typing.Dict[str, str] = {
+            output_name: prefix + output_name
+            for output_name in (
+                constants.OUTPUT_REFERENCE_COLUMN,
+                constants.OUTPUT_MESSAGE_REFERENCE_COLUMN,
+            )
+        }
+
+        self.steps = [step.namespaced(prefix) for step in executor.plan.steps]
+        for step in self.steps:
+            if _inline(step, merge_common_nodes):
+                self.constants.update(step.inlined.constants)
+
+        if merge_common_nodes:
+            self.steps = _merge_common_nodes(self.steps)
+
+        _batch(self.steps)
+
+    def __repr__(self) -> str:
+        return f"InlinedRule({self.metadata.name}, {len(self.steps)} steps)"
+
+
+class BatchPlan:
+    """Nodes of the same type that read the same states, run at once.
+
+    The first of them to run computes the outputs of every node of the batch
+    with the run_batch of its node, and the others reuse them when they run
+    over the same rows, or over a subset of them.
+    """
+
+    def __init__(self, steps: typing.List[NodePlan]):
+        self.steps = steps
+        self.nodes = [step.node for step in steps]
+        self.node_ids = [step.node_id for step in steps]
+        self.run_batch = steps[0].node.run_batch
+        self.inputs: typing.Dict[str, typing.List[str]] = {
+            step.node_id: step.node.batch_inputs() for step in steps
+        }
+
+    def __repr__(self) -> str:
+        return f"BatchPlan({', '.join(self.node_ids)})"
+
+
+def _batch(steps: typing.List[NodePlan]):
+    """Groups the steps whose nodes can be run at once, see BatchPlan."""
+    groups: typing.Dict[tuple, typing.List[NodePlan]] = {}
+    for step in steps:
+        batch_inputs = getattr(step.node, "batch_inputs", None)
+        if batch_inputs is None or step.inlined is not None:
+            continue
+
+        input_names = batch_inputs()
+        if not input_names:
+            continue
+
+        state_keys = dict(step.input_keys)
+        if any(input_name not in state_keys for input_name in input_names):
+            continue
+
+        key = (step.node.name,) + tuple(state_keys[name] for name in input_names)
+        groups.setdefault(key, []).append(step)
+
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+
+        batch = BatchPlan(group)
+        for step in group:
+            step.batch = batch
+
+
+def _inline(step: NodePlan, merge_common_nodes: bool = False) -> bool:
+    """Inlines the sub-rule of a flow step, returns whether it had one."""
+    sub_rule_executor = getattr(step.node, "sub_rule_executor", None)
+    if step.kind != NodeKind.FLOW or sub_rule_executor is None:
+        return False
+
+    step.inlined = InlinedRule(step.node_id, sub_rule_executor(), merge_common_nodes)
+    return True
+
+
+_MERGEABLE_KINDS = (NodeKind.OTHER, NodeKind.CONSTANT)
+
+
+def _canonical_key(
+    step: NodePlan, filter_sources: typing.FrozenSet[typing.Tuple[str, str]]
+) -> typing.Optional[tuple]:
+    """What the outputs of a step depend on, None if it must run on its own.
+
+    Steps with the same key run over the same rows, read the same states and
+    compute them the same way. Steps that set filters or outputs, receive the
+    execution or are not deterministic are never merged.
+    """
+    node = step.node
+    if (
+        step.kind not in _MERGEABLE_KINDS
+        or step.include_context
+        or step.inlined is not None
+        or not node.deterministic()
+    ):
+        return None
+
+    for output_name in step.output_keys:
+        if output_name.endswith(constants.FILTER_SUFFIX) or output_name in (
+            constants.OUTPUT_REFERENCE_COLUMN,
+            constants.OUTPUT_MESSAGE_REFERENCE_COLUMN,
+        ):
+            return None
+
+    data = getattr(node, "data", None)
+    if isinstance(data, pydantic.BaseModel):
+        data = data.model_dump_json()
+
+    return (
+        node.name,
+        repr(data),
+        tuple(sorted(step.input_keys)),
+        tuple(sorted(set(step.sources))),
+        filter_sources,
+    )
+
+
+def _merge_common_nodes(steps: typing.List[NodePlan]) -> typing.List[NodePlan]:
+    """Removes the steps that compute the same as an earlier one, see _canonical_key.
+
+    The inputs of the later steps that read a removed step are aliased to the
+    outputs of the step that is kept, which also passes its filter on to them.
+    The removed nodes have no state nor entry in the nodes of the execution.
+    """
+    filter_sources: typing.Dict[str, typing.Set[typing.Tuple[str, str]]] = {}
+    for step in steps:
+        for connector_name, targets in step.filter_targets.items():
+            if connector_name.endswith(constants.FILTER_SUFFIX):
+                for target_id in targets:
+                    filter_sources.setdefault(target_id, set()).add(
+                        (step.node_id, connector_name)
+                    )
+
+    kept_steps = []
+    canonical_steps: typing.Dict[tuple, NodePlan] = {}
+    state_aliases: typing.Dict[str, str] = {}
+    node_aliases: typing.Dict[str, str] = {}
+    for step in steps:
+        if state_aliases:
+            step.input_keys = [
+                (connector_name, state_aliases.get(state_key, state_key))
+                for connector_name, state_key in step.input_keys
+            ]
+            step.sources = [
+                node_aliases.get(source_id, source_id) for source_id in step.sources
+            ]
+
+        key = _canonical_key(step, frozenset(filter_sources.get(step.node_id, ())))
+        canonical = step if key is None else canonical_steps.setdefault(key, step)
+        if canonical is step:
+            kept_steps.append(step)
+            continue
+
+        for output_name, state_key in step.output_keys.items():
+            state_aliases[state_key] = canonical.state_key(output_name)
+        node_aliases[step.node_id] = canonical.node_id
+        canonical.targets.extend(step.targets)
+
+    return kept_steps
+
+
+class ExecutionPlan:
+    """The compiled form of a rule: one NodePlan per node, in execution order."""
+
+    def __init__(self, steps: typing.List[NodePlan]):
+        self._steps = steps
+        _batch(steps)
+
+        self._inlined_constants = {}
+        for step in steps:
+            if step.inlined is not None:
+                self._inlined_constants.update(step.inlined.constants)
+
+        # A node depends on the nodes it reads from and on the nodes that push
+        # their filters to it.
+        step_ids = {step.node_id for step in steps}
+        self._dependencies = {step.node_id: set() for step in steps}
+        for step in steps:
+            for source in step.sources:
+                if source in step_ids:
+                    self._dependencies[step.node_id].add(source)
+
+            for target in step.targets:
+                if target in step_ids:
+                    self._dependencies[target].add(step.node_id)
+
+        self._dependents = {step.node_id: [] for step in steps}
+        for node_id, dependencies in self._dependencies.items():
+            for dependency in dependencies:
+                self._dependents[dependency].append(node_id)
+
+    @property
+    def steps(self) -> typing.List[NodePlan]:
+        return self._steps
+
+    @property
+    def runs_records(self) -> bool:
+        """Whether the plan can run a single record without an Execution.
+
+        Nodes without scalar kernel can not get the parent execution there.
+        """
+        return all(
+            step.run_one is not None or not step.include_parent_execution
+            for step in self._steps
+        )
+
+    @property
+    def inlined_constants(self) -> typing.Dict[str, typing.Any]:
+        """Constants of the inlined sub-rules, by their prefixed state keys."""
+        return self._inlined_constants
+
+    def dependencies(self, node_id: str) -> typing.Set[str]:
+        """Nodes that must run before the given node."""
+        return self._dependencies[node_id]
+
+    def dependents(self, node_id: str) -> typing.List[str]:
+        """Nodes that wait for the given node."""
+        return self._dependents[node_id]
+
+    @classmethod
+    def compile(
+        cls,
+        components_registry: ComponentRegistry,
+        execution_order: typing.List[str],
+        inline_subrules: bool = False,
+        merge_common_nodes: bool = False,
+    ) -> "ExecutionPlan":
+        """Resolves every node of the execution order into a NodePlan.
+
+        Args:
+            components_registry (ComponentRegistry): Components registry.
+            execution_order (typing.List[str]): Execution order.
+            inline_subrules (bool, optional): Whether to compile the sub-rules of the flow nodes into the plan, instead of executing them on their own. Defaults to False.
+            merge_common_nodes (bool, optional): Whether to run the nodes that compute the same as an earlier node only once, their consumers reading the outputs of that node. Defaults to False.
+
+        Returns:
+            ExecutionPlan: The compiled plan.
+        """
+        steps = [
+            NodePlan(
+                node_id,
+                components_registry.get(node_id),
+                components_registry.get_node_inputs(node_id),
+                components_registry.get_node_outputs(node_id),
+            )
+            for node_id in execution_order
+        ]
+
+        if inline_subrules:
+            for step in steps:
+                _inline(step, merge_common_nodes)
+
+        if merge_common_nodes:
+            steps = _merge_common_nodes(steps)
+
+        return cls(steps)
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def __iter__(self) -> typing.Iterator[NodePlan]:
+        return iter(self._steps)
@@ -1,10 +1,13 @@
 import typing
 
 import pandas as pd
-import pandera
 import pydantic
 
 from retrack.nodes.base import BaseNode, NodeKind
+from retrack.utils import scalars
+
+if typing.TYPE_CHECKING:
+    import pandera
 
 
 class StrFieldValidator:
@@ -21,6 +24,24 @@ class StrFieldValidator:
         return str(value) if not isinstance(value, str) else value
 
 
+def with_range_index(payload: pd.DataFrame) -> pd.DataFrame:
+    """Returns a shallow copy of the payload indexed by row position."""
+    payload = payload.copy(deep=False)
+    if not payload.index.equals(pd.RangeIndex(len(payload))):
+        payload.index = pd.RangeIndex(len(payload))
+
+    return payload
+
+
+def _to_str(column: pd.Series) -> pd.Series:
+    """Coerces a column to strings, keeping the missing values (as pandera does)."""
+    column = column.astype(object)
+    if column.notna().all():
+        return column.astype(str)
+
+    return column.where(column.isna(), column.astype(str))
+
+
 class RequestManager:
     def __init__(self, inputs: typing.List[BaseNode]):
         self._model = None
@@ -63,19 +84,28 @@ class RequestManager:
 
         self._inputs = formated_inputs.values()
 
-        if len(self.inputs) > 0:
-            self._model = self.__create_model()
-            self._dataframe_model = self.__create_dataframe_model()
-        else:
-            self._model = None
-            self._dataframe_model = None
+        # Name and default of each column, read by validate for every payload
+        self._fields = [
+            (input_field.data.name, input_field.data.default)
+            for input_field in self._inputs
+        ]
+
+        # Both models are created on first use, validate needs neither of them
+        self._model = None
+        self._dataframe_model = None
 
     @property
-    def model(self) -> typing.Type[pydantic.BaseModel]:
+    def model(self) -> typing.Optional[typing.Type[pydantic.BaseModel]]:
+        if self._model is None and len(self._fields) > 0:
+            self._model = self.__create_model()
+
         return self._model
 
     @property
-    def dataframe_model(self) -> pandera.DataFrameSchema:
+    def dataframe_model(self) -> typing.Optional["pandera.DataFrameSchema"]:
+        if self._dataframe_model is None and len(self._fields) > 0:
+            self._dataframe_model = self.__create_dataframe_model()
+
         return self._dataframe_model
 
     def __create_model(
@@ -117,8 +147,10 @@ class RequestManager:
             ),
         )
 
-    def __create_dataframe_model(self) -> pandera.DataFrameSchema:
+    def __create_dataframe_model(self) -> "pandera.DataFrameSchema":
         """Create a pydantic model from the RequestManager's inputs"""
+        import pandera  # Imported on first use, it is slow to import
+
         fields = {}
         for input_field in self.inputs:
             fields[input_field.data.name] = pandera.Column(
@@ -141,19 +173,143 @@ class RequestManager:
     ) -> pd.DataFrame:
         """Validate the payload against the RequestManager's model
 
+        Same checks as dataframe_model, without going through pandera: every
+        input column must be present, missing values get the input default
+        or are rejected, and values are coerced to strings. The returned
+        DataFrame has a RangeIndex and the payload is not modified.
+
         Args:
             payload (pandas.DataFrame): The payload to validate
 
         Raises:
             ValueError: If the RequestManager has no model
+            pandera.errors.SchemaError: If a column is missing or has a null value without default
 
         Returns:
             pd.DataFrame: The validated payload
         """
-        if self.model is None:
+        if len(self._fields) == 0:
             raise ValueError("No inputs found")
 
         if not isinstance(payload, pd.DataFrame):
             raise TypeError(f"payload must be a pandas.DataFrame, not {type(payload)}")
 
-        return self.dataframe_model.validate(payload)
+        validated = with_range_index(payload)
+        for name, column in self.validate_columns(validated).items():
+            validated[name] = column
+
+        return validated
+
+    def validate_columns(
+        self, columns: typing.Mapping[str, pd.Series]
+    ) -> typing.Dict[str, pd.Series]:
+        """Validate the columns of a payload, without building a DataFrame
+
+        Args:
+            columns (typing.Mapping[str, pd.Series]): The payload columns by name, e.g. a DataFrame
+
+        Raises:
+            pandera.errors.SchemaError: If a column is missing or has a null value without default
+
+        Returns:
+            typing.Dict[str, pd.Series]: The validated input columns
+        """
+        validated = {}
+
+        # Defaults are filled before anything else is checked, as pandera does
+        for name, default in self._fields:
+            if default is not None and name in columns:
+                validated[name] = columns[name].fillna(default)
+
+        for name, _ in self._fields:
+            if name not in columns:
+                raise self.__missing_column_error(name, columns)
+
+        for name, default in self._fields:
+            column = _to_str(validated.get(name, columns[name]))
+
+            if default is None:
+                nulls = column.isna()
+                if nulls.any():
+                    raise self.__null_values_error(name, column, nulls, columns)
+
+            validated[name] = column
+
+        return validated
+
+    def validate_record(self, record: dict) -> dict:
+        """Validate a single record the same way validate does with a DataFrame
+
+        Args:
+            record (dict): The record to validate
+
+        Raises:
+            ValueError: If the RequestManager has no model
+            pandera.errors.SchemaError: If an input is missing or has a null value without default
+
+        Returns:
+            dict: The validated record, with every input as a string
+        """
+        if len(self._fields) == 0:
+            raise ValueError("No inputs found")
+
+        if not isinstance(record, dict):
+            raise TypeError(f"record must be a dict, not {type(record)}")
+
+        validated = dict(record)
+        for input_field in self.inputs:
+            name = input_field.data.name
+            if name not in record:
+                raise self.__missing_column_error(name, pd.DataFrame([record]))
+
+            value = record[name]
+            if scalars.is_missing(value):
+                if input_field.data.default is None:
+                    column = _to_str(pd.Series([value], name=name))
+                    raise self.__null_values_error(
+                        name, column, column.isna(), pd.DataFrame([record])
+                    )
+
+                validated[name] = input_field.data.default
+            else:
+                validated[name] = str(value)
+
+        return validated
+
+    def __missing_column_error(
+        self, name: str, columns: typing.Mapping[str, typing.Any]
+    ) -> Exception:
+        """Builds the SchemaError pandera raises for a missing input column"""
+        # Imported on failure only, pandera is slow to import
+        from pandera.errors import SchemaError, SchemaErrorReason
+
+        return SchemaError(
+            self.dataframe_model,
+            columns,
+            f"column '{name}' not in dataframe. Columns in dataframe: {list(columns)}",
+            failure_cases=name,
+            check="column_in_dataframe",
+            reason_code=SchemaErrorReason.COLUMN_NOT_IN_DATAFRAME,
+        )
+
+    def __null_values_error(
+        self,
+        name: str,
+        column: pd.Series,
+        nulls: pd.Series,
+        columns: typing.Mapping[str, typing.Any],
+    ) -> Exception:
+        """Builds the SchemaError pandera raises for nulls in a required input"""
+        from pandera.errors import SchemaError, SchemaErrorReason
+
+        return SchemaError(
+            self.dataframe_model.columns[name],
+            columns,
+            f"non-nullable series '{name}' contains null values:\n{column[nulls]}",
+            failure_cases=pd.DataFrame(
+                {"index": column.index[nulls], "failure_case": column[nulls].values}
+            ),
+            check="not_nullable",
+            reason_code=SchemaErrorReason.SERIES_CONTAINS_NULLS,
+            column_name=name,
+        )
@@ -1,8 +1,9 @@
+import functools
 import typing
 
 import pydantic
 
-from retrack import validators
+from retrack.engine.cache import RuleCache
 from retrack.engine.schemas import RuleMetadata
 from retrack.engine.executor import RuleExecutor
 from retrack.utils import graph
@@ -16,7 +17,10 @@ class Rule(RuleMetadata):
     connectors_as_inputs: bool
     components_registry: ComponentRegistry
     execution_order: typing.List[str]
+    inline_subrules: bool = False
+    merge_common_nodes: bool = False
     _executor: RuleExecutor = None
+    _source: typing.Optional[typing.Callable[[], RuleExecutor]] = None
 
     @property
     def executor(self) -> RuleExecutor:
@@ -26,6 +30,9 @@ class Rule(RuleMetadata):
                 self.execution_order,
                 self.as_metadata(),
                 connectors_as_inputs=self.connectors_as_inputs,
+                source=self._source,
+                inline_subrules=self.inline_subrules,
+                merge_common_nodes=self.merge_common_nodes,
             )
         return self._executor
 
@@ -38,18 +45,35 @@ class Rule(RuleMetadata):
         graph_data: dict,
         nodes_registry: Registry,
         dynamic_nodes_registry: Registry,
-        validator_registry: Registry = validators.registry(),
+        validator_registry: typing.Optional[Registry] = None,
         raise_if_null_version: bool = False,
         validate_version: bool = False,
         connectors_as_inputs: bool = True,
         name: str = None,
+        inline_subrules: bool = False,
+        merge_common_nodes: bool = False,
+        subrule_cache: typing.Optional[RuleCache] = None,
     ):
+        # Identical sub-rules are created once, within this rule or, given a
+        # cache, across every rule created with it
+        subrules = SubRuleFactory(
+            RuleCache() if subrule_cache is None else subrule_cache,
+            validator_registry,
+        )
+
+        if validator_registry is None:
+            # Imported here so that only creating a rule loads the validators
+            from retrack import validators
+
+            validator_registry = validators.registry()
+
         components_registry = Rule.create_component_registry(
             graph_data,
             nodes_registry,
             dynamic_nodes_registry,
             validator_registry,
             connectors_as_inputs=connectors_as_inputs,
+            rule_class=subrules,
         )
         version = graph.validate_version(
             graph_data, raise_if_null_version, validate_version, name
@@ -64,13 +88,31 @@ class Rule(RuleMetadata):
 
         execution_order = graph.get_execution_order(components_registry)
 
-        return cls(
+        rule = cls(
             version=version,
             components_registry=components_registry,
             execution_order=execution_order,
             name=name,
             connectors_as_inputs=connectors_as_inputs,
+            inline_subrules=inline_subrules,
+            merge_common_nodes=merge_common_nodes,
         )
+        # Lets worker processes build the same rule without pickling it
+        rule._source = functools.partial(
+            load_executor,
+            graph_data=graph_data,
+            nodes_registry=nodes_registry,
+            dynamic_nodes_registry=dynamic_nodes_registry,
+            validator_registry=validator_registry,
+            raise_if_null_version=raise_if_null_version,
+            validate_version=validate_version,
+            connectors_as_inputs=connectors_as_inputs,
+            name=name,
+            inline_subrules=inline_subrules,
+            merge_common_nodes=merge_common_nodes,
+        )
+
+        return rule
 
     @staticmethod
     def create_component_registry(
@@ -79,6 +121,7 @@ class Rule(RuleMetadata):
         dynamic_nodes_registry: Registry,
         validator_registry: Registry,
         connectors_as_inputs: bool,
+        rule_class: typing.Optional[typing.Any] = None,
     ) -> ComponentRegistry:
         components_registry = ComponentRegistry()
         graph_data = graph.validate_data(graph_data)
@@ -99,7 +142,7 @@ class Rule(RuleMetadata):
                     nodes_registry=nodes_registry,
                     dynamic_nodes_registry=dynamic_nodes_registry,
                     validator_registry=validator_registry,
-                    rule_class=Rule,
+                    rule_class=rule_class or Rule,
                     connectors_as_inputs=connectors_as_inputs,
                 )
             else:
@@ -110,9 +153,55 @@ class Rule(RuleMetadata):
 
             component = validation_model(**node_metadata)
 
-            components_registry.register(node_id, validation_model(**node_metadata))
+            components_registry.register(node_id, component)
 
             for input_node in component.generate_input_nodes():
                 components_registry.register(input_node.id, input_node, overwrite=True)
 
         return components_registry
+
+
+class SubRuleFactory:
+    def __init__(
+        self, cache: RuleCache, validator_registry: typing.Optional[Registry] = None
+    ):
+        """Creates the sub-rules of the flow nodes, in place of Rule.create.
+
+        Sub-rules with the same content and arguments are created once and
+        shared, along with their executor, by every flow node that embeds them.
+
+        Args:
+            cache (RuleCache): Cache of the created sub-rules.
+            validator_registry (Registry, optional): Validators registry given to the parent rule. Defaults to None, which uses validators.registry().
+        """
+        self._cache = cache
+        self._validator_registry = validator_registry
+
+    @property
+    def cache(self) -> RuleCache:
+        return self._cache
+
+    def create(self, graph_data: dict, **kwargs) -> Rule:
+        # Keyed by the validators given to the parent rule, so the default
+        # ones, created again for every rule, do not prevent sharing
+        kwargs["validator_registry"] = self._validator_registry
+
+        return self.cache.get_or_create(
+            RuleCache.key(RuleCache.content_hash(graph_data), **kwargs),
+            lambda: Rule.create(
+                graph_data=graph_data, subrule_cache=self.cache, **kwargs
+            ),
+            references=kwargs.values(),
+        )
+
+
+def load_executor(**create_kwargs) -> RuleExecutor:
+    """Creates a rule and returns its executor.
+
+    Args:
+        **create_kwargs: Arguments of Rule.create.
+
+    Returns:
+        RuleExecutor: The executor of the rule.
+    """
+    return Rule.create(**create_kwargs).executor
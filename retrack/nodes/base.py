@@ -91,15 +91,52 @@ class BaseNode(pydantic.BaseModel):
     async def run(self, **kwargs) -> typing.Dict[str, typing.Any]:
         return {}
 
+    async def run_one(self, **kwargs) -> typing.Dict[str, typing.Any]:
+        """Scalar kernel: same as run, but for a single record of plain values.
+
+        Nodes that override run without overriding run_one are executed by
+        wrapping their inputs in one element Series.
+        """
+        return {}
+
     def kind(self) -> NodeKind:
         return NodeKind.OTHER
 
     def memory_type(self) -> NodeMemoryType:
         return NodeMemoryType.STATE
 
+    def deterministic(self) -> bool:
+        """Whether run always returns the same outputs for the same inputs.
+
+        Only deterministic nodes may be merged with identical ones. Nodes are
+        not deterministic unless they say so, e.g. custom nodes reading the
+        time, random numbers or external data.
+        """
+        return False
+
+    def float_inputs(self) -> typing.List[str]:
+        """Inputs that run only reads through astype(float).
+
+        The executor may pass them converted already, from a conversion
+        shared by every node reading the same state.
+        """
+        return []
+
     def generate_input_nodes(self) -> typing.List["BaseNode"]:
         return []
 
+    def precomputed(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """What the node parses from its data before running, as JSON values.
+
+        Rule artifacts store it, so loaded nodes do not parse their data
+        again. None if the node parses nothing or its data can not be parsed,
+        run then raises the error.
+        """
+        return None
+
+    def restore_precomputed(self, values: typing.Dict[str, typing.Any]):
+        """Restores what precomputed returned, in place of parsing the data."""
+
     def alias(self) -> str:
         return getattr(getattr(self, "data", None), "alias", None) or getattr(
             getattr(self, "data", None), "name", None
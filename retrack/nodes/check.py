@@ -5,6 +5,7 @@ import pandas as pd
 import pydantic
 
 from retrack.nodes.base import BaseNode, InputConnectionModel, OutputConnectionModel
+from retrack.utils import scalars
 
 ###############################################################
 # Check Metadata Models
@@ -87,3 +88,44 @@ class Check(BaseNode):
             }
         else:
             raise ValueError("Unknown operator")
+
+    def float_inputs(self) -> typing.List[str]:
+        if self.data.operator in (CheckOperator.EQUAL, CheckOperator.NOT_EQUAL):
+            return []
+
+        return ["input_value_0", "input_value_1"]
+
+    async def run_one(
+        self,
+        input_value_0: typing.Any,
+        input_value_1: typing.Any,
+    ) -> typing.Dict[str, bool]:
+        if self.data.operator == CheckOperator.EQUAL:
+            return {"output_bool": str(input_value_0) == str(input_value_1)}
+        elif self.data.operator == CheckOperator.NOT_EQUAL:
+            return {"output_bool": str(input_value_0) != str(input_value_1)}
+        elif self.data.operator == CheckOperator.GREATER_THAN:
+            return {
+                "output_bool": scalars.to_float(input_value_0)
+                > scalars.to_float(input_value_1)
+            }
+        elif self.data.operator == CheckOperator.LESS_THAN:
+            return {
+                "output_bool": scalars.to_float(input_value_0)
+                < scalars.to_float(input_value_1)
+            }
+        elif self.data.operator == CheckOperator.GREATER_THAN_OR_EQUAL:
+            return {
+                "output_bool": scalars.to_float(input_value_0)
+                >= scalars.to_float(input_value_1)
+            }
+        elif self.data.operator == CheckOperator.LESS_THAN_OR_EQUAL:
+            return {
+                "output_bool": scalars.to_float(input_value_0)
+                <= scalars.to_float(input_value_1)
+            }
+        else:
+            raise ValueError("Unknown operator")
+
+    def deterministic(self) -> bool:
+        return True
@@ -15,3 +15,6 @@ class BaseConnector(Input):
 
     async def run(self, **kwargs):
         return {}
+
+    async def run_one(self, **kwargs):
+        return {}
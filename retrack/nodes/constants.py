@@ -1,3 +1,5 @@
+import bisect
+import functools
 import io
 import typing
 
@@ -12,6 +14,7 @@ from retrack.nodes.base import (
     NodeMemoryType,
     OutputConnectionModel,
 )
+from retrack.utils import scalars
 
 #######################################################
 # Constant Metadata Models
@@ -43,6 +46,92 @@ class BoolMetadataModel(pydantic.BaseModel):
         return False
 
 
+class IntervalBins(typing.NamedTuple):
+    starts: np.ndarray
+    ends: np.ndarray
+    categories: np.ndarray
+    # Values of the interval columns that are not numbers, parsed as NaN
+    invalid: typing.Tuple[str, ...]
+
+
+@functools.lru_cache(maxsize=256)
+def read_interval_table(
+    value: typing.Tuple[str, ...],
+    headers: typing.Tuple[str, ...],
+    separator: str,
+    start_interval_column: str,
+    end_interval_column: str,
+) -> pd.DataFrame:
+    """Reads the rows of the table of an IntervalCatV0 node, the interval columns as text.
+
+    Cached by content, so the validator and the node read a table only once.
+    The DataFrame is shared by every caller, it must not be modified.
+
+    Args:
+        value (typing.Tuple[str, ...]): Lines of the table, the first one being the header.
+        headers (typing.Tuple[str, ...]): Column names.
+        separator (str): Column separator.
+        start_interval_column (str): Column of the inclusive interval starts.
+        end_interval_column (str): Column of the exclusive interval ends.
+
+    Returns:
+        pd.DataFrame: The rows of the table.
+    """
+    return pd.read_csv(
+        io.StringIO("\n".join(value[1:])),
+        header=None,
+        names=list(headers),
+        sep=separator,
+        dtype={start_interval_column: str, end_interval_column: str},
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def parse_interval_bins(
+    value: typing.Tuple[str, ...],
+    headers: typing.Tuple[str, ...],
+    separator: str,
+    start_interval_column: str,
+    end_interval_column: str,
+    category_column: str,
+) -> IntervalBins:
+    """Parses the table of an IntervalCatV0 node into its intervals, sorted by start.
+
+    Values of the interval columns that are not numbers are parsed as NaN
+    and listed in invalid, for each of them to report.
+
+    Args:
+        value (typing.Tuple[str, ...]): Lines of the table, the first one being the header.
+        headers (typing.Tuple[str, ...]): Column names.
+        separator (str): Column separator.
+        start_interval_column (str): Column of the inclusive interval starts.
+        end_interval_column (str): Column of the exclusive interval ends.
+        category_column (str): Column of the categories.
+
+    Returns:
+        IntervalBins: Starts, ends and categories of the intervals.
+    """
+    df = read_interval_table(
+        value, headers, separator, start_interval_column, end_interval_column
+    )
+
+    invalid = []
+    bounds = []
+    for column in (start_interval_column, end_interval_column):
+        raw = df[column]
+        numbers = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=float)
+        invalid.extend(raw[np.isnan(numbers) & raw.notna().to_numpy()])
+        bounds.append(numbers)
+
+    starts, ends = bounds
+    categories = df[category_column].to_numpy(dtype=object)
+
+    # Intervals starting at the same value can only be empty ones, they go
+    # first so the last interval starting at or before a value is the right one
+    order = np.lexsort((ends, starts))
+    return IntervalBins(starts[order], ends[order], categories[order], tuple(invalid))
+
+
 class IntervalCatMetadataModel(pydantic.BaseModel):
     value: typing.List[str]
     start_interval_column: str
@@ -69,6 +158,39 @@ class IntervalCatMetadataModel(pydantic.BaseModel):
 
         return df
 
+    @functools.cached_property
+    def bins(self) -> IntervalBins:
+        """Starts, ends and categories of the intervals, sorted by start."""
+        bins = parse_interval_bins(
+            tuple(self.value),
+            tuple(self.headers),
+            self.separator,
+            self.start_interval_column,
+            self.end_interval_column,
+            self.category_column,
+        )
+
+        # Raises the error pandas raises for values that are not numbers
+        if bins.invalid:
+            raise ValueError(f"could not convert string to float: '{bins.invalid[0]}'")
+
+        intervals = pd.IntervalIndex.from_arrays(bins.starts, bins.ends, closed="left")
+        if intervals.is_overlapping:
+            raise pd.errors.InvalidIndexError(
+                f"Overlapping intervals in columns {self.start_interval_column} "
+                f"and {self.end_interval_column}, a value can not be looked up"
+            )
+
+        return bins
+
+    @functools.cached_property
+    def sorted_intervals(
+        self,
+    ) -> typing.Tuple[typing.List[float], typing.List[float], typing.List[typing.Any]]:
+        """Starts, ends and categories of the intervals, sorted by start, as lists."""
+        starts, ends, categories, _ = self.bins
+        return starts.tolist(), ends.tolist(), categories.tolist()
+
 
 #######################################################
 # Constant Inputs and Outputs
@@ -106,6 +228,9 @@ class BaseConstant(BaseNode):
     def kind(self) -> NodeKind:
         return NodeKind.CONSTANT
 
+    def deterministic(self) -> bool:
+        return True
+
 
 class Constant(BaseConstant):
     data: ConstantMetadataModel
@@ -114,6 +239,9 @@ class Constant(BaseConstant):
     async def run(self, **kwargs) -> typing.Dict[str, typing.Any]:
         return {"output_value": self.data.value}
 
+    async def run_one(self, **kwargs) -> typing.Dict[str, typing.Any]:
+        return {"output_value": self.data.value}
+
 
 class List(BaseConstant):
     data: ListMetadataModel
@@ -122,6 +250,9 @@ class List(BaseConstant):
     async def run(self, **kwargs) -> typing.Dict[str, typing.Any]:
         return {}  # {"output_list": self.data.value}
 
+    async def run_one(self, **kwargs) -> typing.Dict[str, typing.Any]:
+        return {}
+
     def memory_type(self) -> NodeMemoryType:
         return NodeMemoryType.CONSTANT
 
@@ -133,29 +264,51 @@ class Bool(BaseConstant):
     async def run(self, **kwargs) -> typing.Dict[str, typing.Any]:
         return {"output_bool": self.data.value}
 
+    async def run_one(self, **kwargs) -> typing.Dict[str, typing.Any]:
+        return {"output_bool": self.data.value}
+
 
 class IntervalCatV0(BaseConstant):
     data: IntervalCatMetadataModel
     inputs: ConstantInputsValueModel
     outputs: ConstantOutputsModel
 
+    def precomputed(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        try:
+            starts, ends, categories, _ = self.data.bins
+        except (KeyError, ValueError, pd.errors.InvalidIndexError):
+            return None
+
+        return {
+            "starts": starts.tolist(),
+            "ends": ends.tolist(),
+            "categories": categories.tolist(),
+        }
+
+    def restore_precomputed(self, values: typing.Dict[str, typing.Any]):
+        categories = np.empty(len(values["categories"]), dtype=object)
+        categories[:] = values["categories"]
+        self.data.__dict__["bins"] = IntervalBins(
+            np.array(values["starts"], dtype=float),
+            np.array(values["ends"], dtype=float),
+            categories,
+            (),
+        )
+
     async def run(self, input_value: pd.Series) -> typing.Dict[str, typing.Any]:
+        starts, ends, cats, _ = self.data.bins
         values = pd.to_numeric(input_value, errors="coerce").to_numpy()
 
-        df = self.data.df()
-        starts = pd.to_numeric(
-            df[self.data.start_interval_column], errors="coerce"
-        ).to_numpy()
-        ends = pd.to_numeric(
-            df[self.data.end_interval_column], errors="coerce"
-        ).to_numpy()
-        cats_s = df[self.data.category_column]
-        intervals = pd.IntervalIndex.from_arrays(starts, ends, closed="left")
-        idx = intervals.get_indexer(values)
-        cats = cats_s.to_numpy(dtype=object)
         out = np.full(values.shape, np.nan, dtype=object)
 
-        found_mask = idx != -1
+        if values.dtype.kind in "iuf" and len(starts) > 0:
+            # Last interval starting at or before each value, if it ends after it
+            idx = np.searchsorted(starts, values, side="right") - 1
+            found_mask = (idx >= 0) & (values < ends[np.maximum(idx, 0)])
+        else:  # Booleans are not looked up by pandas either
+            idx = np.full(values.shape, -1)
+            found_mask = np.zeros(values.shape, dtype=bool)
+
         if found_mask.any():
             mapped = cats[idx[found_mask]]
             out[found_mask] = mapped
@@ -173,3 +326,19 @@ class IntervalCatV0(BaseConstant):
         output = pd.Series(out, index=input_value.index, dtype="object")
 
         return {"output_value": output}
+
+    async def run_one(self, input_value: typing.Any) -> typing.Dict[str, typing.Any]:
+        starts, ends, cats = self.data.sorted_intervals
+        value = scalars.to_numeric(input_value)
+
+        output = scalars.NAN
+        position = bisect.bisect_right(starts, value) - 1
+        if position >= 0 and value < ends[position]:
+            output = cats[position]
+            if output == "{value}":
+                output = input_value
+
+        if self.data.default is not None and scalars.is_missing(output):
+            output = self.data.default
+
+        return {"output_value": output}
@@ -1,12 +1,145 @@
 import datetime as dt
+import functools
 import typing
+import warnings
 from dateutil.tz import gettz
 
+import numpy as np
 import pandas as pd
 import pydantic
+from pandas.api.types import infer_dtype
+from pandas.tseries.api import guess_datetime_format
 
 from retrack.nodes.base import BaseNode, InputConnectionModel, OutputConnectionModel
 
+
+def localize(value: typing.Any, timezone: typing.Any) -> pd.Timestamp:
+    """Parses a date into a timestamp of the timezone, naive dates being local to it."""
+    timestamp = pd.to_datetime(value)
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize(
+            timezone, ambiguous="NaT", nonexistent="shift_forward"
+        )
+    return timestamp.tz_convert(timezone)
+
+
+class TimestampParser:
+    def __init__(self, timezone: typing.Optional[str]):
+        """Parses columns of dates into timestamps of a timezone, as localize does.
+
+        Columns of strings are parsed once per distinct value, as a whole
+        when they are in an ISO format, inferred from their first value.
+        Other formats are parsed value by value, since pandas may infer
+        another format for each of them, e.g. for days and months that can
+        be swapped. The timestamps are localized and converted at once.
+
+        The parser keeps no state between calls, so it is shared by the
+        concurrent executions of a node.
+
+        Args:
+            timezone (typing.Optional[str]): Name of the timezone.
+        """
+        self.tzinfo = gettz(timezone)
+
+    def parse(
+        self, values: pd.Series
+    ) -> typing.Optional[typing.Tuple[np.ndarray, pd.DatetimeIndex]]:
+        """Parses the values that are not missing.
+
+        Args:
+            values (pd.Series): The dates.
+
+        Returns:
+            typing.Optional[typing.Tuple[np.ndarray, pd.DatetimeIndex]]: The code of each value in the timestamps, -1 where it is missing, and the timestamps. None if some value can not be parsed, localize raises the error then.
+        """
+        try:
+            if infer_dtype(values, skipna=True) == "string":
+                codes, strings = pd.factorize(values)
+                timestamps = self._parse_strings(strings.to_numpy(dtype=object))
+            else:
+                missing = values.isna().to_numpy()
+                codes = np.full(len(values), -1)
+                codes[~missing] = np.arange(len(values) - missing.sum())
+                timestamps = [pd.to_datetime(value) for value in values[~missing]]
+
+            return codes, self._localize(timestamps)
+        except (
+            ValueError,
+            TypeError,
+            OverflowError,
+            pd.errors.OutOfBoundsDatetime,
+            pd.errors.ParserError,
+        ):
+            return None
+
+    @staticmethod
+    def _parse_strings(strings: np.ndarray) -> typing.Any:
+        if not len(strings):
+            return []
+
+        timestamps = TimestampParser._parse_iso(
+            strings, TimestampParser._guess_format(strings[0])
+        )
+        if timestamps is not None:
+            return timestamps
+
+        return [pd.to_datetime(string) for string in strings]
+
+    @staticmethod
+    def _guess_format(string: str) -> str:
+        # Warns about formats with the day first, which are not ISO ones
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return guess_datetime_format(string) or ""
+
+    @staticmethod
+    def _parse_iso(
+        strings: np.ndarray, format: str
+    ) -> typing.Optional[pd.DatetimeIndex]:
+        # Dates in ISO format are parsed alike as a whole or one by one
+        if not format.startswith("%Y-%m-%d"):
+            return None
+
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                timestamps = pd.to_datetime(strings, format=format)
+        except (ValueError, TypeError, OverflowError):
+            return None
+
+        return timestamps if isinstance(timestamps, pd.DatetimeIndex) else None
+
+    def _localize(self, timestamps: typing.Any) -> pd.DatetimeIndex:
+        if isinstance(timestamps, pd.DatetimeIndex):
+            if timestamps.tz is None:
+                return timestamps.tz_localize(
+                    self.tzinfo, ambiguous="NaT", nonexistent="shift_forward"
+                )
+            return timestamps.tz_convert(self.tzinfo)
+
+        naive = np.array([timestamp.tzinfo is None for timestamp in timestamps])
+        nanoseconds = np.empty(len(timestamps), dtype=np.int64)
+        if naive.any():
+            nanoseconds[naive] = (
+                pd.DatetimeIndex([t for t, n in zip(timestamps, naive) if n])
+                .tz_localize(self.tzinfo, ambiguous="NaT", nonexistent="shift_forward")
+                .as_unit("ns")
+                .asi8
+            )
+        if not naive.all():
+            nanoseconds[~naive] = (
+                pd.to_datetime(
+                    [t for t, n in zip(timestamps, naive) if not n], utc=True
+                )
+                .as_unit("ns")
+                .asi8
+            )
+
+        return pd.DatetimeIndex(nanoseconds.view("M8[ns]"), tz="UTC").tz_convert(
+            self.tzinfo
+        )
+
+
 ###############################################################
 # CurrentYear Inputs and Outputs
 ###############################################################
@@ -53,6 +186,10 @@ class DifferenceBetweenDatesInputsModel(pydantic.BaseModel):
 class DifferenceBetweenDatesMetadataModel(pydantic.BaseModel):
     timezone: typing.Optional[str] = "America/Sao_Paulo"
 
+    @functools.cached_property
+    def parser(self) -> TimestampParser:
+        return TimestampParser(self.timezone)
+
 
 ###############################################################
 # DifferenceBetweenDates Node
@@ -69,22 +206,8 @@ class DifferenceBetweenDates(BaseNode):
         input_value_0: pd.Series,
         input_value_1: pd.Series,
     ) -> typing.Dict[str, pd.Series]:
-        timezone = gettz(self.data.timezone)
-
-        def replace_invalid(value):
-            if pd.isna(value):
-                return pd.Timestamp.now(tz=timezone)
-            timestamp = pd.to_datetime(value)
-            if timestamp.tzinfo is None:
-                return (
-                    timestamp.tz_localize(
-                        timezone, ambiguous="NaT", nonexistent="shift_forward"
-                    )
-                )
-            return timestamp.tz_convert(timezone)
-
-        timestamp_0 = input_value_0.apply(replace_invalid)
-        timestamp_1 = input_value_1.apply(replace_invalid)
+        timestamp_0 = self._timestamps(input_value_0)
+        timestamp_1 = self._timestamps(input_value_1)
 
         differences = timestamp_1.sub(timestamp_0)
 
@@ -95,6 +218,34 @@ class DifferenceBetweenDates(BaseNode):
 
         return {"output_value": days}
 
+    def _timestamps(self, values: pd.Series) -> pd.Series:
+        """Localized timestamps of the values, missing ones being now."""
+        parser = self.data.parser
+
+        parsed = parser.parse(values)
+        if parsed is None:
+            return values.apply(
+                lambda value: (
+                    pd.Timestamp.now(tz=parser.tzinfo)
+                    if pd.isna(value)
+                    else localize(value, parser.tzinfo)
+                )
+            )
+
+        codes, timestamps = parsed
+        missing = codes < 0
+        if missing.any():
+            now = pd.Timestamp.now(tz=parser.tzinfo)
+            codes = np.where(missing, len(timestamps), codes)
+            timestamps = timestamps.append(pd.DatetimeIndex([now]))
+
+        timestamps = timestamps.take(codes)
+        if len(timestamps) and timestamps.isna().all():
+            # As apply infers it from the values, a column of NaT has no timezone
+            timestamps = timestamps.tz_localize(None)
+
+        return pd.Series(timestamps, index=values.index)
+
 
 ###############################################################
 # Now Inputs and Outputs
@@ -149,6 +300,10 @@ class ToISOFormatMetadataModel(pydantic.BaseModel):
     format: typing.Optional[str] = "%Y-%m-%d"
     timezone: typing.Optional[str] = "America/Sao_Paulo"
 
+    @functools.cached_property
+    def parser(self) -> TimestampParser:
+        return TimestampParser(self.timezone)
+
 
 ###############################################################
 # ToISOFormat Node
@@ -166,18 +321,30 @@ class ToISOFormat(BaseNode):
     ) -> typing.Dict[str, pd.Series]:
         format = self.data.format or "%Y-%m-%d"
         format = format.replace("YYYY", "%Y").replace("MM", "%m").replace("DD", "%d")
-        timezone = gettz(self.data.timezone)
+        parser = self.data.parser
 
         def convert_to_iso(value):
-            timestamp = pd.to_datetime(value)
-            if timestamp.tzinfo is None:
-                return (
-                    timestamp.tz_localize(
-                        timezone, ambiguous="NaT", nonexistent="shift_forward"
-                    )
-                    .isoformat()
-                )
-            return timestamp.tz_convert(timezone).isoformat()
+            return localize(value, parser.tzinfo).isoformat()
+
+        parsed = parser.parse(input_value)
+        if parsed is None:
+            return {"output_value": input_value.apply(convert_to_iso)}
+
+        codes, timestamps = parsed
+        iso_formats = np.array(
+            [timestamp.isoformat() for timestamp in timestamps], dtype=object
+        )
+        output_series = pd.Series(
+            iso_formats.take(np.maximum(codes, 0)) if len(iso_formats) else None,
+            index=input_value.index,
+            dtype=object,
+        )
+
+        missing = codes < 0
+        if missing.any():
+            output_series[missing] = input_value[missing].apply(convert_to_iso)
 
-        output_series = input_value.apply(convert_to_iso)
         return {"output_value": output_series}
+
+    def deterministic(self) -> bool:
+        return True
@@ -6,6 +6,10 @@ from retrack.nodes.base import BaseNode
 
 
 class BaseDynamicIOModel(pydantic.BaseModel):
+    # The schemas of the dynamic models are built on their first validation,
+    # the nodes loaded from rule artifacts are constructed without one
+    model_config = pydantic.ConfigDict(defer_build=True)
+
     @classmethod
     def with_fields(cls, class_name: str, **field_definitions):
         return pydantic.create_model(
@@ -14,9 +18,13 @@ class BaseDynamicIOModel(pydantic.BaseModel):
 
 
 class BaseDynamicNode(BaseNode):
+    model_config = pydantic.ConfigDict(defer_build=True)
+
     @classmethod
     def with_fields(cls, class_name: str, **field_definitions):
-        return pydantic.create_model(class_name, __base__=BaseNode, **field_definitions)
+        return pydantic.create_model(
+            class_name, __base__=BaseDynamicNode, **field_definitions
+        )
 
     @staticmethod
     def create_sub_field(
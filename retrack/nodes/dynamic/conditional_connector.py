@@ -47,4 +47,7 @@ def conditional_connector_factory(
         async def run(self, **kwargs):
             return {}
 
+        async def run_one(self, **kwargs):
+            return {}
+
     return ConditionalConnector
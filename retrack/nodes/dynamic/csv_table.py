@@ -1,10 +1,13 @@
+import functools
 import typing
 
+import numpy as np
 import pandas as pd
 import pydantic
 
 from retrack.nodes.base import InputConnectionModel, OutputConnectionModel
 from retrack.nodes.dynamic.base import BaseDynamicIOModel, BaseDynamicNode
+from retrack.utils import scalars
 
 
 class CSVTableV0MetadataModel(pydantic.BaseModel):
@@ -20,6 +23,42 @@ class CSVTableV0MetadataModel(pydantic.BaseModel):
         rows = [values.split(self.separator) for values in self.value[1:]]
         return pd.DataFrame(rows, columns=self.headers_map)
 
+    @property
+    def input_columns(self) -> typing.List[str]:
+        return [name for name in self.headers_map if name != self.target]
+
+    @functools.cached_property
+    def lookup(self) -> typing.Dict[tuple, typing.List[typing.Any]]:
+        """Targets of the table keyed by the tuple of their input values."""
+        csv_df = self.df()
+        lookup = {}
+        for key, target in zip(
+            csv_df[self.input_columns].itertuples(index=False, name=None),
+            csv_df[self.target],
+        ):
+            lookup.setdefault(key, []).append(target)
+
+        return lookup
+
+    @functools.cached_property
+    def index(self) -> typing.Tuple[pd.Index, np.ndarray, np.ndarray]:
+        """Hash index of the distinct keys of the table.
+
+        Returns:
+            typing.Tuple[pd.Index, np.ndarray, np.ndarray]: The keys, the target of the first row of each key and the number of rows of each key.
+        """
+        keys = list(self.lookup.keys())
+        if len(self.input_columns) == 1 or len(keys) == 0:
+            index = pd.Index([key[0] for key in keys], dtype=object)
+        else:
+            index = pd.MultiIndex.from_tuples(keys)
+
+        targets = np.empty(len(keys), dtype=object)
+        targets[:] = [matches[0] for matches in self.lookup.values()]
+        counts = np.array([len(matches) for matches in self.lookup.values()])
+
+        return index, targets, counts
+
 
 class CSVTableV0OutputsModel(pydantic.BaseModel):
     output_value: OutputConnectionModel
@@ -47,36 +86,84 @@ def csv_table_factory(
 
     class CSVTableV0(BaseCSVTableV0Model):
         async def run(self, **kwargs) -> typing.Dict[str, typing.Any]:
-            csv_df = self.data.df()
+            input_columns = self.data.input_columns
 
-            response_df = {}
+            for name in input_columns:
+                if name not in kwargs.keys():
+                    raise ValueError(f"Missing input {name} in CSVTableV0 node")
 
-            input_columns = [
-                name for name in self.data.headers_map if name != self.data.target
+            index = kwargs[input_columns[0]].index
+            keys = [
+                (
+                    kwargs[name]
+                    if isinstance(kwargs[name], pd.Series)
+                    else pd.Series(kwargs[name], index=index)
+                )
+                .astype(str)
+                .to_numpy()
+                for name in input_columns
             ]
 
-            for name in input_columns:
-                if name == self.data.target:
-                    continue
+            table_keys, targets, counts = self.data.index
+            if len(keys) == 1 or len(table_keys) == 0:
+                keys = pd.Index(keys[0], dtype=object)
+            else:
+                keys = pd.MultiIndex.from_arrays(keys)
 
-                if name not in kwargs.keys():
-                    raise ValueError(f"Missing input {name} in CSVTableV0 node")
+            positions = table_keys.get_indexer(keys)
+            found = positions >= 0
 
-                response_df[name] = kwargs[name]
+            rows = len(positions) + int(counts[positions[found]].sum() - found.sum())
+            if rows != len(positions):  # Keys repeated in the table match many rows
+                raise ValueError(
+                    f"Length mismatch: Expected {rows} rows, "
+                    f"received array of length {len(positions)}"
+                )
 
-            response_df = pd.DataFrame(response_df)
-            response_df = response_df.astype(str)
-            response_df = response_df.merge(csv_df, how="left", on=input_columns)
+            values = np.full(len(positions), scalars.NAN, dtype=object)
+            values[found] = targets[positions[found]]
 
+            output = pd.Series(values, index=index, name=self.data.target)
             if self.data.default:
-                response_df[self.data.target] = response_df[self.data.target].fillna(
-                    self.data.default
+                output = output.fillna(self.data.default)
+
+            return {"output_value": output}
+
+        async def run_one(self, **kwargs) -> typing.Dict[str, typing.Any]:
+            key = []
+            for name in self.data.input_columns:
+                if name not in kwargs.keys():
+                    raise ValueError(f"Missing input {name} in CSVTableV0 node")
+
+                key.append(str(kwargs[name]))
+
+            matches = self.data.lookup.get(tuple(key), [scalars.NAN])
+            if len(matches) > 1:  # The merge of the vectorized path gets extra rows
+                raise ValueError(
+                    f"Length mismatch: Expected axis has {len(matches)} elements, "
+                    "new values have 1 elements"
                 )
 
-            response_df.set_index(
-                kwargs[input_columns[0]].index, inplace=True, drop=True
-            )
+            output = matches[0]
+            if self.data.default and scalars.is_missing(output):
+                output = self.data.default
+
+            return {"output_value": output}
+
+        def precomputed(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+            try:
+                lookup = self.data.lookup
+            except (KeyError, ValueError):
+                return None
+
+            return {"lookup": [[list(key), targets] for key, targets in lookup.items()]}
+
+        def restore_precomputed(self, values: typing.Dict[str, typing.Any]):
+            self.data.__dict__["lookup"] = {
+                tuple(key): targets for key, targets in values["lookup"]
+            }
 
-            return {"output_value": response_df[self.data.target]}
+        def deterministic(self) -> bool:
+            return True
 
     return CSVTableV0
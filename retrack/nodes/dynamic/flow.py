@@ -1,6 +1,8 @@
+import functools
 import json
 import typing
 
+import numpy as np
 import pandas as pd
 import pydantic
 
@@ -22,6 +24,27 @@ class FlowV0OutputsModel(pydantic.BaseModel):
     output_value: OutputConnectionModel
 
 
+@functools.lru_cache(maxsize=256)
+def _base_flow_model(
+    input_names: typing.Tuple[str, ...],
+) -> typing.Type[BaseDynamicNode]:
+    """Fields of the FlowV0 nodes with these inputs, shared by their classes."""
+    input_fields = {}
+
+    for name in input_names:
+        input_fields[name] = BaseDynamicNode.create_sub_field(InputConnectionModel)
+
+    inputs_model = BaseDynamicIOModel.with_fields("FlowV0InputsModel", **input_fields)
+
+    models = {
+        "inputs": BaseDynamicNode.create_sub_field(inputs_model),
+        "outputs": BaseDynamicNode.create_sub_field(FlowV0OutputsModel),
+        "data": BaseDynamicNode.create_sub_field(FlowV0MetadataModel),
+    }
+
+    return BaseDynamicNode.with_fields("FlowV0", **models)
+
+
 def flow_factory(
     inputs: typing.Dict[str, typing.Any],
     nodes_registry: Registry,
@@ -41,22 +64,8 @@ def flow_factory(
         name=data.get("name"),
         connectors_as_inputs=connectors_as_inputs,
     )
-    input_fields = {}
-
-    for name in inputs.keys():
-        input_fields[name] = BaseDynamicNode.create_sub_field(InputConnectionModel)
-
-    inputs_model = BaseDynamicIOModel.with_fields("FlowV0InputsModel", **input_fields)
-
-    models = {
-        "inputs": BaseDynamicNode.create_sub_field(inputs_model),
-        "outputs": BaseDynamicNode.create_sub_field(FlowV0OutputsModel),
-        "data": BaseDynamicNode.create_sub_field(FlowV0MetadataModel),
-    }
-
-    BaseFlowV0Model = BaseDynamicNode.with_fields("FlowV0", **models)
 
-    class FlowV0(BaseFlowV0Model):
+    class FlowV0(_base_flow_model(tuple(inputs.keys()))):
         async def run(self, **kwargs) -> typing.Dict[str, typing.Any]:
             input_args = {}
             executor_kwargs = {}
@@ -75,6 +84,29 @@ def flow_factory(
 
             return {"output_value": response["output"].values}
 
+        async def run_one(self, **kwargs) -> typing.Dict[str, typing.Any]:
+            record = {}
+            executor_kwargs = {}
+            for name, value in kwargs.items():
+                if name == "context":
+                    executor_kwargs["context"] = value
+                    continue
+
+                if name.startswith("input_"):
+                    name = name[len("input_") :]
+
+                record[name] = value
+
+            response = await rule_instance.executor.execute_one(
+                record, **executor_kwargs
+            )
+
+            output = response["output"]
+            return {"output_value": np.nan if output is None else output}
+
+        def sub_rule_executor(self):
+            return rule_instance.executor
+
         def generate_input_nodes(self):
             input_nodes = []
             for component in rule_instance.components_registry.memory.values():
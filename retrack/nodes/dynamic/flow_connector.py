@@ -45,4 +45,7 @@ def flow_connector_factory(
         async def run(self, **kwargs):
             return {}
 
+        async def run_one(self, **kwargs):
+            return {}
+
     return FlowConnector
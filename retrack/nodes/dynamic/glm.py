@@ -1,3 +1,4 @@
+import functools
 import json
 import typing
 
@@ -7,6 +8,7 @@ import pydantic
 
 from retrack.nodes.base import InputConnectionModel, OutputConnectionModel
 from retrack.nodes.dynamic.base import BaseDynamicIOModel, BaseDynamicNode
+from retrack.utils import scalars
 
 
 LINK_FUNCS = {
@@ -32,6 +34,59 @@ class GLMMetadataModel(pydantic.BaseModel):
         parsed = self.parsed_value()
         return float(parsed.get("intercept", 0.0))
 
+    @functools.cached_property
+    def parsed_weights(self) -> typing.Tuple[typing.Dict[str, typing.Any], float]:
+        """Weights and intercept, parsed once."""
+        return self.parsed_value(), self.intercept()
+
+    @functools.cached_property
+    def coefficients(self) -> typing.Tuple[np.ndarray, float]:
+        """Weights aligned with headers_map, as a vector, and intercept."""
+        weights, intercept = self.parsed_weights
+        vector = np.array(
+            [float(weights[feature_name]) for feature_name in self.headers_map],
+            dtype=float,
+        )
+        return vector, intercept
+
+    @property
+    def input_names(self) -> typing.List[str]:
+        return [f"input_value_{index}" for index in self.headers_map.values()]
+
+
+def score(
+    models: typing.Sequence[GLMMetadataModel],
+    inputs: typing.Sequence[typing.Any],
+) -> typing.List[np.ndarray]:
+    """Scores GLMs that share their inputs.
+
+    The inputs are stacked into a 2-D float array and multiplied by the
+    matrix of weights, one feature at a time, so every model gets exactly
+    the score it gets on its own, whatever the number of rows or models.
+
+    Args:
+        models (typing.Sequence[GLMMetadataModel]): Models whose weights are aligned with the inputs.
+        inputs (typing.Sequence[typing.Any]): Values of each feature, as Series.
+
+    Returns:
+        typing.List[np.ndarray]: The response of each model.
+    """
+    features = np.empty((len(inputs[0]), len(inputs)), dtype=float, order="F")
+    for column, values in enumerate(inputs):
+        features[:, column] = values.astype(float)
+
+    weights = np.column_stack([model.coefficients[0] for model in models])
+    intercepts = np.array([model.coefficients[1] for model in models], dtype=float)
+
+    dot = np.zeros((features.shape[0], len(models)), dtype=float)
+    for column in range(features.shape[1]):
+        dot += features[:, column, None] * weights[column]
+
+    eta = intercepts + dot
+    return [
+        LINK_FUNCS[model.link](eta[:, column]) for column, model in enumerate(models)
+    ]
+
 
 class GLMOutputsModel(pydantic.BaseModel):
     output_value: OutputConnectionModel
@@ -58,29 +113,100 @@ def glm_factory(
 
     class GLM(BaseGLMModel):
         async def run(self, **kwargs) -> typing.Dict[str, typing.Any]:
-            weights = self.data.parsed_value()
-
-            intercept = self.data.intercept()
+            weights, _ = self.data.parsed_weights
 
             _example_input: pd.Series = kwargs.get("input_value_0")
-            dot = pd.Series(
-                np.zeros(len(_example_input)), dtype=float, index=_example_input.index
+            index = _example_input.index
+
+            for feature_name, field_name in zip(
+                self.data.headers_map, self.data.input_names
+            ):
+                if field_name not in kwargs:
+                    raise ValueError(f"Missing input {field_name} in GLM node")
+
+                if feature_name not in weights:
+                    raise ValueError(
+                        f"Missing weight for feature {feature_name} in GLM node"
+                    )
+
+            inputs = [kwargs[name] for name in self.data.input_names]
+            if inputs:
+                (response,) = score([self.data], inputs)
+            else:
+                response = LINK_FUNCS[self.data.link](
+                    self.data.coefficients[1] + np.zeros(len(index))
+                )
+
+            return {"output_value": pd.Series(response, index=index)}
+
+        def float_inputs(self) -> typing.List[str]:
+            return self.data.input_names
+
+        def precomputed(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+            try:
+                weights, intercept = self.data.coefficients
+            except (AttributeError, KeyError, TypeError, ValueError):
+                return None
+
+            return {"weights": weights.tolist(), "intercept": intercept}
+
+        def restore_precomputed(self, values: typing.Dict[str, typing.Any]):
+            self.data.__dict__["coefficients"] = (
+                np.array(values["weights"], dtype=float),
+                values["intercept"],
             )
 
+        def batch_inputs(self) -> typing.Optional[typing.List[str]]:
+            """Inputs scored by the node, in the order of its weights.
+
+            None when the node can not be scored with others, its own run
+            then raises the error.
+            """
+            try:
+                weights, _ = self.data.coefficients
+            except (AttributeError, KeyError, TypeError, ValueError):
+                # Weights missing or not numbers, run raises the error
+                return None
+
+            if len(weights) == 0 or self.data.link not in LINK_FUNCS:
+                return None
+
+            return self.data.input_names
+
+        @staticmethod
+        def run_batch(
+            nodes: typing.List["GLM"], inputs: typing.List[pd.Series]
+        ) -> typing.List[typing.Dict[str, typing.Any]]:
+            """Runs GLM nodes whose batch inputs hold the same values at once."""
+            index = inputs[0].index
+            return [
+                {"output_value": pd.Series(response, index=index)}
+                for response in score([node.data for node in nodes], inputs)
+            ]
+
+        async def run_one(self, **kwargs) -> typing.Dict[str, typing.Any]:
+            weights, intercept = self.data.parsed_weights
+
+            dot = 0.0
             for feature_name, index in self.data.headers_map.items():
                 field_name = f"input_value_{index}"
                 if field_name not in kwargs:
                     raise ValueError(f"Missing input {field_name} in GLM node")
-
                 if feature_name not in weights:
                     raise ValueError(
                         f"Missing weight for feature {feature_name} in GLM node"
                     )
 
-                dot += kwargs[field_name].astype(float) * float(weights[feature_name])
+                dot += scalars.to_float(kwargs[field_name]) * float(
+                    weights[feature_name]
+                )
 
-            response = LINK_FUNCS[self.data.link](intercept + dot.astype(float))
+            # numpy scalars return inf or nan where Python floats would raise
+            response = LINK_FUNCS[self.data.link](np.float64(intercept + dot))
 
             return {"output_value": response}
 
+        def deterministic(self) -> bool:
+            return True
+
     return GLM
@@ -1,7 +1,11 @@
+import typing
+
+import numpy as np
 import pandas as pd
 import pydantic
 
 from retrack.nodes.base import BaseNode, InputConnectionModel, OutputConnectionModel
+from retrack.utils import scalars
 
 ################################################
 # EndsWith Inputs Outputs
@@ -29,8 +33,53 @@ class EndsWith(BaseNode):
     async def run(
         self, input_value_0: pd.Series, input_value_1: pd.Series
     ) -> pd.Series:
-        return {
-            "output_bool": input_value_0.str.endswith(
-                input_value_1.to_string(index=False)
+        if not isinstance(input_value_0, pd.Series):
+            if not isinstance(input_value_1, pd.Series):
+                return await self.run_one(input_value_0, input_value_1)
+
+            input_value_0 = pd.Series(
+                input_value_0, index=input_value_1.index, dtype=object
             )
-        }
+
+        strings = input_value_0.str
+
+        if not isinstance(input_value_1, pd.Series):
+            return {"output_bool": strings.endswith(scalars.to_text(input_value_1))}
+
+        if _is_single_string(input_value_1):
+            suffix = input_value_1.iloc[0]
+            return {"output_bool": strings.endswith(scalars.to_text(suffix))}
+
+        # Each row is checked against its own suffix, the rows without a
+        # string get the missing value of the .str accessor
+        output = strings.endswith("").to_numpy(copy=True)
+        values = input_value_0.to_numpy()
+        texts = input_value_1.to_numpy()
+
+        is_text = np.array([isinstance(value, str) for value in values], dtype=bool)
+        output[is_text] = [
+            value.endswith(scalars.to_text(text))
+            for value, text in zip(values[is_text], texts[is_text])
+        ]
+
+        return {"output_bool": pd.Series(output, index=input_value_0.index)}
+
+    async def run_one(
+        self, input_value_0: typing.Any, input_value_1: typing.Any
+    ) -> typing.Dict[str, typing.Any]:
+        if not isinstance(input_value_0, str):
+            scalars.check_str_accessor(input_value_0)
+            return {"output_bool": scalars.NAN}
+
+        return {"output_bool": input_value_0.endswith(scalars.to_text(input_value_1))}
+
+    def deterministic(self) -> bool:
+        return True
+
+
+def _is_single_string(values: pd.Series) -> bool:
+    """Whether every row holds the same string, which is then checked once."""
+    if len(values) == 0 or not isinstance(values.iloc[0], str):
+        return False
+
+    return bool((values.to_numpy() == values.iloc[0]).all())
@@ -1,10 +1,21 @@
+import operator
 import typing
 
 import pandas as pd
 import pydantic
+from pandas.api.types import infer_dtype
 
 from retrack.nodes.base import BaseNode, InputConnectionModel, OutputConnectionModel
 
+_STR_DTYPES = (
+    "string",
+    "integer",
+    "floating",
+    "mixed-integer-float",
+    "boolean",
+    "empty",
+)
+
 
 class GetCharOutputsModel(pydantic.BaseModel):
     output_value: OutputConnectionModel
@@ -27,6 +38,26 @@ class GetChar(BaseNode):
         self,
         input_value: pd.Series,
     ) -> typing.Dict[str, pd.Series]:
-        return {
-            "output_value": input_value.apply(lambda x: str(x)[self.data.index - 1])
-        }
+        if not isinstance(input_value, pd.Series):
+            return await self.run_one(input_value)
+
+        position = self.data.index - 1
+
+        # astype(str) is the same as str for these values, raising IndexError as well
+        if infer_dtype(input_value, skipna=True) in _STR_DTYPES:
+            return {
+                "output_value": input_value.astype(str).map(
+                    operator.itemgetter(position)
+                )
+            }
+
+        return {"output_value": input_value.apply(lambda x: str(x)[position])}
+
+    async def run_one(
+        self,
+        input_value: typing.Any,
+    ) -> typing.Dict[str, str]:
+        return {"output_value": str(input_value)[self.data.index - 1]}
+
+    def deterministic(self) -> bool:
+        return True
@@ -1,7 +1,10 @@
+import typing
+
 import pandas as pd
 import pydantic
 
 from retrack.nodes.base import BaseNode, InputConnectionModel, OutputConnectionModel
+from retrack.utils import scalars
 
 ################################################
 # And Or Inputs and Outputs
@@ -42,6 +45,17 @@ class And(BaseNode):
     async def run(self, input_bool_0: pd.Series, input_bool_1: pd.Series) -> pd.Series:
         return {"output_bool": input_bool_0 & input_bool_1}
 
+    async def run_one(
+        self, input_bool_0: typing.Any, input_bool_1: typing.Any
+    ) -> typing.Dict[str, bool]:
+        return {
+            "output_bool": scalars.to_bool(input_bool_0)
+            and scalars.to_bool(input_bool_1)
+        }
+
+    def deterministic(self) -> bool:
+        return True
+
 
 class Or(BaseNode):
     inputs: AndOrInputsModel
@@ -50,6 +64,17 @@ class Or(BaseNode):
     async def run(self, input_bool_0: pd.Series, input_bool_1: pd.Series) -> pd.Series:
         return {"output_bool": input_bool_0 | input_bool_1}
 
+    async def run_one(
+        self, input_bool_0: typing.Any, input_bool_1: typing.Any
+    ) -> typing.Dict[str, bool]:
+        return {
+            "output_bool": scalars.to_bool(input_bool_0)
+            or scalars.to_bool(input_bool_1)
+        }
+
+    def deterministic(self) -> bool:
+        return True
+
 
 ################################################
 # Not Nodes
@@ -62,3 +87,9 @@ class Not(BaseNode):
 
     async def run(self, input_bool: pd.Series) -> pd.Series:
         return {"output_bool": ~input_bool}
+
+    async def run_one(self, input_bool: typing.Any) -> typing.Dict[str, bool]:
+        return {"output_bool": not scalars.to_bool(input_bool)}
+
+    def deterministic(self) -> bool:
+        return True
@@ -23,3 +23,12 @@ class LowerCase(BaseNode):
         input_value: pd.Series,
     ) -> typing.Dict[str, pd.Series]:
         return {"output_value": input_value.astype(str).str.lower()}
+
+    async def run_one(
+        self,
+        input_value: typing.Any,
+    ) -> typing.Dict[str, str]:
+        return {"output_value": str(input_value).lower()}
+
+    def deterministic(self) -> bool:
+        return True
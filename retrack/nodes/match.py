@@ -43,5 +43,11 @@ class If(BaseNode):
             "output_else_filter": ~input_bool.astype(bool),
         }
 
+    async def run_one(self, input_bool: typing.Any) -> typing.Dict[str, bool]:
+        return {
+            "output_then_filter": bool(input_bool),
+            "output_else_filter": not bool(input_bool),
+        }
+
     def memory_type(self) -> NodeMemoryType:
         return NodeMemoryType.FILTER
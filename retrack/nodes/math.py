@@ -1,10 +1,13 @@
 import enum
+import math
 import typing
 
+import numpy as np
 import pandas as pd
 import pydantic
 
 from retrack.nodes.base import BaseNode, InputConnectionModel, OutputConnectionModel
+from retrack.utils import scalars
 
 ###############################################################
 # Math Metadata Models
@@ -74,6 +77,38 @@ class Math(BaseNode):
         else:
             raise ValueError("Unknown operator")
 
+    def float_inputs(self) -> typing.List[str]:
+        return ["input_value_0", "input_value_1"]
+
+    async def run_one(
+        self,
+        input_value_0: typing.Any,
+        input_value_1: typing.Any,
+    ) -> typing.Dict[str, float]:
+        value_0 = scalars.to_float(input_value_0)
+        value_1 = scalars.to_float(input_value_1)
+
+        if self.data.operator == MathOperator.SUM:
+            return {"output_value": value_0 + value_1}
+        elif self.data.operator == MathOperator.SUB:
+            return {"output_value": value_0 - value_1}
+        elif self.data.operator == MathOperator.MULTIPLY:
+            return {"output_value": value_0 * value_1}
+        elif self.data.operator == MathOperator.DIVISION:
+            if value_1 == 0:  # pandas returns inf or nan instead of raising
+                if value_0 == 0 or value_0 != value_0:
+                    return {"output_value": scalars.NAN}
+                return {
+                    "output_value": math.copysign(math.inf, value_0)
+                    * math.copysign(1.0, value_1)
+                }
+            return {"output_value": value_0 / value_1}
+        else:
+            raise ValueError("Unknown operator")
+
+    def deterministic(self) -> bool:
+        return True
+
 
 ###############################################################
 # Absolute Value Node
@@ -94,6 +129,18 @@ class AbsoluteValue(BaseNode):
     ) -> typing.Dict[str, pd.Series]:
         return {"output_value": input_value.astype(float).abs()}
 
+    def float_inputs(self) -> typing.List[str]:
+        return ["input_value"]
+
+    async def run_one(
+        self,
+        input_value: typing.Any,
+    ) -> typing.Dict[str, float]:
+        return {"output_value": abs(scalars.to_float(input_value))}
+
+    def deterministic(self) -> bool:
+        return True
+
 
 ###############################################################
 # Round Node
@@ -109,3 +156,20 @@ class Round(BaseNode):
         input_value: pd.Series,
     ) -> typing.Dict[str, pd.Series]:
         return {"output_value": input_value.astype(float).round(0).astype(int)}
+
+    def float_inputs(self) -> typing.List[str]:
+        return ["input_value"]
+
+    async def run_one(
+        self,
+        input_value: typing.Any,
+    ) -> typing.Dict[str, int]:
+        value = np.float64(scalars.to_float(input_value))
+        if not np.isfinite(value):
+            raise ValueError("Cannot convert non-finite values (NA or inf) to integer")
+
+        # Same int64 cast as the vectorized path, overflow included
+        return {"output_value": value.round().astype(np.int64)}
+
+    def deterministic(self) -> bool:
+        return True
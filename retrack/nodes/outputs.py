@@ -44,3 +44,9 @@ class Output(BaseNode):
             constants.OUTPUT_REFERENCE_COLUMN: input_value,
             constants.OUTPUT_MESSAGE_REFERENCE_COLUMN: self.data.message,
         }
+
+    async def run_one(self, input_value: typing.Any) -> typing.Dict[str, typing.Any]:
+        return {
+            constants.OUTPUT_REFERENCE_COLUMN: input_value,
+            constants.OUTPUT_MESSAGE_REFERENCE_COLUMN: self.data.message,
+        }
@@ -1,7 +1,10 @@
+import typing
+
 import pandas as pd
 import pydantic
 
 from retrack.nodes.base import BaseNode, InputConnectionModel, OutputConnectionModel
+from retrack.utils import scalars
 
 ################################################
 # StartsWith Inputs Outputs
@@ -34,3 +37,15 @@ class StartsWith(BaseNode):
                 input_value_1.to_string(index=False)
             )
         }
+
+    async def run_one(
+        self, input_value_0: typing.Any, input_value_1: typing.Any
+    ) -> typing.Dict[str, typing.Any]:
+        if not isinstance(input_value_0, str):
+            scalars.check_str_accessor(input_value_0)
+            return {"output_bool": scalars.NAN}
+
+        return {"output_bool": input_value_0.startswith(scalars.to_text(input_value_1))}
+
+    def deterministic(self) -> bool:
+        return True
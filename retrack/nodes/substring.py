@@ -1,4 +1,8 @@
+import typing
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import infer_dtype
 import pydantic
 
 from retrack.nodes.base import BaseNode, InputConnectionModel, OutputConnectionModel
@@ -29,12 +33,52 @@ class IsSubStringOf(BaseNode):
     async def run(
         self, input_value_0: pd.Series, input_value_1: pd.Series
     ) -> pd.Series:
-        tmp_df = pd.DataFrame(
-            {"input_value_0": input_value_0, "input_value_1": input_value_1}
-        )
+        if not isinstance(input_value_0, pd.Series):
+            if not isinstance(input_value_1, pd.Series):
+                return await self.run_one(input_value_0, input_value_1)
+
+            if isinstance(input_value_0, str) and _is_text(input_value_1):
+                return {
+                    "output_bool": input_value_1.str.contains(
+                        input_value_0, regex=False
+                    )
+                }
+
+            values = [input_value_0 in value for value in input_value_1.to_numpy()]
+            return {"output_bool": pd.Series(values, index=input_value_1.index)}
+
+        if not isinstance(input_value_1, pd.Series):
+            if _is_text(input_value_0):
+                # Each distinct substring is looked up once
+                codes, substrings = pd.factorize(input_value_0)
+                contained = np.array(
+                    [substring in input_value_1 for substring in substrings],
+                    dtype=bool,
+                )
+                values = contained[codes]
+            else:
+                values = [value in input_value_1 for value in input_value_0.to_numpy()]
+
+            return {"output_bool": pd.Series(values, index=input_value_0.index)}
 
-        return {
-            "output_bool": tmp_df.apply(
-                lambda x: x["input_value_0"] in x["input_value_1"], axis=1
+        # Each row is looked up in its own string
+        values = [
+            substring in value
+            for substring, value in zip(
+                input_value_0.to_numpy(), input_value_1.to_numpy()
             )
-        }
+        ]
+        return {"output_bool": pd.Series(values, index=input_value_0.index)}
+
+    async def run_one(
+        self, input_value_0: typing.Any, input_value_1: typing.Any
+    ) -> typing.Dict[str, bool]:
+        return {"output_bool": input_value_0 in input_value_1}
+
+    def deterministic(self) -> bool:
+        return True
+
+
+def _is_text(values: pd.Series) -> bool:
+    """Whether every row holds a string, so no row raises like the in operator."""
+    return infer_dtype(values, skipna=False) == "string"
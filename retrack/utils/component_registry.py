@@ -3,11 +3,36 @@ import typing
 from retrack.nodes.base import BaseNode
 from retrack.utils.registry import Registry
 
+# A connection as (node id, connector name of the other node)
+Connection = typing.Tuple[str, str]
+
+
+def _connections_by_connector(
+    connectors: typing.Any, other_connector_field: str
+) -> typing.Dict[str, typing.List[Connection]]:
+    """Reads the connections of the input or output connectors of a node."""
+    if connectors is None:
+        return {}
+
+    if isinstance(connectors, dict):
+        connectors = connectors.items()
+
+    result = {}
+    for connector_name, connector in connectors:
+        connections = connector.connections if connector is not None else []
+        result[connector_name] = [
+            (connection.node, getattr(connection, other_connector_field))
+            for connection in connections
+        ]
+
+    return result
+
 
 class ComponentRegistry(Registry):
     """A registry to store instances of BaseNode (aka Components).
 
-    It also provides indexes to access the value by name, class, kind and memory type."""
+    It also provides indexes to access the value by name, class, kind and memory type,
+    and adjacency indexes of the connections between the nodes."""
 
     def __init__(self, case_sensitive: bool = False):
         super().__init__(case_sensitive=case_sensitive)
@@ -15,6 +40,11 @@ class ComponentRegistry(Registry):
         self._keys_by_class_map = {}
         self._keys_by_kind_map = {}
         self._keys_by_memory_type_map = {}
+        self._inputs_map = {}
+        self._outputs_map = {}
+        self._predecessors_map = {}
+        self._successors_map = {}
+        self._edges = None
 
     ##################
     ### Properties ###
@@ -69,6 +99,20 @@ class ComponentRegistry(Registry):
 
         self._keys_by_memory_type_map[memory_type].append(key)
 
+    def __register_in_adjacency_maps(self, key: str, value: BaseNode) -> None:
+        inputs = _connections_by_connector(value.inputs, "output")
+        outputs = _connections_by_connector(value.outputs, "input")
+
+        self._inputs_map[key] = inputs
+        self._outputs_map[key] = outputs
+        self._predecessors_map[key] = [
+            node_id for connections in inputs.values() for node_id, _ in connections
+        ]
+        self._successors_map[key] = [
+            node_id for connections in outputs.values() for node_id, _ in connections
+        ]
+        self._edges = None
+
     ######################
     ### Unregistration ###
     ######################
@@ -91,6 +135,13 @@ class ComponentRegistry(Registry):
         memory_type = value.memory_type()
         self._keys_by_memory_type_map[memory_type].remove(key)
 
+    def __unregister_from_adjacency_maps(self, key: str) -> None:
+        self._inputs_map.pop(key, None)
+        self._outputs_map.pop(key, None)
+        self._predecessors_map.pop(key, None)
+        self._successors_map.pop(key, None)
+        self._edges = None
+
     ####################
     ### Public API #####
     ####################
@@ -106,13 +157,16 @@ class ComponentRegistry(Registry):
         self.__register_in_keys_by_class_map(key, value)
         self.__register_in_keys_by_kind_map(key, value)
         self.__register_in_keys_by_memory_type_map(key, value)
+        self.__register_in_adjacency_maps(
+            key if self._case_sensitive else key.lower(), value
+        )
 
     def unregister(self, key: str) -> None:
         """Unregister an entry."""
         if not self._case_sensitive:
             key = key.lower()
 
-        value = self._value.pop(key, None)
+        value = self._memory.pop(key, None)
 
         if value is None:
             return
@@ -121,6 +175,7 @@ class ComponentRegistry(Registry):
         self.__unregister_from_keys_by_class_map(key, value)
         self.__unregister_from_keys_by_kind_map(key, value)
         self.__unregister_from_keys_by_memory_type_map(key, value)
+        self.__unregister_from_adjacency_maps(key)
 
     #####################
     ### Query methods ###
@@ -142,39 +197,49 @@ class ComponentRegistry(Registry):
             self.get(id_) for id_ in self.keys_by_memory_type_map.get(memory_type, [])
         ]
 
-    def _filter_connectors(self, connectors, connector_filter) -> typing.List[str]:
-        result = []
+    def _key(self, node_id: str) -> str:
+        return node_id if self._case_sensitive else node_id.lower()
 
-        for connector_name, value in connectors.items():
-            if connector_filter is not None and connector_name != connector_filter:
-                continue
+    def get_node_inputs(
+        self, node_id: str
+    ) -> typing.Dict[str, typing.List[Connection]]:
+        """Returns the (node id, output name) connected to each input connector of the node."""
+        return self._inputs_map[self._key(node_id)]
 
-            for connection in value["connections"]:
-                result.append(connection["node"])
-        return result
+    def get_node_outputs(
+        self, node_id: str
+    ) -> typing.Dict[str, typing.List[Connection]]:
+        """Returns the (node id, input name) connected to each output connector of the node."""
+        return self._outputs_map[self._key(node_id)]
 
     def get_node_input_connections(
         self, node_id: str, connector_filter=None
     ) -> typing.List[str]:
-        node_dict = self.get(node_id).model_dump(by_alias=True)
+        if connector_filter is None:
+            return list(self._predecessors_map[self._key(node_id)])
 
-        connectors = node_dict.get("inputs", {})
-        return self._filter_connectors(connectors, connector_filter)
+        return [
+            source_id
+            for source_id, _ in self.get_node_inputs(node_id).get(connector_filter, [])
+        ]
 
     def get_node_output_connections(
         self, node_id: str, connector_filter=None
     ) -> typing.List[str]:
-        node_dict = self.get(node_id).model_dump(by_alias=True)
+        if connector_filter is None:
+            return list(self._successors_map[self._key(node_id)])
 
-        connectors = node_dict.get("outputs", {})
-        return self._filter_connectors(connectors, connector_filter)
+        return [
+            target_id
+            for target_id, _ in self.get_node_outputs(node_id).get(connector_filter, [])
+        ]
 
     def calculate_edges(self) -> typing.List[typing.Tuple[str, str]]:
-        edges = []
-
-        for node_id, node in self.memory.items():
-            for _, output_connection in node.outputs:
-                for c in output_connection.connections:
-                    edges.append((node_id, c.node))
-
-        return edges
+        if self._edges is None:
+            self._edges = [
+                (node_id, target_id)
+                for node_id, target_ids in self._successors_map.items()
+                for target_id in target_ids
+            ]
+
+        return list(self._edges)
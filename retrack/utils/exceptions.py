@@ -125,3 +125,43 @@ class InvalidVersionException(Exception):
         )
 
         super().__init__(self.error.model_dump())
+
+
+class ShardExecutionException(Exception):
+    """Exception raised when a shard of a parallel execution fails."""
+
+    def __init__(
+        self,
+        rule_metadata: RuleMetadata,
+        shard: int,
+        start_row: int,
+        end_row: int,
+        raised_exception: ExceptionSchema,
+        node_id: str = None,
+        msg: str = None,
+    ):
+        msg = (
+            msg
+            or f"Error executing shard {shard} (rows {start_row} to {end_row - 1}) from rule {rule_metadata.name} version {rule_metadata.version}"
+        )
+
+        self.shard = shard
+        self.start_row = start_row
+        self.end_row = end_row
+        self.error = ErrorSchema(
+            title="Execution error",
+            status="500",
+            detail=DetailSchema(
+                msg=msg,
+                type="ShardExecutionException",
+                exception=raised_exception,
+            ),
+            metadata=ExecutionMetadata(
+                name=rule_metadata.name,
+                version=rule_metadata.version,
+                node_id=node_id,
+                execution=None,
+            ),
+        )
+
+        super().__init__(self.error.model_dump())
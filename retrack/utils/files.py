@@ -0,0 +1,133 @@
+import os
+import typing
+
+import pandas as pd
+
+CSV_FORMAT = "csv"
+PARQUET_FORMAT = "parquet"
+
+_FORMATS_BY_EXTENSION = {
+    ".csv": CSV_FORMAT,
+    ".parquet": PARQUET_FORMAT,
+    ".pq": PARQUET_FORMAT,
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Parquet files require pyarrow, install it with `pip install retrack[parquet]`"
+        ) from e
+
+    return pyarrow, pyarrow.parquet
+
+
+def file_format(path: typing.Union[str, os.PathLike]) -> str:
+    """Returns the format of a file from its extension.
+
+    Args:
+        path (str | os.PathLike): Path of the file.
+
+    Raises:
+        ValueError: If the extension is not a supported one.
+
+    Returns:
+        str: Either "csv" or "parquet".
+    """
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    if extension not in _FORMATS_BY_EXTENSION:
+        raise ValueError(
+            f"Unsupported file extension {extension!r}, "
+            f"expected one of {list(_FORMATS_BY_EXTENSION)}"
+        )
+
+    return _FORMATS_BY_EXTENSION[extension]
+
+
+def read_chunks(
+    path: typing.Union[str, os.PathLike], chunk_size: int
+) -> typing.Iterator[pd.DataFrame]:
+    """Reads a CSV or Parquet file chunk_size rows at a time.
+
+    CSV values are read as strings, since every rule input is a string.
+
+    Args:
+        path (str | os.PathLike): Path of the file.
+        chunk_size (int): Maximum number of rows per chunk.
+
+    Returns:
+        typing.Iterator[pd.DataFrame]: The chunks, in file order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    if file_format(path) == CSV_FORMAT:
+        with pd.read_csv(path, chunksize=chunk_size, dtype=str) as reader:
+            yield from reader
+        return
+
+    _, parquet = _import_pyarrow()
+    parquet_file = parquet.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield batch.to_pandas()
+
+
+def _as_text(df: pd.DataFrame) -> pd.DataFrame:
+    text = {}
+    for column in df.columns:
+        values = df[column].astype(object)
+        text[column] = values.where(values.isna(), values.astype(str))
+
+    return pd.DataFrame(text, index=df.index)
+
+
+class ChunkWriter:
+    def __init__(self, path: typing.Union[str, os.PathLike]):
+        """Writes DataFrames to a CSV or Parquet file, one chunk at a time.
+
+        Parquet columns are written as nullable strings, so chunks whose
+        columns got different dtypes still share the file schema.
+
+        Args:
+            path (str | os.PathLike): Path of the file, overwritten if it exists.
+        """
+        self.path = path
+        self.format = file_format(path)
+        self.rows = 0
+        self._started = False
+        self._parquet_writer = None
+
+    def write(self, df: pd.DataFrame):
+        if self.format == CSV_FORMAT:
+            df.to_csv(
+                self.path,
+                mode="a" if self._started else "w",
+                header=not self._started,
+                index=False,
+            )
+        else:
+            pyarrow, parquet = _import_pyarrow()
+            schema = pyarrow.schema([(str(name), pyarrow.string()) for name in df])
+            table = pyarrow.Table.from_pandas(
+                _as_text(df), schema=schema, preserve_index=False
+            )
+            if self._parquet_writer is None:
+                self._parquet_writer = parquet.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+
+        self._started = True
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self) -> "ChunkWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
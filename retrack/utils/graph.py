@@ -1,5 +1,6 @@
 import hashlib
 import json
+import typing
 
 import unicodedata
 
@@ -86,29 +87,111 @@ def check_node_name(node_name: str, node_id: str):
         raise TypeError(f"Node {node_id} name must be a string")
 
 
-def walk(actual_id: str, skiped_ids: list, components_registry: ComponentRegistry):
-    skiped_ids.append(actual_id)
-
-    output_ids = components_registry.get_node_output_connections(actual_id)
-
-    for next_id in output_ids:
-        if next_id not in skiped_ids:
-            next_node_input_ids = components_registry.get_node_input_connections(
-                next_id
-            )
-            run_next = True
-            for next_node_input_id in next_node_input_ids:
-                if next_node_input_id not in skiped_ids:
-                    run_next = False
+def find_cycle(
+    edges: typing.Iterable[typing.Tuple[str, str]],
+) -> typing.Optional[typing.List[str]]:
+    """Finds a cycle in a directed graph with an iterative depth first search.
+
+    Args:
+        edges (typing.Iterable[typing.Tuple[str, str]]): The (source, target) edges of the graph.
+
+    Returns:
+        typing.Optional[typing.List[str]]: The nodes of a cycle, starting and ending with the same node, or None if the graph is acyclic.
+    """
+    successors = {}
+    for source, target in edges:
+        successors.setdefault(source, []).append(target)
+        successors.setdefault(target, [])
+
+    visiting, done = set(), set()
+    for root in successors:
+        if root in done:
+            continue
+
+        path = [root]
+        visiting.add(root)
+        stack = [iter(successors[root])]
+        while stack:
+            for node in stack[-1]:
+                if node in visiting:
+                    return path[path.index(node) :] + [node]
+
+                if node not in done:
+                    path.append(node)
+                    visiting.add(node)
+                    stack.append(iter(successors[node]))
                     break
+            else:
+                node = path.pop()
+                visiting.discard(node)
+                done.add(node)
+                stack.pop()
+
+    return None
+
+
+def get_execution_order(components_registry: ComponentRegistry) -> typing.List[str]:
+    """Returns the order in which the nodes run, starting from the start node.
+
+    A node runs right after the last of its inputs, in the order its inputs
+    list their outputs, so the order is a depth first topological order.
+    Nodes whose inputs never all run, e.g. in a cycle, are left out.
+
+    Args:
+        components_registry (ComponentRegistry): Components registry.
+
+    Raises:
+        ValueError: If an output connects to an unknown node or the graph has a cycle.
+
+    Returns:
+        typing.List[str]: The node ids in execution order.
+    """
+    inputs, outputs = {}, {}
+    for node in components_registry.memory.values():
+        inputs[node.id] = components_registry.get_node_input_connections(node.id)
+        outputs[node.id] = components_registry.get_node_output_connections(node.id)
+
+    # Number of distinct inputs of each node that did not run yet
+    missing = {node_id: len(set(input_ids)) for node_id, input_ids in inputs.items()}
+    waiting_on = {}
+    for node_id, input_ids in inputs.items():
+        for input_id in set(input_ids):
+            waiting_on.setdefault(input_id, []).append(node_id)
+
+    order = []
+    visited = set()
+
+    def visit(node_id: str):
+        order.append(node_id)
+        visited.add(node_id)
+        for waiting_id in waiting_on.get(node_id, []):
+            missing[waiting_id] -= 1
+
+    start_id = components_registry.get_by_class("start")[0].id
+    visit(start_id)
+    stack = [iter(outputs[start_id])]
+    while stack:
+        for next_id in stack[-1]:
+            if next_id in visited:
+                continue
+
+            if next_id not in missing:
+                raise ValueError(f"Unknown node id: {next_id}")
+
+            if missing[next_id] == 0:
+                visit(next_id)
+                stack.append(iter(outputs[next_id]))
+                break
+        else:
+            stack.pop()
+
+    if len(order) < len(inputs):
+        cycle = find_cycle(
+            (node_id, output_id)
+            for node_id, output_ids in outputs.items()
+            for output_id in output_ids
+        )
+        if cycle is not None:
+            raise ValueError(f"Graph is not a DAG: {' -> '.join(cycle)}")
 
-            if run_next:
-                walk(next_id, skiped_ids, components_registry)
-
-    return skiped_ids
-
-
-def get_execution_order(components_registry: ComponentRegistry):
-    start_nodes = components_registry.get_by_class("start")
-
-    return walk(start_nodes[0].id, [], components_registry)
+    return order
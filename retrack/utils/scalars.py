@@ -0,0 +1,88 @@
+"""Helpers used by the scalar kernels (run_one) of the nodes.
+
+Each helper mirrors what pandas does to a single element of a Series, so a
+record executed with plain Python values gets the same result as a one row
+DataFrame.
+"""
+
+import math
+import typing
+
+import numpy as np
+import pandas as pd
+
+NAN = float("nan")
+
+# pandas prints long or escaped strings differently in Series.to_string
+_MAX_TEXT_WIDTH = 50
+
+
+def is_missing(value: typing.Any) -> bool:
+    """Same as pd.isna for a scalar, without its dispatch overhead."""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return True
+
+    return isinstance(value, float) and math.isnan(value)
+
+
+def to_float(value: typing.Any) -> float:
+    """Same as Series.astype(float) for a single value."""
+    if value is None:
+        return NAN
+
+    return float(value)
+
+
+def to_numeric(value: typing.Any) -> float:
+    """Same as pd.to_numeric(..., errors="coerce") for a single value."""
+    if isinstance(value, str) and ("_" in value or not value.strip()):
+        return NAN
+
+    try:
+        return to_float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+def to_bool(value: typing.Any) -> bool:
+    """Same as the boolean operators of pandas, where a missing value is False."""
+    if is_missing(value):
+        return False
+
+    return bool(value)
+
+
+def to_text(value: typing.Any) -> str:
+    """Same as Series.to_string(index=False) for a single value."""
+    if isinstance(value, str) and len(value) <= _MAX_TEXT_WIDTH and value.isprintable():
+        return value
+
+    return pd.Series([value]).to_string(index=False)
+
+
+def check_str_accessor(value: typing.Any):
+    """Raises like the .str accessor does for a Series that can not hold strings."""
+    if isinstance(value, (bool, int, float, np.generic)):
+        raise AttributeError("Can only use .str accessor with string values!")
+
+
+def to_native(value: typing.Any) -> typing.Any:
+    """Converts numpy scalars to Python ones and missing values to None."""
+    if is_missing(value):
+        return None
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    return value
+
+
+def unwrap(value: typing.Any) -> typing.Any:
+    """Returns the single element of a one row Series or array."""
+    if isinstance(value, pd.Series):
+        return value.iloc[0]
+
+    if isinstance(value, np.ndarray) and value.ndim == 1:
+        return value[0]
+
+    return value
@@ -1,6 +1,6 @@
 from typing import Optional
-import networkx as nx
 
+from retrack.utils import graph
 from retrack.validators.base import BaseValidator
 
 
@@ -12,7 +12,8 @@ class CheckIsDAG(BaseValidator):
             A tuple (is_valid, error_message). is_valid is True if the graph data is valid, False otherwise.
             error_message contains details about the validation failure, or None if validation passed.
         """
-        graph = nx.DiGraph()
-        graph.add_edges_from(edges)
-        result = nx.is_directed_acyclic_graph(graph)
-        return result, None if result else "Graph is not a DAG"
+        cycle = graph.find_cycle(edges)
+        if cycle is None:
+            return True, None
+
+        return False, f"Graph is not a DAG: {' -> '.join(cycle)}"
@@ -1,7 +1,11 @@
+import io
 from typing import Optional
-from retrack.validators.base import BaseValidator
+
+import numpy as np
 import pandas as pd
-import io
+
+from retrack.nodes.constants import read_interval_table
+from retrack.validators.base import BaseValidator
 
 
 class IntervalCatV0Validator(BaseValidator):
@@ -31,29 +35,77 @@ class IntervalCatV0Validator(BaseValidator):
                 continue
 
             try:
-                csv_data = "\n".join(value)
-                df = pd.read_csv(io.StringIO(csv_data))
-
-                if start_col not in df.columns or end_col not in df.columns:
+                interval_columns = _interval_columns(data, start_col, end_col)
+                if interval_columns is None:
                     return (
                         False,
                         f"Missing required columns: {start_col}, {end_col} in node {node_id}",
                     )
 
-                df[start_col] = pd.to_numeric(df[start_col], errors="coerce")
-                df[end_col] = pd.to_numeric(df[end_col], errors="coerce")
-
-                if df[start_col].isnull().any() or df[end_col].isnull().any():
+                starts, ends = interval_columns
+                if starts.isnull().any() or ends.isnull().any():
                     return (
                         False,
                         f"Invalid numeric values in interval columns in node {node_id}",
                     )
 
-                df = df.sort_values(by=start_col)
-                if (df[start_col].values[1:] < df[end_col].values[:-1]).any():
+                order = np.argsort(starts.to_numpy(), kind="quicksort")
+                starts = starts.to_numpy()[order]
+                ends = ends.to_numpy()[order]
+                if (starts[1:] < ends[:-1]).any():
                     return False, f"Overlapping intervals detected in node {node_id}"
 
             except Exception as e:
                 return False, f"Validation error: {str(e)} in node {node_id}"
 
         return True, None
+
+
+def _interval_columns(
+    data: dict, start_col: str, end_col: str
+) -> Optional[tuple[pd.Series, pd.Series]]:
+    """Interval columns of the table as numbers, None if the table misses one.
+
+    Tables whose header line lists the headers of the node, the usual case,
+    are read once by the cached read of the node, which then reuses it. The
+    other tables, and those with values that are not numbers or that the read
+    fails on, are read as a whole, for pandas to report them as it always did.
+    """
+    value = data["value"]
+    headers = data.get("headers")
+    if (
+        _is_header_line(value[0], headers)
+        and data.get("separator", ",") == ","
+        and start_col in headers
+        and end_col in headers
+    ):
+        try:
+            df = read_interval_table(
+                tuple(value), tuple(headers), ",", start_col, end_col
+            )
+            starts = pd.to_numeric(df[start_col], errors="coerce")
+            ends = pd.to_numeric(df[end_col], errors="coerce")
+            if not starts.isnull().any() and not ends.isnull().any():
+                return starts, ends
+        except ValueError:
+            pass
+
+    df = pd.read_csv(io.StringIO("\n".join(value)))
+    if start_col not in df.columns or end_col not in df.columns:
+        return None
+
+    return (
+        pd.to_numeric(df[start_col], errors="coerce"),
+        pd.to_numeric(df[end_col], errors="coerce"),
+    )
+
+
+def _is_header_line(line: str, headers: Optional[list]) -> bool:
+    """Whether pandas reads the line as these column names, with no need to parse it."""
+    return (
+        isinstance(headers, list)
+        and all(isinstance(name, str) and name for name in headers)
+        and len(set(headers)) == len(headers)
+        and '"' not in line
+        and line == ",".join(headers)
+    )
@@ -0,0 +1,44 @@
+from retrack import from_json
+
+
+def test_adjacency_indexes():
+    components_registry = from_json(
+        "tests/resources/to-lowercase.json"
+    ).components_registry
+
+    assert components_registry.get_node_inputs("3") == {
+        "input_value": [("2", "output_value")]
+    }
+    assert components_registry.get_node_outputs("3") == {
+        "output_value": [("4", "input_value")]
+    }
+    assert components_registry.get_node_input_connections("3") == ["2"]
+    assert components_registry.get_node_output_connections("2") == ["3"]
+    assert (
+        components_registry.get_node_output_connections(
+            "0", connector_filter="output_down_void"
+        )
+        == []
+    )
+    assert sorted(components_registry.calculate_edges()) == [
+        ("0", "2"),
+        ("2", "3"),
+        ("3", "4"),
+    ]
+
+
+def test_adjacency_indexes_follow_registration():
+    components_registry = from_json(
+        "tests/resources/to-lowercase.json"
+    ).components_registry
+    lowercase = components_registry.get("3")
+    components_registry.calculate_edges()
+
+    components_registry.unregister("3")
+    assert "3" not in components_registry
+    # Node 2 still declares its connection to node 3
+    assert sorted(components_registry.calculate_edges()) == [("0", "2"), ("2", "3")]
+
+    components_registry.register("3", lowercase)
+    assert components_registry.get_node_input_connections("3") == ["2"]
+    assert ("3", "4") in components_registry.calculate_edges()
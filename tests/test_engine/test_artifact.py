@@ -0,0 +1,107 @@
+import gc
+
+import pandas as pd
+import pytest
+
+from retrack import Rule, from_artifact, from_json, to_artifact
+from retrack.engine import artifact
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "multiple-ifs",
+        "age-categorizer",
+        "csv-table-with-if",
+        "glm",
+        "conditional-connector",
+        "rule-of-rules",
+        "rules-with-subrules-with-conditions",
+        "subrule-with-connector",
+    ],
+)
+async def test_from_artifact_matches_from_json(filename):
+    executor = from_json(f"tests/resources/{filename}.json")
+    loaded = from_artifact(to_artifact(f"tests/resources/{filename}.json"))
+
+    assert loaded.metadata == executor.metadata
+    assert loaded.execution_order == executor.execution_order
+
+    names = executor.request_manager.input_names
+    payload = pd.DataFrame(
+        [{name: value for name in names} for value in ["-1", "0", "1", "5", "12"]]
+    )
+    expected = await executor.execute(payload, debug_mode=True)
+    out_values = await loaded.execute(payload, debug_mode=True)
+
+    if expected[1] is None:
+        pd.testing.assert_frame_equal(out_values[0].result, expected[0].result)
+    else:
+        assert type(out_values[1]) is type(expected[1])
+
+
+def test_from_artifact_file(tmp_path):
+    path = tmp_path / "rule.retrack"
+    path.write_bytes(to_artifact("tests/resources/multiple-ifs.json"))
+
+    rule = from_artifact(path, return_executor=False)
+    assert rule.name == "tests/resources/multiple-ifs.json"
+
+
+def test_from_artifact_invalid():
+    data = to_artifact("tests/resources/multiple-ifs.json")
+
+    with pytest.raises(ValueError, match="checksum"):
+        from_artifact(data[:-1] + bytes([data[-1] ^ 1]))
+
+    with pytest.raises(ValueError, match="magic"):
+        from_artifact(b"x" + data[1:])
+
+    with pytest.raises(ValueError, match="format version"):
+        header = artifact._HEADER.unpack_from(data)
+        from_artifact(
+            artifact._HEADER.pack(header[0], artifact.FORMAT_VERSION + 1, header[2])
+            + data[artifact._HEADER.size :]
+        )
+
+    with pytest.raises(ValueError, match="too short"):
+        from_artifact(b"")
+
+
+def test_from_artifact_restores_precomputed_data():
+    loaded = from_artifact(to_artifact("tests/resources/glm.json"))
+
+    glm = loaded.components_registry.get_by_name("glm")[0]
+    # Constructed without validation, so the schema of its class is never built
+    assert not type(glm).__pydantic_complete__
+    assert "coefficients" in glm.data.__dict__
+    expected = from_json("tests/resources/glm.json").components_registry
+    weights, intercept = expected.get_by_name("glm")[0].data.coefficients
+    assert glm.data.coefficients[0].tolist() == weights.tolist()
+    assert glm.data.coefficients[1] == intercept
+
+    loaded = from_artifact(to_artifact("tests/resources/age-categorizer.json"))
+    interval = loaded.components_registry.get_by_name("intervalcatv0")[0]
+    assert "bins" in interval.data.__dict__
+    assert interval.data.sorted_intervals == (
+        [0.0, 18.0, 24.0, 40.0],
+        [18.0, 24.0, 40.0, 100.0],
+        ["invalid", "group 1", "group 2", "group 3"],
+    )
+
+
+def test_from_artifact_does_not_keep_loaded_rules():
+    data = to_artifact("tests/resources/rules-with-subrules-with-conditions.json")
+
+    def live_rules() -> int:
+        gc.collect()
+        return sum(isinstance(obj, Rule) for obj in gc.get_objects())
+
+    from_artifact(data)
+    before = live_rules()
+    for _ in range(20):
+        from_artifact(data)
+
+    # The classes of the flow nodes hold their sub-rules
+    assert live_rules() == before
@@ -0,0 +1,96 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from retrack import BatchingExecutor, from_json
+from retrack.utils.exceptions import ValidationException
+
+
+@pytest.fixture
+def executor():
+    return from_json("tests/resources/multiple-ifs.json")
+
+
+@pytest.mark.asyncio
+async def test_batching_executor_coalesces_calls(executor, mocker):
+    batching = BatchingExecutor(executor, max_batch_size=100, batch_window=0.01)
+    spy = mocker.spy(executor, "execute")
+
+    payloads = [pd.DataFrame([{"number": n}]) for n in range(-2, 8)]
+    results = await asyncio.gather(*(batching.execute(p) for p in payloads))
+
+    assert spy.call_count == 1
+    for payload, result in zip(payloads, results):
+        expected = await executor.execute(payload)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.asyncio
+async def test_batching_executor_runs_full_batches_right_away(executor, mocker):
+    batching = BatchingExecutor(executor, max_batch_size=4, batch_window=60)
+    spy = mocker.spy(executor, "execute")
+
+    payloads = [pd.DataFrame([{"number": n}, {"number": n + 1}]) for n in range(4)]
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batching.execute(p) for p in payloads)), timeout=5
+    )
+
+    assert spy.call_count == 2
+    assert [len(result) for result in results] == [2, 2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_batching_executor_isolates_errors(executor):
+    batching = BatchingExecutor(executor, batch_window=0.01)
+
+    results = await asyncio.gather(
+        batching.execute(pd.DataFrame([{"number": 1}])),
+        batching.execute(pd.DataFrame([{"number": None}])),
+        batching.execute(pd.DataFrame([{"number": 5}])),
+        return_exceptions=True,
+    )
+
+    assert results[0].to_dict(orient="records") == [{"message": "first", "output": "1"}]
+    assert isinstance(results[1], ValidationException)
+    assert (
+        results[2]["output"].tolist()
+        == (await executor.execute(pd.DataFrame([{"number": 5}])))["output"].tolist()
+    )
+
+
+@pytest.mark.asyncio
+async def test_batching_executor_does_not_cast_payloads(executor, mocker):
+    batching = BatchingExecutor(executor, batch_window=0.01)
+    spy = mocker.spy(executor, "execute")
+
+    results = await asyncio.gather(
+        batching.execute(pd.DataFrame([{"number": 1}])),
+        batching.execute(pd.DataFrame([{"number": 2.5}])),
+        batching.execute(pd.DataFrame([{"number": 2}])),
+    )
+
+    # The float payload runs in a batch of its own
+    assert spy.call_count == 2
+    assert results[0].to_dict(orient="records") == [{"message": "first", "output": "1"}]
+    for payload, result in zip([{"number": 2.5}, {"number": 2}], results[1:]):
+        expected = await executor.execute(pd.DataFrame([payload]))
+        pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.asyncio
+async def test_batching_executor_splits_failing_batches(executor):
+    batching = BatchingExecutor(executor, batch_window=0.01)
+
+    payloads = [{"number": str(n)} for n in range(-2, 6)]
+    payloads[5] = {"number": None}
+    results = await asyncio.gather(
+        *(batching.execute(pd.DataFrame([payload])) for payload in payloads),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[5], ValidationException)
+    for index, (payload, result) in enumerate(zip(payloads, results)):
+        if index != 5:
+            expected = await executor.execute(pd.DataFrame([payload]))
+            pd.testing.assert_frame_equal(result, expected)
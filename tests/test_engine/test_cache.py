@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from retrack import from_json, nodes
+from retrack.engine.cache import RuleCache
+
+
+def test_from_json_uses_cache():
+    cache = RuleCache()
+
+    executor = from_json("tests/resources/multiple-ifs.json", cache=cache)
+    assert from_json("tests/resources/multiple-ifs.json", cache=cache) is executor
+    assert cache.info() == (1, 1, 128, 1)
+
+    with open("tests/resources/multiple-ifs.json") as f:
+        graph_data = json.load(f)
+
+    rule = from_json(graph_data, cache=cache, return_executor=False)
+    assert from_json(graph_data, cache=cache) is rule.executor
+    assert cache.info().hits == 2
+
+    other_registry = nodes.registry()
+    from_json(graph_data, cache=cache, nodes_registry=other_registry)
+    from_json(graph_data, cache=cache, connectors_as_inputs=False)
+    assert cache.info() == (2, 4, 128, 4)
+
+    assert from_json(graph_data, cache=None) is not rule.executor
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RuleCache(maxsize=2)
+
+    cache.get_or_create(("a",), lambda: "a")
+    cache.get_or_create(("b",), lambda: "b")
+    cache.get_or_create(("a",), lambda: "other a")
+    cache.get_or_create(("c",), lambda: "c")
+
+    assert ("a",) in cache and ("c",) in cache
+    assert ("b",) not in cache
+    assert cache.get_or_create(("a",), lambda: "other a") == "a"
+
+    cache.clear()
+    assert cache.info() == (0, 0, 2, 0)
+
+    with pytest.raises(ValueError):
+        RuleCache(maxsize=0)
+
+
+def _flow_executors(executor):
+    return [
+        executor.components_registry.get(node_id).sub_rule_executor()
+        for node_id in executor.execution_order
+        if executor.components_registry.get(node_id).name == "FlowV0"
+    ]
+
+
+def test_identical_subrules_are_created_once():
+    with open("tests/resources/rules-with-subrules-with-conditions.json") as f:
+        graph_data = json.load(f)
+
+    flow_nodes = [
+        node for node in graph_data["nodes"].values() if node["name"] == "FlowV0"
+    ]
+    flow_nodes[1]["data"] = dict(flow_nodes[0]["data"])
+
+    first, second = _flow_executors(from_json(graph_data, cache=None))
+    assert first is second
+
+
+def test_subrules_are_shared_across_loads():
+    cache = RuleCache()
+
+    executor = from_json("tests/resources/rule-of-rules.json", cache=cache)
+    with open("tests/resources/rule-of-rules.json") as f:
+        other = from_json(json.load(f), cache=cache)
+
+    assert other is not executor
+    assert _flow_executors(other)[0] is _flow_executors(executor)[0]
+
+    unshared = from_json("tests/resources/rule-of-rules.json", cache=None)
+    assert _flow_executors(unshared)[0] is not _flow_executors(executor)[0]
+
+
+def test_cache_key_hashes_unhashable_options():
+    key = RuleCache.key("hash", name="rule", extra={"b": [1, 2], "a": None})
+
+    assert key == RuleCache.key("hash", extra={"a": None, "b": [1, 2]}, name="rule")
+    assert key != RuleCache.key("hash", name="rule", extra={"b": [2, 1], "a": None})
+    assert key not in RuleCache()
+
+
+def test_from_json_does_not_cache_by_default():
+    executor = from_json("tests/resources/multiple-ifs.json")
+
+    assert from_json("tests/resources/multiple-ifs.json") is not executor
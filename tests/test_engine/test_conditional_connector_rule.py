@@ -1,3 +1,4 @@
+import asyncio
 import typing
 import retrack
 from retrack.nodes.dynamic import BaseDynamicNode, Registry
@@ -76,3 +77,61 @@ async def test_bureau_connector_factory(
     result = await rule_executor.execute(df, raise_raw_exception=True)
     assert result["output"].to_list()[0] == expected_result
     assert result["message"].to_list()[0] == expected_message
+
+
+@pytest.mark.asyncio
+async def test_bureau_connectors_run_concurrently():
+    in_flight, max_in_flight = 0, 0
+
+    def slow_connector_factory(
+        inputs: typing.Dict[str, typing.Any], **kwargs
+    ) -> typing.Type[BaseDynamicNode]:
+        node_class = bureau_connector_factory(inputs=inputs, **kwargs)
+
+        class SlowConnectorNode(node_class):
+            async def run(self, parent_execution, parent_node_id, **node_inputs):
+                nonlocal in_flight, max_in_flight
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+                parent_execution.add_child_execution(
+                    node_id=parent_node_id, execution=self.data.resource
+                )
+                return await super().run(**node_inputs)
+
+        return SlowConnectorNode
+
+    dynamic_nodes_registry = dynamic_nodes_registry_factory()
+    dynamic_nodes_registry.register(
+        "BureauConnector", slow_connector_factory, overwrite=True
+    )
+    rule_executor = retrack.from_json(
+        "tests/resources/conditional-connector.json",
+        dynamic_nodes_registry=dynamic_nodes_registry,
+    )
+
+    input_nodes = rule_executor.components_registry.get_by_kind(
+        retrack.nodes.base.NodeKind.INPUT
+    )
+    input_nodes.extend(rule_executor.components_registry.get_by_name("connectorv0"))
+
+    rule_executor.reset_request_manager(input_nodes)
+
+    df = pd.DataFrame({"age": [40], "cpf": ["12345678900"], "license_plate": ["A"]})
+
+    expected, _ = await rule_executor.execute(df, debug_mode=True)
+    assert max_in_flight == 1
+
+    execution, exception = await rule_executor.execute(
+        df, debug_mode=True, max_concurrency=4
+    )
+    assert exception is None
+    assert max_in_flight > 1
+    pd.testing.assert_frame_equal(execution.result, expected.result)
+    # Child executions are still added in execution order
+    assert list(execution.child_executions.items()) == list(
+        expected.child_executions.items()
+    )
+    assert len(execution.child_executions) == 2
@@ -1,8 +1,10 @@
 import json
+import numpy as np
 import pytest
 import pandas as pd
 
 from retrack import from_json
+from retrack.engine.base import Execution, StateStore
 
 
 @pytest.mark.asyncio
@@ -31,3 +33,124 @@ async def test_to_normalized_dict(filename, in_values):
 
     assert isinstance(normalized_records, list)
     assert normalized_records == expected_out_values
+
+
+def test_state_store_scatter_and_gather():
+    store = StateStore(4)
+    store.set("a@output_value", pd.Series(["x", "y", "z", "w"]))
+    store.set("b@output_value", pd.Series([1, 2], index=[1, 3]), rows=np.array([1, 3]))
+
+    assert store.get("a@output_value", rows=np.array([0, 2])).tolist() == ["x", "z"]
+    assert store.get("b@output_value", rows=np.array([1, 3])).tolist() == [1, 2]
+    assert store.get("b@output_value", rows=np.array([1, 3])).dtype == np.int64
+
+    missing = store.get("b@output_value")
+    assert missing.index.tolist() == [0, 1, 2, 3]
+    assert missing.isna().tolist() == [True, False, True, False]
+
+
+def test_state_store_does_not_write_into_caller_arrays():
+    values = np.array([1.0, 2.0, 3.0])
+    store = StateStore(3)
+    store.set("output", values)
+    store.set("output", "done", rows=np.array([0]))
+
+    assert values.tolist() == [1.0, 2.0, 3.0]
+    assert store.get("output").tolist() == ["done", 2.0, 3.0]
+
+
+def test_state_store_to_frame():
+    store = StateStore(2)
+    store.set("output", np.nan)
+    store.set("output", pd.Series([True], index=[1]), rows=np.array([1]))
+
+    frame = store.to_frame()
+    assert list(frame.columns) == ["output"]
+    assert frame["output"].isna().tolist() == [True, False]
+
+
+def test_state_store_converts_float_reads_once(mocker):
+    store = StateStore(3)
+    store.set("a@output_value", pd.Series(["1.5", "2", None]))
+    store.set("b@output_value", pd.Series(["1", "x", "3"]))
+    astype = mocker.spy(pd.Series, "astype")
+
+    floats = store.get_float("a@output_value", rows=np.array([0, 2]))
+    assert floats.index.tolist() == [0, 2]
+    assert floats.tolist()[0] == 1.5 and np.isnan(floats.tolist()[1])
+    assert store.get_float("a@output_value").tolist()[:2] == [1.5, 2.0]
+    assert astype.call_count == 1
+
+    # Values that can not be converted are returned as they are
+    assert store.get_float("b@output_value").tolist() == ["1", "x", "3"]
+
+    store.set("a@output_value", pd.Series(["4"], index=[2]), rows=np.array([2]))
+    assert store.get_float("a@output_value").tolist() == [1.5, 2.0, 4.0]
+
+
+@pytest.mark.asyncio
+async def test_empty_branches_are_skipped(mocker):
+    runner = from_json("tests/resources/multiple-ifs.json")
+    steps = {step.node_id: step for step in runner.plan}
+    else_check = mocker.spy(steps["12"], "run")
+    second_then_constant = mocker.spy(steps["14"], "run")
+
+    execution, exception = await runner.execute(
+        pd.DataFrame([{"number": 1}, {"number": 4}]), debug_mode=True
+    )
+
+    assert exception is None
+    assert else_check.call_count == 1
+    assert second_then_constant.call_count == 0
+    assert all(isinstance(f, np.ndarray) for f in execution.filters.values())
+    assert execution.filters["12"].tolist() == [False, True]
+    assert not execution.filters["14"].any()
+    assert execution.get_state_data("14@output_value", constants={}).isna().all()
+    assert execution.result.to_dict(orient="records") == [
+        {"output": "1", "message": "first"},
+        {"output": "0", "message": "other"},
+    ]
+
+
+def test_unresolved_rows_are_tracked_on_output_writes():
+    store = StateStore(3)
+    store.set("output", np.nan)
+    execution = Execution(payload=pd.DataFrame({"a": [1, 2, 3]}), states=store)
+
+    assert execution.unresolved_count == 3
+    assert not execution.has_ended()
+
+    execution.set_state_data(
+        "output", pd.Series(["x", None], index=[0, 2]), np.array([0, 2])
+    )
+    assert execution.unresolved.tolist() == [False, True, True]
+    assert execution.unresolved_count == 2
+
+    execution.set_state_data("other", "ignored")
+    assert execution.unresolved_count == 2
+
+    execution.set_state_data("output", "y", np.array([1, 2]))
+    assert execution.unresolved_count == 0
+    assert execution.has_ended()
+
+
+def test_active_rows_skip_resolved_rows():
+    store = StateStore(4)
+    store.set("output", np.nan)
+    execution = Execution(payload=pd.DataFrame({"a": [1, 2, 3, 4]}), states=store)
+
+    assert execution.active_rows() is None
+    assert execution.active_rows(np.array([True, True, False, True])).tolist() == [
+        0,
+        1,
+        3,
+    ]
+
+    execution.set_state_data("output", "done", np.array([1, 2]))
+
+    assert execution.active_rows().tolist() == [0, 3]
+    assert execution.active_rows(np.array([True, True, False, True])).tolist() == [
+        0,
+        3,
+    ]
+    assert execution.active_rows(np.array([False, True, True, False])).tolist() == []
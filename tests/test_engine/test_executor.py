@@ -1,3 +1,4 @@
+import asyncio
 import json
 from datetime import datetime, timedelta
 
@@ -5,7 +6,12 @@ import pandas as pd
 import pytest
 
 from retrack import Rule, from_json, nodes, RuleExecutor
-from retrack.utils.exceptions import ExecutionException
+from retrack.nodes import math as math_nodes
+from retrack.utils.exceptions import (
+    ExecutionException,
+    ShardExecutionException,
+    ValidationException,
+)
 
 
 @pytest.mark.asyncio
@@ -409,3 +415,469 @@ async def test_invalid_flows(filename, in_values, expected_error):
         ).executor
 
     assert expected_error in str(excinfo.value)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filename, in_values",
+    [
+        ("multiple-ifs", [{"number": n} for n in range(-2, 8)]),
+        ("age-categorizer", [{"age": n} for n in range(0, 40, 3)]),
+        (
+            "rules-with-subrules-with-conditions",
+            [{"a": n, "b": 2, "c": 3, "d": 4} for n in range(-5, 15, 2)],
+        ),
+    ],
+)
+async def test_concurrent_execution_matches_sequential(filename, in_values):
+    executor = from_json(f"tests/resources/{filename}.json")
+    payload = pd.DataFrame(in_values)
+
+    expected = await executor.execute(payload)
+    out_values = await executor.execute(payload, max_concurrency=4)
+
+    pd.testing.assert_frame_equal(out_values, expected)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_execution_overlaps_independent_nodes():
+    executor = from_json("tests/resources/multiple-ifs.json")
+    in_flight, max_in_flight = 0, 0
+
+    def slow(run):
+        async def wrapper(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await run(**kwargs)
+
+        return wrapper
+
+    for step in executor.plan:
+        step.run = slow(step.run)
+
+    payload = pd.DataFrame([{"number": n} for n in range(-2, 8)])
+    expected = await executor.execute(payload)
+    assert max_in_flight == 1
+
+    out_values = await executor.execute(payload, max_concurrency=4)
+    assert max_in_flight > 1
+    pd.testing.assert_frame_equal(out_values, expected)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filename, records",
+    [
+        ("multiple-ifs", [{"number": n} for n in ["-1", "1", "2", "5", "abc"]]),
+        ("age-negative", [{"age": n} for n in [-10, 10, 18, 30]]),
+        ("glm", [{"a": 1, "b": 4}, {"a": "0.5", "b": "-2"}]),
+        ("round-node", [{"var_a": "1.5", "var_b": "2"}]),
+        ("csv-table-with-if", None),
+        ("to-lowercase", None),
+        ("issubstringof", None),
+        ("date-difference", [{"quoted_at": "2024-01-01"}]),
+        (
+            "rules-with-subrules-with-conditions",
+            [{"a": n, "b": 2, "c": 3, "d": 4} for n in range(-5, 15, 4)],
+        ),
+    ],
+)
+async def test_execute_one_matches_execute(filename, records):
+    executor = from_json(f"tests/resources/{filename}.json")
+
+    if records is None:
+        records = [{name: "1" for name in executor.request_manager.input_names}]
+
+    for record in records:
+        out_values = await executor.execute(pd.DataFrame([record]))
+        expected = {
+            key: None if pd.isna(value) else value
+            for key, value in out_values.to_dict(orient="records")[0].items()
+        }
+
+        assert await executor.execute_one(record) == expected
+
+
+@pytest.mark.asyncio
+async def test_execute_one_errors():
+    executor = from_json("tests/resources/multiple-ifs.json")
+
+    with pytest.raises(ValidationException):
+        await executor.execute_one({})
+
+    with pytest.raises(ValidationException):
+        await executor.execute_one({"number": None})
+
+    executor = from_json("tests/resources/round-node.json")
+
+    with pytest.raises(ExecutionException):
+        await executor.execute_one({"var_a": "abc", "var_b": "1"})
+
+
+@pytest.mark.asyncio
+async def test_execute_trusted_payload():
+    executor = from_json("tests/resources/multiple-ifs.json")
+
+    payload = pd.DataFrame({"number": ["1", "2", "5"]}, index=[10, 11, 12])
+    expected = await executor.execute(payload)
+
+    out_values = await executor.execute(payload, trusted=True)
+    pd.testing.assert_frame_equal(out_values, expected)
+
+
+@pytest.mark.asyncio
+async def test_execute_chunks():
+    executor = from_json("tests/resources/multiple-ifs.json")
+    payload = pd.DataFrame({"id": range(10), "number": [str(n % 7) for n in range(10)]})
+    expected = await executor.execute(payload)
+
+    chunks = [payload.iloc[start : start + 3] for start in range(0, 10, 3)]
+    results = [
+        result async for result in executor.execute_chunks(chunks, keep_columns=["id"])
+    ]
+
+    assert [len(result) for result in results] == [3, 3, 3, 1]
+    out_values = pd.concat(results)
+    assert out_values["id"].tolist() == list(range(10))
+    pd.testing.assert_frame_equal(out_values[expected.columns], expected)
+
+
+@pytest.mark.asyncio
+async def test_execute_file_csv(tmp_path):
+    executor = from_json("tests/resources/multiple-ifs.json")
+    payload = pd.DataFrame({"id": range(10), "number": [str(n % 7) for n in range(10)]})
+    payload.to_csv(tmp_path / "payload.csv", index=False)
+
+    rows = await executor.execute_file(
+        tmp_path / "payload.csv",
+        tmp_path / "results.csv",
+        chunk_size=4,
+        keep_columns=["id"],
+    )
+
+    assert rows == 10
+    out_values = pd.read_csv(tmp_path / "results.csv", dtype=str)
+    expected = await executor.execute(payload)
+    assert out_values["id"].tolist() == [str(n) for n in range(10)]
+    assert out_values["output"].tolist() == expected["output"].tolist()
+
+
+@pytest.mark.asyncio
+async def test_execute_file_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    executor = from_json("tests/resources/multiple-ifs.json")
+    payload = pd.DataFrame({"number": [str(n % 7) for n in range(10)]})
+    payload.to_parquet(tmp_path / "payload.parquet")
+
+    rows = await executor.execute_file(
+        tmp_path / "payload.parquet", tmp_path / "results.parquet", chunk_size=4
+    )
+
+    assert rows == 10
+    expected = await executor.execute(payload)
+    out_values = pd.read_parquet(tmp_path / "results.parquet")
+    assert out_values["output"].tolist() == expected["output"].tolist()
+
+
+@pytest.mark.asyncio
+async def test_execute_parallel():
+    executor = from_json("tests/resources/multiple-ifs.json")
+    payload = pd.DataFrame({"number": [str(n % 7) for n in range(10)]})
+    expected = await executor.execute(payload)
+
+    out_values = await executor.execute_parallel(payload, workers=2, shard_size=3)
+    pd.testing.assert_frame_equal(out_values, expected)
+
+
+@pytest.mark.asyncio
+async def test_execute_parallel_errors():
+    executor = from_json("tests/resources/round-node.json")
+    payload = pd.DataFrame({"var_a": ["1", "2", "abc", "4"], "var_b": "1"})
+
+    with pytest.raises(ShardExecutionException) as e:
+        await executor.execute_parallel(payload, workers=2, shard_size=2)
+
+    assert (e.value.shard, e.value.start_row, e.value.end_row) == (1, 2, 4)
+    assert e.value.error.detail.exception.exception_type == "ExecutionException"
+
+    with pytest.raises(ValidationException):
+        await executor.execute_parallel(pd.DataFrame({"var_a": ["1"]}), workers=2)
+
+    with pytest.raises(ValueError):
+        await RuleExecutor(
+            executor.components_registry,
+            executor.execution_order,
+            executor.metadata,
+            connectors_as_inputs=True,
+        ).execute_parallel(payload)
+
+
+def _nested_rule_of_rules(levels: int) -> dict:
+    with open("tests/resources/rule-of-rules.json", "r") as f:
+        graph_data = json.load(f)
+
+    nested = graph_data
+    for _ in range(levels - 1):
+        outer = json.loads(json.dumps(graph_data))
+        for node in outer["nodes"].values():
+            if node["name"] == "FlowV0":
+                node["data"]["value"] = json.dumps(nested)
+        nested = outer
+
+    return nested
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "graph_data",
+    [
+        "tests/resources/rule-of-rules.json",
+        "tests/resources/rule-of-rules-with-different-names.json",
+        "tests/resources/rules-with-subrules-with-conditions.json",
+        "tests/resources/subrule-with-connector.json",
+        _nested_rule_of_rules(3),
+    ],
+)
+async def test_inline_subrules_matches_nested_execution(graph_data):
+    executor = from_json(graph_data)
+    inlined = from_json(graph_data, inline_subrules=True)
+
+    assert any(step.inlined is not None for step in inlined.plan.steps)
+    assert all(step.inlined is None for step in executor.plan.steps)
+
+    names = executor.request_manager.input_names
+    payload = pd.DataFrame(
+        [{name: value for name in names} for value in ["-1", "0", "1", "5", "12"]]
+    )
+    payload["prediction"] = [1, 2, 3, 4, 5]
+
+    expected = await executor.execute(payload)
+    out_values = await inlined.execute(payload)
+    pd.testing.assert_frame_equal(out_values, expected)
+
+    execution, exception = await inlined.execute(payload, debug_mode=True)
+    assert exception is None
+    assert execution.child_executions == {}
+
+
+@pytest.mark.asyncio
+async def test_inline_subrules_errors():
+    inlined = from_json(
+        "tests/resources/subrule-with-connector.json",
+        inline_subrules=True,
+    )
+    payload = pd.DataFrame(
+        {
+            "sepal_length": [1, 2],
+            "sepal_width": [1, 2],
+            "petal_length": [1, 2],
+            "petal_width": [1, 2],
+        }
+    )
+
+    # The sub-rule requires the prediction column of the payload
+    with pytest.raises(ExecutionException) as e:
+        await inlined.execute(payload)
+
+    assert e.value.error.detail.exception.exception_type == "ValidationException"
+
+
+def _glm_rule_with_shared_inputs() -> dict:
+    with open("tests/resources/glm.json", "r") as f:
+        graph_data = json.load(f)
+
+    nodes = graph_data["nodes"]
+    glm = nodes["53e6fe5413a32be7"]
+    other = json.loads(json.dumps(glm))
+    other["id"] = "glm2"
+    other["data"]["value"] = '{"a":0.1,"b":-0.2,"intercept":0.5}'
+    other["data"]["link"] = "exponential"
+    nodes["glm2"] = other
+
+    for input_id in ("e3ff3420e884087e", "a59c1209bf437061"):
+        connections = nodes[input_id]["outputs"]["output_value"]["connections"]
+        connections.append({"node": "glm2", "input": connections[0]["input"]})
+
+    glm["outputs"]["output_value"]["connections"] = [
+        {"node": "sum", "input": "input_value_0"}
+    ]
+    other["outputs"]["output_value"]["connections"] = [
+        {"node": "sum", "input": "input_value_1"}
+    ]
+    nodes["sum"] = {
+        "id": "sum",
+        "name": "Math",
+        "data": {"operator": "+"},
+        "inputs": {
+            "input_value_0": {
+                "connections": [{"node": glm["id"], "output": "output_value"}]
+            },
+            "input_value_1": {
+                "connections": [{"node": "glm2", "output": "output_value"}]
+            },
+        },
+        "outputs": {
+            "output_value": {
+                "connections": [{"node": "9c7b5cca67565955", "input": "input_value"}]
+            }
+        },
+    }
+    nodes["9c7b5cca67565955"]["inputs"]["input_value"]["connections"] = [
+        {"node": "sum", "output": "output_value"}
+    ]
+
+    return graph_data
+
+
+@pytest.mark.asyncio
+async def test_glm_nodes_with_shared_inputs_run_in_batch():
+    graph_data = _glm_rule_with_shared_inputs()
+    executor = from_json(graph_data)
+    unbatched = from_json(graph_data)
+    for step in unbatched.plan.steps:
+        step.batch = None
+
+    batched = [step.node_id for step in executor.plan.steps if step.batch]
+    assert sorted(batched) == ["53e6fe5413a32be7", "glm2"]
+
+    payload = pd.DataFrame({"a": [1, 2, -1, "0.5"], "b": [4, "3", -1, "-2"]})
+
+    expected = await unbatched.execute(payload)
+    out_values = await executor.execute(payload)
+    pd.testing.assert_frame_equal(out_values, expected)
+
+    for record in payload.to_dict(orient="records"):
+        assert await executor.execute_one(record) == await unbatched.execute_one(record)
+
+
+def _rule_with_common_nodes() -> dict:
+    with open("tests/resources/round-node.json", "r") as f:
+        graph_data = json.load(f)
+
+    nodes = graph_data["nodes"]
+
+    def add_node(node_id, name, data, inputs, target):
+        nodes[node_id] = {
+            "id": node_id,
+            "name": name,
+            "data": data,
+            "inputs": {
+                input_name: {"connections": [{"node": node, "output": "output_value"}]}
+                for input_name, node in inputs.items()
+            },
+            "outputs": {
+                "output_value": {
+                    "connections": [{"node": target[0], "input": target[1]}]
+                }
+            },
+        }
+        for input_name, node in inputs.items():
+            nodes[str(node)]["outputs"]["output_value"]["connections"].append(
+                {"node": node_id, "input": input_name}
+            )
+
+    # The product of var_a and var_b and the current year are computed twice:
+    # round((a * b + a * b) + (year - year))
+    nodes["4"]["outputs"]["output_value"]["connections"] = [
+        {"node": "sum", "input": "input_value_0"}
+    ]
+    add_node(
+        "product",
+        "Math",
+        {"operator": "*"},
+        {"input_value_0": 2, "input_value_1": 3},
+        ("sum", "input_value_1"),
+    )
+    add_node("year", "CurrentYear", {}, {}, ("years", "input_value_0"))
+    add_node("year2", "CurrentYear", {}, {}, ("years", "input_value_1"))
+    for node_id in ("year", "year2"):
+        nodes[node_id]["inputs"]["input_void"] = {
+            "connections": [{"node": 0, "output": "output_down_void"}]
+        }
+        nodes["0"]["outputs"]["output_down_void"]["connections"].append(
+            {"node": node_id, "input": "input_void"}
+        )
+    add_node(
+        "years",
+        "Math",
+        {"operator": "-"},
+        {"input_value_0": "year", "input_value_1": "year2"},
+        ("total", "input_value_1"),
+    )
+    add_node(
+        "sum",
+        "Math",
+        {"operator": "+"},
+        {"input_value_0": 4, "input_value_1": "product"},
+        ("total", "input_value_0"),
+    )
+    add_node(
+        "total",
+        "Math",
+        {"operator": "+"},
+        {"input_value_0": "sum", "input_value_1": "years"},
+        (6, "input_value"),
+    )
+    nodes["6"]["inputs"]["input_value"]["connections"] = [
+        {"node": "total", "output": "output_value"}
+    ]
+
+    return graph_data
+
+
+@pytest.mark.asyncio
+async def test_merge_common_nodes_matches_execution():
+    graph_data = _rule_with_common_nodes()
+    executor = from_json(graph_data)
+    merged = from_json(graph_data, merge_common_nodes=True)
+
+    node_ids = [step.node_id for step in merged.plan.steps]
+    assert len(merged.plan) == len(executor.plan) - 1
+    assert ("4" in node_ids) != ("product" in node_ids)
+    # Each CurrentYear node keeps its own execution
+    assert "year" in node_ids and "year2" in node_ids
+
+    payload = pd.DataFrame({"var_a": [1, 2.5, -3, "7"], "var_b": [4, 2, "0.5", 1]})
+
+    expected = await executor.execute(payload)
+    out_values = await merged.execute(payload)
+    pd.testing.assert_frame_equal(out_values, expected)
+    assert expected["output"].tolist() == [8, 10, -3, 14]
+
+
+@pytest.mark.asyncio
+async def test_merge_common_nodes_keeps_custom_nodes():
+    runs = []
+
+    class CustomMath(nodes.BaseNode):
+        data: math_nodes.MathMetadataModel
+        inputs: math_nodes.MathInputsModel
+        outputs: math_nodes.MathOutputsModel
+
+        async def run(self, **kwargs):
+            runs.append(self.id)
+            return await math_nodes.Math.run(self, **kwargs)
+
+    nodes_registry = nodes.registry()
+    nodes_registry.register("Math", CustomMath, overwrite=True)
+
+    graph_data = _rule_with_common_nodes()
+    executor = from_json(graph_data, nodes_registry=nodes_registry)
+    merged = from_json(
+        graph_data,
+        nodes_registry=nodes_registry,
+        merge_common_nodes=True,
+    )
+
+    # Custom nodes are not deterministic unless they say so
+    node_ids = [step.node_id for step in merged.plan.steps]
+    assert len(merged.plan) == len(executor.plan)
+    assert "4" in node_ids and "product" in node_ids
+
+    payload = pd.DataFrame({"var_a": [1, 2.5, -3, "7"], "var_b": [4, 2, "0.5", 1]})
+    out_values = await merged.execute(payload)
+    assert out_values["output"].tolist() == [8, 10, -3, 14]
+    assert "4" in runs and "product" in runs
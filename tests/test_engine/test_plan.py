@@ -0,0 +1,49 @@
+import pytest
+
+from retrack import from_json
+from retrack.engine.plan import ExecutionPlan, NodePlan
+from retrack.nodes.base import NodeKind
+
+
+@pytest.fixture
+def executor():
+    return from_json("tests/resources/multiple-ifs.json")
+
+
+def test_plan_follows_execution_order(executor):
+    assert isinstance(executor.plan, ExecutionPlan)
+    assert [step.node_id for step in executor.plan] == executor.execution_order
+    assert all(isinstance(step, NodePlan) for step in executor.plan)
+
+
+def test_plan_resolves_connections(executor):
+    steps = {step.node_id: step for step in executor.plan}
+
+    check = steps["4"]
+    assert check.input_keys == [
+        ("input_value_0", "2@output_value"),
+        ("input_value_1", "3@output_value"),
+    ]
+    assert check.targets == ["5"]
+    assert check.state_key("output_bool") == "4@output_bool"
+
+    match = steps["5"]
+    assert match.kind == NodeKind.FILTER
+    assert match.filter_targets == {
+        "output_then_filter": ["10"],
+        "output_else_filter": ["6", "7"],
+    }
+
+    # Void connectors only express ordering, they are not read as inputs
+    assert steps["2"].input_keys == []
+
+
+def test_plan_resolves_scalar_kernels(executor):
+    steps = {step.node_id: step for step in executor.plan}
+
+    assert steps["4"].run_one is not None
+    assert executor.plan.runs_records
+
+    date_executor = from_json("tests/resources/date-difference.json")
+    fallbacks = [step.node.name for step in date_executor.plan if step.run_one is None]
+    assert "DifferenceBetweenDates" in fallbacks
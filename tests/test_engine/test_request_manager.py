@@ -63,3 +63,62 @@ def test_validate_dict_with_none_value(valid_input_dict_before_validation):
     assert issubclass(rm.model, pydantic.BaseModel)
     assert rm.model(example=None) == rm.model(example="Hello World")
     assert rm.model() == rm.model(example="Hello World")
+
+
+@pytest.fixture
+def request_manager(valid_input_dict_before_validation):
+    required_input = {
+        **valid_input_dict_before_validation,
+        "id": 2,
+        "data": {"name": "required"},
+    }
+    return RequestManager(
+        [Input(**valid_input_dict_before_validation), Input(**required_input)]
+    )
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        pd.DataFrame({"example": [1, None, 2.5], "required": [True, "a", 3]}),
+        pd.DataFrame({"example": ["a"], "required": [None]}),
+        pd.DataFrame({"required": ["a"]}),
+        pd.DataFrame({"example": ["a"]}),
+        pd.DataFrame({"example": [None, "b"], "required": ["a", "b"]}, index=[7, 3]),
+    ],
+)
+def test_validate_matches_dataframe_model(request_manager, payload):
+    original = payload.copy()
+
+    try:
+        expected = request_manager.dataframe_model.validate(
+            payload.reset_index(drop=True)
+        )
+    except pandera.errors.SchemaError as e:
+        with pytest.raises(pandera.errors.SchemaError) as excinfo:
+            request_manager.validate(payload)
+        assert str(excinfo.value) == str(e)
+        assert excinfo.value.reason_code == e.reason_code
+    else:
+        pd.testing.assert_frame_equal(request_manager.validate(payload), expected)
+
+    pd.testing.assert_frame_equal(payload, original)
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"example": None, "required": None},
+        {"example": "a", "required": float("nan")},
+        {"example": "a"},
+        {"required": 1},
+    ],
+)
+def test_validate_record_raises_as_validate(request_manager, record):
+    with pytest.raises(pandera.errors.SchemaError) as expected:
+        request_manager.validate(pd.DataFrame([record]))
+
+    with pytest.raises(pandera.errors.SchemaError) as excinfo:
+        request_manager.validate_record(record)
+    assert str(excinfo.value) == str(expected.value)
+    assert excinfo.value.reason_code == expected.value.reason_code
@@ -0,0 +1,100 @@
+import time
+
+import pandas as pd
+import pytest
+
+from retrack import from_json
+from retrack.utils import graph
+from retrack.validators import CheckIsDAG
+
+
+def lowercase_chain(length: int) -> dict:
+    """Start -> Input -> LowerCase x length -> Output"""
+    nodes = {
+        "0": {
+            "id": 0,
+            "name": "Start",
+            "data": {},
+            "inputs": {},
+            "outputs": {
+                "output_up_void": {"connections": [{"node": 1, "input": "input_void"}]},
+                "output_down_void": {"connections": []},
+            },
+        },
+        "1": {
+            "id": 1,
+            "name": "Input",
+            "data": {"name": "var", "default": None},
+            "inputs": {
+                "input_void": {"connections": [{"node": 0, "output": "output_up_void"}]}
+            },
+            "outputs": {
+                "output_value": {"connections": [{"node": 2, "input": "input_value"}]}
+            },
+        },
+    }
+    for node_id in range(2, length + 2):
+        nodes[str(node_id)] = {
+            "id": node_id,
+            "name": "LowerCase",
+            "data": {},
+            "inputs": {
+                "input_value": {
+                    "connections": [{"node": node_id - 1, "output": "output_value"}]
+                }
+            },
+            "outputs": {
+                "output_value": {
+                    "connections": [{"node": node_id + 1, "input": "input_value"}]
+                }
+            },
+        }
+    nodes[str(length + 2)] = {
+        "id": length + 2,
+        "name": "Output",
+        "data": {"message": None},
+        "inputs": {
+            "input_value": {
+                "connections": [{"node": length + 1, "output": "output_value"}]
+            }
+        },
+        "outputs": {},
+    }
+
+    return {"nodes": nodes}
+
+
+def test_find_cycle():
+    assert graph.find_cycle([("a", "b"), ("b", "c"), ("a", "c")]) is None
+    assert graph.find_cycle([("a", "b"), ("b", "c"), ("c", "b")]) == ["b", "c", "b"]
+    assert graph.find_cycle([("a", "a")]) == ["a", "a"]
+
+
+def test_check_is_dag():
+    assert CheckIsDAG().validate(edges=[("a", "b")]) == (True, None)
+    assert CheckIsDAG().validate(edges=[("a", "b"), ("b", "a")]) == (
+        False,
+        "Graph is not a DAG: a -> b -> a",
+    )
+
+
+@pytest.mark.asyncio
+async def test_execution_order_of_long_chain():
+    start = time.perf_counter()
+    executor = from_json(lowercase_chain(2000))
+
+    assert executor.execution_order == [str(node_id) for node_id in range(2003)]
+    assert time.perf_counter() - start < 10
+
+    out_values = await executor.execute(pd.DataFrame({"var": ["ABC"]}))
+    assert out_values["output"].tolist() == ["abc"]
+
+
+def test_cycle_is_rejected():
+    graph_data = lowercase_chain(3)
+    graph_data["nodes"]["4"]["outputs"]["output_value"]["connections"].append(
+        {"node": 3, "input": "input_value"}
+    )
+
+    with pytest.raises(ValueError, match="Graph is not a DAG"):
+        from_json(graph_data)
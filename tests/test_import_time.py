@@ -0,0 +1,36 @@
+import json
+import subprocess
+import sys
+
+# Seconds that `import retrack` may take once pandas, numpy and pydantic are loaded
+IMPORT_TIME_BUDGET = 0.5
+
+HEAVY_MODULES = ["pandera", "retrack.validators"]
+
+SCRIPT = """
+import json, sys, time
+import numpy, pandas, pydantic
+start = time.perf_counter()
+import retrack
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def import_retrack() -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, check=True, text=True
+    )
+    return json.loads(completed.stdout)
+
+
+def test_import_does_not_load_heavy_modules():
+    assert import_retrack()["loaded"] == []
+
+
+def test_import_time_budget():
+    # Best of a few runs, so a busy machine does not fail the test
+    seconds = min(import_retrack()["seconds"] for _ in range(3))
+    assert seconds < IMPORT_TIME_BUDGET
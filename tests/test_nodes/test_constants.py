@@ -1,4 +1,9 @@
-from retrack.nodes.constants import IntervalCatV0
+from retrack.nodes.constants import (
+    IntervalCatV0,
+    parse_interval_bins,
+    read_interval_table,
+)
+from retrack.validators import IntervalCatV0Validator
 import pytest
 import pandas as pd
 
@@ -51,3 +56,94 @@ async def test_interval_cat_v0_run(interval_cat_dict):
 
     expected_output = pd.Series([0, 0, 0, 451, 900, 1000, 1000])
     assert (output["output_value"].astype(str) == expected_output.astype(str)).all()
+
+
+@pytest.mark.asyncio
+async def test_interval_cat_v0_run_one(interval_cat_dict):
+    interval_cat = IntervalCatV0(**interval_cat_dict)
+
+    input_values = ["-1000", "1", "450", "451", "900", "1001", "320000", "abc"]
+    expected = await interval_cat.run(input_value=pd.Series(input_values))
+
+    outputs = [
+        (await interval_cat.run_one(input_value=value))["output_value"]
+        for value in input_values
+    ]
+    assert outputs == expected["output_value"].tolist()
+
+
+@pytest.mark.asyncio
+async def test_interval_cat_v0_run_unsorted_table(interval_cat_dict):
+    header, *rows = interval_cat_dict["data"]["value"]
+    interval_cat_dict["data"]["value"] = [header] + rows[::-1]
+    interval_cat = IntervalCatV0(**interval_cat_dict)
+
+    input_series = pd.Series(
+        ["-1000", "451", "abc", None, "1001"], index=[3, 5, 6, 8, 9]
+    )
+    output = (await interval_cat.run(input_value=input_series))["output_value"]
+
+    assert output.index.tolist() == [3, 5, 6, 8, 9]
+    assert output.tolist() == ["0", "451", "-1", "-1", "1000"]
+    assert interval_cat.data.bins.starts.tolist() == [float("-inf"), 451, 1001]
+
+
+def test_parse_interval_bins_reports_invalid_values(interval_cat_dict):
+    data = interval_cat_dict["data"]
+    data["value"] = data["value"] + ["2000,abc,5"]
+    bins = parse_interval_bins(
+        tuple(data["value"]),
+        tuple(data["headers"]),
+        data["separator"],
+        data["start_interval_column"],
+        data["end_interval_column"],
+        data["category_column"],
+    )
+
+    assert bins.invalid == ("abc",)
+    with pytest.raises(ValueError):
+        _ = IntervalCatV0(**interval_cat_dict).data.bins
+
+
+def test_interval_cat_v0_validator_reads_the_table_header(interval_cat_dict):
+    data = interval_cat_dict["data"]
+    graph_data = {"nodes": {interval_cat_dict["id"]: interval_cat_dict}}
+    validator = IntervalCatV0Validator()
+    assert validator.validate(graph_data) == (True, None)
+
+    # Only the header line of the table names the columns
+    del data["headers"], data["category_column"]
+    assert validator.validate(graph_data) == (True, None)
+
+    data["value"] = data["value"] + ["1001,True,5"]
+    assert validator.validate(graph_data) == (
+        False,
+        "Invalid numeric values in interval columns in node 75e8a620332cbe6b",
+    )
+
+    data["value"] = data["value"][:-1] + ["1500,2000,5"]
+    assert validator.validate(graph_data) == (
+        False,
+        "Overlapping intervals detected in node 75e8a620332cbe6b",
+    )
+
+
+def test_interval_cat_v0_validator_shares_the_table_read(interval_cat_dict, mocker):
+    read_interval_table.cache_clear()
+    parse_interval_bins.cache_clear()
+    read_csv = mocker.spy(pd, "read_csv")
+
+    graph_data = {"nodes": {interval_cat_dict["id"]: interval_cat_dict}}
+    assert IntervalCatV0Validator().validate(graph_data) == (True, None)
+    interval_cat = IntervalCatV0(**interval_cat_dict)
+    assert interval_cat.data.bins.starts.tolist() == [float("-inf"), 451, 1001]
+
+    assert read_csv.call_count == 1
+
+
+def test_interval_cat_v0_raises_on_overlapping_intervals(interval_cat_dict):
+    data = interval_cat_dict["data"]
+    data["value"] = data["value"] + ["1500,2000,5"]
+
+    with pytest.raises(pd.errors.InvalidIndexError, match="Overlapping intervals"):
+        _ = IntervalCatV0(**interval_cat_dict).data.bins
@@ -94,3 +94,45 @@ async def test_csv_table_run(csv_table_metadata):
 
     response = await model.run(**payload)
     assert response["output_value"].equals(expected)
+
+
+@pytest.mark.asyncio
+async def test_csv_table_run_one(csv_table_metadata):
+    csv_table_factory = dynamic_nodes_registry().get("CSVTableV0")
+    CSVTableV0 = csv_table_factory(**csv_table_metadata)
+
+    model = CSVTableV0(**csv_table_metadata)
+
+    records = [
+        {"input_value_0": "MAY", "input_value_1": "363", "input_value_2": "420"},
+        {"input_value_0": "SEP", "input_value_1": "-1", "input_value_2": "463"},
+    ]
+
+    responses = [(await model.run_one(**record))["output_value"] for record in records]
+    assert responses == ["472", model.data.default]
+
+
+@pytest.mark.asyncio
+async def test_csv_table_run_keeps_index_and_casts_inputs(csv_table_metadata):
+    csv_table_metadata["data"]["value"].append("MAY,363,420,999")
+    csv_table_factory = dynamic_nodes_registry().get("CSVTableV0")
+    model = csv_table_factory(**csv_table_metadata)(**csv_table_metadata)
+
+    index = pd.Index([4, 7])
+    payload = {
+        "input_value_0": pd.Series(["JUN", "SEP"], index=index),
+        "input_value_1": pd.Series([435, 404], index=index),
+        "input_value_2": pd.Series([472, None], index=index, dtype=object),
+    }
+
+    response = await model.run(**payload)
+    assert response["output_value"].equals(
+        pd.Series(["535", model.data.default], index=index, dtype=object)
+    )
+
+    # Keys repeated in the table only fail when they are looked up
+    payload["input_value_0"] = pd.Series(["MAY", "SEP"], index=index)
+    payload["input_value_1"] = pd.Series(["363", "404"], index=index)
+    payload["input_value_2"] = pd.Series(["420", "463"], index=index)
+    with pytest.raises(ValueError):
+        await model.run(**payload)
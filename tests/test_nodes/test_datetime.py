@@ -1,8 +1,16 @@
 import pytest
 import pandas as pd
 import datetime as dt
+import warnings
 
-from retrack.nodes.datetime import CurrentYear, DifferenceBetweenDates, Now, ToISOFormat
+from retrack.nodes.datetime import (
+    CurrentYear,
+    DifferenceBetweenDates,
+    Now,
+    TimestampParser,
+    ToISOFormat,
+    localize,
+)
 
 
 @pytest.fixture
@@ -259,3 +267,74 @@ async def test_to_iso_format_node_run(to_iso_format_input_data):
     to_iso_format_node = ToISOFormat(**to_iso_format_input_data)
     output = await to_iso_format_node.run(pd.Series(["2006-11-05T01:00:00-02:00"]))
     assert (output["output_value"] == pd.Series(["2006-11-05T01:00:00-02:00"])).all()
+
+
+@pytest.mark.asyncio
+async def test_datetime_nodes_parse_columns_like_single_values(
+    difference_between_dates_input_data, to_iso_format_input_data
+):
+    difference_between_dates_node = DifferenceBetweenDates(
+        **difference_between_dates_input_data
+    )
+    to_iso_format_node = ToISOFormat(**to_iso_format_input_data)
+
+    columns = [
+        pd.Series(["2025-01-01", "2016-10-16", "2025-01-01", "2017-02-18"]),
+        pd.Series(["24/09/2025", "01/02/2025", "2025-01-01", "16/10/2016"]),
+        pd.Series(
+            [
+                "2016-10-16 00:30:00",
+                "2017-02-18 22:30:00",
+                "2025-01-01T00:00:00Z",
+                "2025-01-01T00:00:00+05:30",
+            ]
+        ),
+    ]
+    for column in columns:
+        expected = [
+            pd.Timestamp(value)
+            .tz_localize(
+                "America/Sao_Paulo", ambiguous="NaT", nonexistent="shift_forward"
+            )
+            .isoformat()
+            if pd.Timestamp(value).tzinfo is None
+            else pd.Timestamp(value).tz_convert("America/Sao_Paulo").isoformat()
+            for value in column
+        ]
+
+        output = await to_iso_format_node.run(column)
+        assert output["output_value"].tolist() == expected
+
+        reversed_column = column[::-1].reset_index(drop=True)
+        output = await difference_between_dates_node.run(column, reversed_column)
+        expected_days = [
+            (pd.Timestamp(end) - pd.Timestamp(start)).days
+            for start, end in zip(expected, expected[::-1])
+        ]
+        assert output["output_value"].tolist() == expected_days
+
+
+def test_timestamp_parser_parses_other_formats_value_by_value():
+    parser = TimestampParser("America/Sao_Paulo")
+    column = pd.Series(
+        ["13/02/2025", "01/02/2025", None, "January 5, 2020 10:00", "13/02/2025"]
+    )
+
+    # An ISO column parsed first does not change how the next one is parsed
+    assert parser.parse(pd.Series(["2025-01-01", "2016-10-16"])) is not None
+
+    with warnings.catch_warnings(record=True) as expected_warnings:
+        warnings.simplefilter("always")
+        expected = [
+            localize(pd.to_datetime(value), "America/Sao_Paulo")
+            for value in column.dropna().unique()
+        ]
+
+    with warnings.catch_warnings(record=True) as parser_warnings:
+        warnings.simplefilter("always")
+        codes, timestamps = parser.parse(column)
+
+    assert codes.tolist() == [0, 1, -1, 2, 0]
+    assert timestamps.tolist() == expected
+    # Guessing the format of the column does not warn, only parsing its values
+    assert len(parser_warnings) == len(expected_warnings)
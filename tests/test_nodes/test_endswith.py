@@ -29,3 +29,16 @@ async def test_ends_with_node_run():
     assert (output["output_bool"] == pd.Series([False])).all()
     output = await ends_with_node.run(pd.Series(["102"]), pd.Series(["2"]))
     assert (output["output_bool"] == pd.Series([True])).all()
+
+
+@pytest.mark.asyncio
+async def test_ends_with_node_run_checks_each_row_suffix():
+    ends_with_node = EndsWith(**input_data)
+
+    output = await ends_with_node.run(
+        pd.Series(["102", "103", None, "1.5"]), pd.Series(["2", "2", "3", 1.5])
+    )
+    assert output["output_bool"].tolist() == [True, False, None, True]
+
+    output = await ends_with_node.run(pd.Series(["102", "103"]), "3")
+    assert output["output_bool"].tolist() == [False, True]
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+from retrack.nodes.getchar import GetChar
+
+
+def get_char_input_data(index):
+    return {
+        "id": 13,
+        "data": {"index": index},
+        "inputs": {"input_value": {"connections": []}},
+        "outputs": {"output_value": {"connections": []}},
+        "position": [1277.7969569337479, 537.1240779622773],
+        "name": "GetChar",
+    }
+
+
+def get_char_by_row(values, index):
+    """The node before its kernel was vectorized, one row at a time."""
+    return values.apply(lambda x: str(x)[index - 1])
+
+
+def test_get_char_node():
+    get_char_node = GetChar(**get_char_input_data(1))
+
+    assert isinstance(get_char_node, GetChar)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "values, index",
+    [
+        (pd.Series(["abc", "de", "fgh"], index=[2, 0, 1]), 2),
+        # Values that are not strings, read through astype(str)
+        (pd.Series([12, 345]), 1),
+        (pd.Series([1.5, 20.25]), 3),
+        (pd.Series([1, 2.5, 30]), 2),
+        (pd.Series([True, False]), 1),
+        (pd.Series(["abc", 12, 3.5, True]), 1),
+        (pd.Series(["abc", np.nan, None]), 1),
+        (pd.Series([1.5, np.nan]), 2),
+        # Values astype(str) does not convert like str
+        (pd.Series([[1, 2], ("a",)]), 1),
+        (pd.Series(pd.to_datetime(["2025-01-01", "2016-10-16"])), 4),
+        # Indices counted from the end
+        (pd.Series(["abc", "de"]), 0),
+        (pd.Series(["abc", "de"]), -1),
+    ],
+)
+async def test_get_char_node_run_matches_each_row(values, index):
+    get_char_node = GetChar(**get_char_input_data(index))
+
+    output = await get_char_node.run(values)
+
+    pd.testing.assert_series_equal(
+        output["output_value"], get_char_by_row(values, index)
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "values, index",
+    [
+        (pd.Series(["abc", "d"]), 3),
+        (pd.Series([123, 4]), 3),
+        (pd.Series(["abc", ""]), 1),
+        (pd.Series(["abc", "de"]), -3),
+        (pd.Series([[1, 2], [3]]), 5),
+    ],
+)
+async def test_get_char_node_run_raises_on_indices_out_of_range(values, index):
+    get_char_node = GetChar(**get_char_input_data(index))
+
+    with pytest.raises(IndexError):
+        get_char_by_row(values, index)
+
+    with pytest.raises(IndexError):
+        await get_char_node.run(values)
+
+
+@pytest.mark.asyncio
+async def test_get_char_node_run_with_empty_series():
+    get_char_node = GetChar(**get_char_input_data(2))
+
+    output = await get_char_node.run(pd.Series([], dtype=object))
+    assert output["output_value"].empty
+
+    output = await get_char_node.run(pd.Series([], dtype=float))
+    assert output["output_value"].empty
@@ -119,3 +119,41 @@ async def test_glm_run_with_missing_weight(glm_metadata):
         }
 
         _ = await model.run(**payload)
+
+
+@pytest.mark.asyncio
+async def test_glm_run_batch_matches_run(glm_metadata):
+    glm_factory = dynamic_nodes_registry().get("GLM")
+    GLM = glm_factory(**glm_metadata)
+
+    other_metadata = {
+        **glm_metadata,
+        "data": {
+            **glm_metadata["data"],
+            "value": '{"b":0.25,"a":-1.5,"intercept":0.1}',
+            "link": "exponential",
+        },
+    }
+    models = [GLM(**glm_metadata), GLM(**other_metadata)]
+
+    payload = {
+        "input_value_0": pd.Series([1, 2, -1], index=[3, 5, 8]),
+        "input_value_1": pd.Series(["4", "3", None], index=[3, 5, 8]),
+    }
+
+    assert models[0].batch_inputs() == ["input_value_0", "input_value_1"]
+
+    responses = GLM.run_batch(models, list(payload.values()))
+    for model, response in zip(models, responses):
+        expected = await model.run(**payload)
+        assert response["output_value"].equals(expected["output_value"])
+
+
+@pytest.mark.parametrize(
+    "value", ['{"intercept":1}', '{"a":"x","b":1}', "[1, 2]", "not json"]
+)
+def test_glm_batch_inputs_without_valid_weights(glm_metadata, value):
+    glm_metadata["data"]["value"] = value
+    GLM = dynamic_nodes_registry().get("GLM")(**glm_metadata)
+
+    assert GLM(**glm_metadata).batch_inputs() is None
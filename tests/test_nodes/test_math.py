@@ -85,3 +85,26 @@ async def test_round_node_run(absolute_value_input_data):
     round_node = Round(**absolute_value_input_data)
     output = await round_node.run(pd.Series(["-1.5", "1.5", "0", "-2.5"]))
     assert (output["output_value"] == pd.Series([-2, 2, 0, -2])).all()
+
+
+@pytest.mark.asyncio
+async def test_math_node_run_one(math_operator_input_data):
+    for operator, expected in [("+", 3.0), ("-", -1.0), ("*", 2.0), ("/", 0.5)]:
+        math_operator_input_data["data"]["operator"] = operator
+        math_node = Math(**math_operator_input_data)
+        output = await math_node.run_one("1", "2")
+        assert output["output_value"] == expected
+
+    # Division by zero follows pandas instead of raising
+    output = await math_node.run_one("1", "0")
+    assert output["output_value"] == float("inf")
+
+
+@pytest.mark.asyncio
+async def test_round_node_run_one(absolute_value_input_data):
+    round_node = Round(**absolute_value_input_data)
+    outputs = [
+        (await round_node.run_one(value))["output_value"]
+        for value in ["-1.5", "1.5", "0", "-2.5"]
+    ]
+    assert outputs == [-2, 2, 0, -2]
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from retrack.nodes.substring import IsSubStringOf
+
+input_data = {
+    "id": 12,
+    "data": {},
+    "inputs": {
+        "input_value_0": {"connections": []},
+        "input_value_1": {"connections": []},
+    },
+    "outputs": {"output_bool": {"connections": []}},
+    "position": [1277.7969569337479, 537.1240779622773],
+    "name": "IsSubStringOf",
+}
+
+
+def is_substring_of_by_row(substrings, values):
+    """The node before its kernel was vectorized, one row at a time."""
+    df = pd.DataFrame({"input_value_0": substrings, "input_value_1": values})
+    return df.apply(lambda x: x["input_value_0"] in x["input_value_1"], axis=1)
+
+
+def test_is_substring_of_node():
+    is_substring_of_node = IsSubStringOf(**input_data)
+
+    assert isinstance(is_substring_of_node, IsSubStringOf)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "substrings, values",
+    [
+        # A constant substring, looked up with str.contains
+        ("b", pd.Series(["abc", "xyz", "", "b"], index=[3, 1, 2, 0])),
+        ("", pd.Series(["abc", ""])),
+        # A constant substring in values that are not strings
+        ("b", pd.Series([["b"], ("a", "b"), "abc", ["c"]])),
+        # Substrings in a constant string, each distinct one looked up once
+        (pd.Series(["a", "z", "a", "bc", "", "z"], index=[5, 4, 3, 2, 1, 0]), "abc"),
+        # Each row looked up in its own string
+        (pd.Series(["a", "b", "", "d"]), pd.Series(["abc", "xyz", "", "cd"])),
+        (pd.Series([1, "b", 3]), pd.Series([[1, 2], "abc", (3,)])),
+    ],
+)
+async def test_is_substring_of_node_run_matches_each_row(substrings, values):
+    is_substring_of_node = IsSubStringOf(**input_data)
+
+    output = await is_substring_of_node.run(substrings, values)
+
+    pd.testing.assert_series_equal(
+        output["output_bool"],
+        is_substring_of_by_row(substrings, values),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "substrings, values",
+    [
+        ("b", pd.Series(["abc", np.nan])),
+        ("b", pd.Series(["abc", None])),
+        (pd.Series(["a", np.nan]), "abc"),
+        (pd.Series(["a", 1]), "abc"),
+        (pd.Series(["a", "b"]), pd.Series(["abc", np.nan])),
+    ],
+)
+async def test_is_substring_of_node_run_raises_on_missing_values(substrings, values):
+    is_substring_of_node = IsSubStringOf(**input_data)
+
+    with pytest.raises(TypeError):
+        is_substring_of_by_row(substrings, values)
+
+    with pytest.raises(TypeError):
+        await is_substring_of_node.run(substrings, values)
+
+
+@pytest.mark.asyncio
+async def test_is_substring_of_node_run_with_empty_series():
+    is_substring_of_node = IsSubStringOf(**input_data)
+
+    for substrings, values in [
+        (pd.Series([], dtype=object), pd.Series([], dtype=object)),
+        ("b", pd.Series([], dtype=object)),
+        (pd.Series([], dtype=object), "abc"),
+    ]:
+        output = await is_substring_of_node.run(substrings, values)
+        assert output["output_bool"].empty